@@ -13,14 +13,24 @@ from .core.analyzer import Analyzer
 from .core.reporter import Reporter
 from .core.structure_generator import StructureProposalGenerator
 from .core.migrator import MigrationPlanner, MigrationExecutor
+from .core.session_compactor import SessionCompactor
 from .core.classifier import MLClassifier
 from .utils.logging_config import setup_logging, get_logger
 from .commands.source import source, cloud
 from .commands.reclassify import reclassify
+from .commands.sessions import sessions
 
 logger = get_logger(__name__)
 
 
+def open_database(db_path: str, config: dict = None) -> Database:
+    """Open the database with the pragma profile from the loaded configuration."""
+    if config is None:
+        ctx = click.get_current_context(silent=True)
+        config = (ctx.obj if ctx else None) or {}
+    return Database(db_path, config.get('database'))
+
+
 @click.group()
 @click.option('--config', default='cognisys/config/default_config.yml', help='Configuration file path')
 @click.option('--log-level', default='INFO', help='Logging level')
@@ -40,14 +50,23 @@ def cli(ctx, config, log_level):
 
 
 @cli.command()
-@click.option('--roots', '-r', multiple=True, required=True, help='Root directories to scan')
+@click.option('--roots', '-r', multiple=True, help='Root directories to scan')
 @click.option('--config', default='cognisys/config/scan_config.yml', help='Scan configuration file')
 @click.option('--db', default='db/cognisys.db', help='Database path')
 @click.option('--session-id', help='Optional custom session ID')
+@click.option('--incremental', is_flag=True, help='Reuse hashes of files unchanged since the previous scan')
+@click.option('--base-session', help='Session to compare against in incremental mode (default: latest completed)')
+@click.option('--resume', 'resume_session', help='Resume an interrupted scan session from its last checkpoint')
 @click.pass_context
-def scan(ctx, roots, config, db, session_id):
+def scan(ctx, roots, config, db, session_id, incremental, base_session, resume_session):
     """Scan file systems and build index."""
-    click.echo(f"[INFO] Starting scan of {len(roots)} root path(s)")
+    if not roots and not resume_session:
+        raise click.UsageError("Provide --roots to scan or --resume <session>")
+
+    if resume_session:
+        click.echo(f"[INFO] Resuming scan session {resume_session}")
+    else:
+        click.echo(f"[INFO] Starting scan of {len(roots)} root path(s)")
 
     # Load scan config
     config_path = Path(config)
@@ -58,12 +77,21 @@ def scan(ctx, roots, config, db, session_id):
         scan_config = ctx.obj
 
     # Initialize database and scanner
-    database = Database(db)
+    database = open_database(db, scan_config)
     scanner = FileScanner(database, scan_config)
 
     # Perform scan
     try:
-        result_session_id = scanner.scan_roots(list(roots))
+        if resume_session:
+            if incremental:
+                scanner.incremental = True
+            result_session_id = scanner.resume_scan(resume_session)
+        else:
+            result_session_id = scanner.scan_roots(
+                list(roots),
+                incremental=incremental or None,
+                base_session_id=base_session
+            )
 
         stats = scanner.get_stats()
 
@@ -73,12 +101,27 @@ def scan(ctx, roots, config, db, session_id):
         click.echo(f"  Folders scanned: {stats['folders_scanned']:,}")
         click.echo(f"  Total size: {stats['total_size'] / 1e9:.2f} GB")
         click.echo(f"  Errors: {stats['errors']}")
+        if scanner.incremental:
+            click.echo(f"  Reused: {stats['files_reused']:,} | Rehashed: {stats['files_rehashed']:,} | "
+                       f"New: {stats['files_new']:,} | Deleted: {stats['files_deleted']:,}")
         click.echo(f"\nDatabase: {db}")
 
     except Exception as e:
         click.echo(f"[ERROR] Scan failed: {e}", err=True)
         raise click.Abort()
 
+    # Keep planner statistics current and old sessions compacted; the scan
+    # itself has succeeded, so a maintenance failure is only a warning
+    try:
+        database.optimize()
+        maintenance = (ctx.obj or {}).get('database', {}).get('maintenance', {})
+        if maintenance.get('auto_compact', False):
+            compacted = SessionCompactor(database, ctx.obj).compact()
+            if compacted['sessions_compacted']:
+                click.echo(f"  Compacted {compacted['sessions_compacted']} old session(s)")
+    except Exception as e:
+        click.echo(f"[WARN] Post-scan maintenance failed: {e}", err=True)
+
 
 @cli.command()
 @click.option('--session', required=True, help='Session ID to analyze')
@@ -98,7 +141,7 @@ def analyze(ctx, session, rules, db):
         rules_config = ctx.obj
 
     # Initialize database and analyzer
-    database = Database(db)
+    database = open_database(db)
     analyzer = Analyzer(database, rules_config)
 
     # Run analysis
@@ -110,6 +153,8 @@ def analyze(ctx, session, rules, db):
         click.echo(f"  Duplicate files: {stats['duplicate_files']:,}")
         click.echo(f"  Wasted space: {stats['space_wasted'] / 1e9:.2f} GB")
 
+        database.optimize()
+
     except Exception as e:
         click.echo(f"[ERROR] Analysis failed: {e}", err=True)
         raise click.Abort()
@@ -126,9 +171,14 @@ def report(ctx, session, output, format, db):
     click.echo(f"[INFO] Generating reports for session: {session}")
 
     # Initialize database and reporter
-    database = Database(db)
+    database = open_database(db)
     reporter = Reporter(database, ctx.obj)
 
+    session_info = database.get_session(session)
+    if session_info and session_info.get('compacted_at'):
+        click.echo(f"[WARN] Session was compacted against {session_info['base_session_id']}; "
+                   f"the report only covers files that changed before that scan.")
+
     # Generate reports
     try:
         reporter.generate_report(session, output, list(format))
@@ -156,7 +206,7 @@ def propose_structure(ctx, session, output, db):
     click.echo(f"[INFO] Generating structure proposal for session: {session}")
 
     # Initialize database and generator
-    database = Database(db)
+    database = open_database(db)
     generator = StructureProposalGenerator(database)
 
     # Generate proposal
@@ -197,7 +247,7 @@ def plan(ctx, session, structure, output, db):
         structure_config = yaml.safe_load(f)
 
     # Initialize database and planner
-    database = Database(db)
+    database = open_database(db)
     planner = MigrationPlanner(database, ctx.obj)
 
     # Create plan
@@ -227,7 +277,7 @@ def dry_run(plan, db):
     """Preview migration plan without making changes."""
     click.echo(f"[INFO] Running dry-run for plan: {plan}")
 
-    database = Database(db)
+    database = open_database(db)
     executor = MigrationExecutor(database)
 
     # Show sample actions
@@ -265,7 +315,7 @@ def dry_run(plan, db):
 @click.option('--db', default='db/cognisys.db', help='Database path')
 def approve(plan, db):
     """Approve a migration plan for execution."""
-    database = Database(db)
+    database = open_database(db)
 
     cursor = database.conn.cursor()
     cursor.execute("""
@@ -286,7 +336,7 @@ def execute(plan, db):
     """Execute an approved migration plan."""
     click.echo(f"[INFO] Executing migration plan: {plan}")
 
-    database = Database(db)
+    database = open_database(db)
     executor = MigrationExecutor(database)
 
     try:
@@ -311,7 +361,7 @@ def execute(plan, db):
 @click.option('--db', default='db/cognisys.db', help='Database path')
 def list_sessions(db):
     """List all scan sessions."""
-    database = Database(db)
+    database = open_database(db)
 
     cursor = database.conn.cursor()
     cursor.execute("""
@@ -352,7 +402,7 @@ def classify(ctx, session, model, cascade, min_size, extensions, limit, db):
     click.echo(f"[INFO] Model: {model_name}")
 
     # Initialize database and classifier
-    database = Database(db)
+    database = open_database(db)
     classifier = MLClassifier(
         database,
         model=model,
@@ -391,7 +441,7 @@ def classify(ctx, session, model, cascade, min_size, extensions, limit, db):
 @click.option('--db', default='db/cognisys.db', help='Database path')
 def classify_report(session, model, min_conf, top, db):
     """Show classification results for a session."""
-    database = Database(db)
+    database = open_database(db)
 
     # Get stats by model
     stats = database.get_classification_stats(session)
@@ -491,6 +541,7 @@ def classify_file(file_path, model, cascade):
 cli.add_command(source)
 cli.add_command(cloud)
 cli.add_command(reclassify)
+cli.add_command(sessions)
 
 
 def main():
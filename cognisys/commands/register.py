@@ -4,29 +4,28 @@ Registers files from drop directory into file_registry database
 """
 
 import sqlite3
-import hashlib
 from pathlib import Path
 from datetime import datetime
 import logging
 
-logger = logging.getLogger(__name__)
+from ..utils.hashing import hash_file
+from ..utils.hash_cache import HashCache
 
+logger = logging.getLogger(__name__)
 
-def compute_hash(filepath):
-    """Compute SHA-256 hash of file"""
-    sha256 = hashlib.sha256()
 
+def compute_hash(filepath, hash_cache=None):
+    """Compute SHA-256 hash of file, using the persistent hash cache if given"""
     try:
-        with open(filepath, 'rb') as f:
-            while chunk := f.read(8192):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        if hash_cache is not None:
+            return hash_cache.hash_file(filepath)
+        return hash_file(filepath)
     except (OSError, PermissionError) as e:
         logger.warning(f"Cannot hash {filepath}: {e}")
         return None
 
 
-def register_files_from_drop(drop_dir, db_path, dry_run=False):
+def register_files_from_drop(drop_dir, db_path, dry_run=False, hash_cache_config=None):
     """
     Scan drop directory and register files in database.
 
@@ -34,6 +33,8 @@ def register_files_from_drop(drop_dir, db_path, dry_run=False):
         drop_dir: Path to drop/inbox directory
         db_path: Path to SQLite database
         dry_run: If True, don't actually register files
+        hash_cache_config: Hash cache config section (enabled, path, max_entries);
+            defaults to the scanner's shared cache at db/hash_cache.db
 
     Returns:
         dict with statistics
@@ -47,6 +48,7 @@ def register_files_from_drop(drop_dir, db_path, dry_run=False):
 
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
+    hash_cache = HashCache.for_database(config=hash_cache_config)
 
     stats = {
         'scanned': 0,
@@ -67,7 +69,7 @@ def register_files_from_drop(drop_dir, db_path, dry_run=False):
             continue
 
         # Compute hash
-        content_hash = compute_hash(filepath)
+        content_hash = compute_hash(filepath, hash_cache)
         if not content_hash:
             stats['errors'] += 1
             continue
@@ -113,6 +115,10 @@ def register_files_from_drop(drop_dir, db_path, dry_run=False):
 
     conn.close()
 
+    if hash_cache is not None:
+        stats['hash_cache'] = hash_cache.get_stats()
+        hash_cache.close()
+
     # Print summary
     logger.info("")
     logger.info("="*80)
@@ -122,6 +128,9 @@ def register_files_from_drop(drop_dir, db_path, dry_run=False):
     logger.info(f"  New files registered: {stats['registered']}")
     logger.info(f"  Duplicates detected: {stats['duplicates']}")
     logger.info(f"  Errors: {stats['errors']}")
+    if 'hash_cache' in stats:
+        logger.info(f"  Hash cache hits: {stats['hash_cache']['hits']} "
+                    f"(misses: {stats['hash_cache']['misses']})")
 
     if dry_run:
         logger.info("\nDRY RUN - No files were registered")
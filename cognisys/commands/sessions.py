@@ -0,0 +1,120 @@
+"""
+CLI Commands for Scan Session Maintenance
+
+Provides commands to keep the scan database bounded:
+- List sessions with their stored file counts and compaction state
+- Compact old sessions into deltas against newer scans of the same roots
+- Refresh planner statistics and reclaim free pages
+"""
+
+import click
+from typing import Optional
+
+from ..core.session_compactor import SessionCompactor
+from ..models.database import Database
+
+
+def open_scan_database(ctx: click.Context, db: str) -> Database:
+    """Open the scan database with the pragma profile from the loaded configuration."""
+    return Database(db, (ctx.obj or {}).get('database'))
+
+
+@click.group()
+def sessions():
+    """Manage scan sessions (list, compact, maintenance)."""
+    pass
+
+
+@sessions.command('list')
+@click.option('--db', default='db/cognisys.db', help='Database path')
+@click.pass_context
+def list_sessions(ctx, db: str):
+    """List scan sessions with stored file rows and compaction state."""
+    database = open_scan_database(ctx, db)
+    cursor = database.conn.cursor()
+    cursor.execute("""
+        SELECT s.session_id, s.started_at, s.status, s.files_scanned, s.base_session_id,
+               s.compacted_at,
+               (SELECT COUNT(*) FROM files f WHERE f.scan_session_id = s.session_id) AS stored
+        FROM scan_sessions s
+        ORDER BY s.started_at DESC
+    """)
+    rows = cursor.fetchall()
+    database.close()
+
+    if not rows:
+        click.echo("[INFO] No scan sessions found.")
+        return
+
+    click.echo(f"\n{'Session':<24} {'Started':<20} {'Status':<12} {'Files':>10} {'Stored':>10}  Compacted into")
+    click.echo("=" * 100)
+    for row in rows:
+        started = str(row['started_at'] or '')[:19]
+        click.echo(
+            f"{row['session_id']:<24} "
+            f"{started:<20} "
+            f"{row['status'] or '':<12} "
+            f"{row['files_scanned'] or 0:>10,} "
+            f"{row['stored']:>10,}  "
+            f"{row['base_session_id'] if row['compacted_at'] else '-'}"
+        )
+
+    click.echo(f"\nTotal: {len(rows)} session(s)")
+
+
+@sessions.command('compact')
+@click.option('--db', default='db/cognisys.db', help='Database path')
+@click.option('--keep', type=int, default=None,
+              help='Completed sessions per root set to keep in full (default: database.maintenance.keep_sessions)')
+@click.option('--dry-run', is_flag=True, help='Show the sessions that would be compacted')
+@click.option('--vacuum/--no-vacuum', default=None,
+              help='Force or skip VACUUM (default: when enough pages are free)')
+@click.pass_context
+def compact(ctx, db: str, keep: Optional[int], dry_run: bool, vacuum: Optional[bool]):
+    """Collapse old sessions into deltas against newer scans of the same roots."""
+    database = open_scan_database(ctx, db)
+    compactor = SessionCompactor(database, ctx.obj)
+
+    try:
+        stats = compactor.compact(keep=keep, dry_run=dry_run, vacuum=vacuum)
+    except ValueError as e:
+        click.echo(f"[ERROR] {e}", err=True)
+        raise click.Abort()
+    finally:
+        database.close()
+
+    candidates = stats['candidates']
+    if not candidates:
+        click.echo("[INFO] Nothing to compact.")
+        return
+
+    if dry_run:
+        click.echo(f"[DRY RUN] {len(candidates)} session(s) would be compacted:")
+        for session_id, base_session_id in candidates:
+            click.echo(f"  {session_id} -> {base_session_id}")
+        return
+
+    click.echo(f"[SUCCESS] Compacted {stats['sessions_compacted']} session(s)")
+    click.echo(f"  File rows removed: {stats['files_removed']:,}")
+    click.echo(f"  Changed files kept: {stats['files_kept']:,}")
+    click.echo(f"  Absent paths recorded: {stats['paths_recorded']:,}")
+    click.echo(f"  VACUUM: {'yes' if stats['vacuumed'] else 'skipped'}")
+
+
+@sessions.command('optimize')
+@click.option('--db', default='db/cognisys.db', help='Database path')
+@click.option('--vacuum', is_flag=True, help='Also VACUUM to reclaim free pages')
+@click.pass_context
+def optimize(ctx, db: str, vacuum: bool):
+    """Refresh query planner statistics (ANALYZE) and optionally VACUUM."""
+    database = open_scan_database(ctx, db)
+    try:
+        database.analyze()
+        click.echo("[OK] Planner statistics refreshed")
+        free_ratio = database.get_free_page_ratio()
+        if vacuum and database.vacuum():
+            click.echo(f"[OK] VACUUM reclaimed {free_ratio:.0%} of pages")
+        else:
+            click.echo(f"[INFO] Free pages: {free_ratio:.0%}")
+    finally:
+        database.close()
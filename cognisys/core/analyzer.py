@@ -3,17 +3,47 @@ Analysis engine for CogniSys.
 Implements multi-stage deduplication pipeline and pattern detection.
 """
 
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Dict, Optional
-from difflib import SequenceMatcher
 
 from ..models.database import Database
-from ..utils.hashing import calculate_full_hash
+from .canonical_selector import CanonicalSelector
+from ..utils.hashing import (
+    FULL_HASH_ALGORITHM,
+    PROGRESSIVE_BLOCK_SIZE,
+    PROGRESSIVE_MAX_BLOCK_SIZE,
+    calculate_full_hash,
+    progressive_full_hashes,
+)
+from ..utils.hash_cache import HashCache, cache_key
+from ..utils.hash_scheduler import DEFAULT_PROGRESS_INTERVAL, FullHashScheduler
 from ..utils.naming import normalize_filename
+from ..utils.similarity import DisjointSet, iter_similar_pairs
 from ..utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Columns streamed for fuzzy filename matching and canonical selection
+FUZZY_MATCH_COLUMNS = ('file_id', 'parent_id', 'path', 'name', 'extension', 'size_bytes',
+                       'modified_at', 'access_count', 'is_duplicate')
+
+# Columns streamed for exact duplicate verification and canonical selection
+EXACT_MATCH_COLUMNS = ('file_id', 'path', 'name', 'extension', 'size_bytes', 'modified_at',
+                       'access_count', 'hash_quick', 'hash_quick_algo', 'hash_full')
+
+# Duplicate groups (and computed full hashes) buffered before they are written in one transaction
+GROUP_WRITE_BATCH_SIZE = 5000
+
+# Files collected from colliding quick-hash groups before they are full-hashed together
+FULL_HASH_BATCH_SIZE = 2000
+
+# Quick-hash groups of files at least this large (with at most this many members,
+# each holding an open file and a block in memory) are compared progressively
+PROGRESSIVE_MIN_FILE_SIZE = 16_777_216
+PROGRESSIVE_MAX_GROUP_FILES = 32
+
 
 class Analyzer:
     """
@@ -35,6 +65,34 @@ class Analyzer:
             'duplicate_files': 0,
             'space_wasted': 0
         }
+        # Same cache file as the scanner: its configured path applies unless overridden here
+        cache_config = dict(config.get('scanning', {}).get('hashing', {}).get('cache') or {})
+        cache_config.update(config.get('deduplication', {}).get('exact_match', {}).get('hash_cache') or {})
+        self.hash_cache = HashCache.for_database(database.db_path, cache_config)
+        self.group_batch_size = config.get('deduplication', {}).get('group_batch_size', GROUP_WRITE_BATCH_SIZE)
+
+        # On-demand full hashing: files are hashed in batches with one worker pool per device
+        full_hashing = config.get('deduplication', {}).get('exact_match', {}).get('full_hashing', {})
+        self.hash_batch_size = max(1, full_hashing.get('batch_size', FULL_HASH_BATCH_SIZE))
+        self.hash_scheduler = FullHashScheduler(
+            self._calculate_full_hash,
+            full_hashing.get('device_workers'),
+            full_hashing.get('progress_interval', DEFAULT_PROGRESS_INTERVAL)
+        )
+
+        # Progressive comparison for groups of large files that have no full hash yet
+        progressive = config.get('deduplication', {}).get('exact_match', {}).get('progressive_compare', {})
+        self.progressive_enabled = progressive.get('enabled', True)
+        self.progressive_min_size = progressive.get('min_file_size', PROGRESSIVE_MIN_FILE_SIZE)
+        self.progressive_max_files = progressive.get('max_group_files', PROGRESSIVE_MAX_GROUP_FILES)
+        self.progressive_block_size = progressive.get('block_size', PROGRESSIVE_BLOCK_SIZE)
+        self.progressive_max_block_size = progressive.get('max_block_size', PROGRESSIVE_MAX_BLOCK_SIZE)
+        self.progressive_stats = {'groups': 0, 'bytes_read': 0, 'bytes_skipped': 0}
+        self._pending_groups = []
+        self._pending_hashes = []
+        self.canonical_selector = CanonicalSelector.from_config(
+            config.get('deduplication', {}).get('canonical_selection', {})
+        )
 
     def analyze_session(self, session_id: str) -> Dict:
         """
@@ -45,7 +103,20 @@ class Analyzer:
 
         Returns:
             Analysis results and statistics
+
+        Raises:
+            ValueError: If the session was compacted. It then only stores the
+                files that changed since its base session, so duplicate and
+                orphan results would be incomplete.
         """
+        session = self.db.get_session(session_id)
+        if session and session.get('compacted_at'):
+            raise ValueError(
+                f"Session {session_id} was compacted against {session['base_session_id']} "
+                f"and only stores files that changed before that scan; analyze a session "
+                f"kept in full instead"
+            )
+
         logger.info(f"=== Starting Analysis Pipeline ===")
         logger.info(f"Session ID: {session_id}")
 
@@ -82,62 +153,147 @@ class Analyzer:
     def _find_exact_duplicates(self, session_id: str):
         """
         Stage 1-3: Find exact duplicate files using progressive hashing.
+
+        Size and quick-hash collisions are found with grouped SQL passes
+        (see Database.iter_exact_duplicate_candidates); only the members of
+        the surviving groups are full-hashed, in batches scheduled per device.
         """
         min_size = self.config.get('deduplication', {}).get('exact_match', {}).get('min_file_size', 1024)
 
-        # Stage 1: Pre-filter by size + extension
-        candidates = self.db.get_duplicate_candidates(session_id)
-        logger.info(f"  -> Examining {len(candidates)} candidate groups...")
+        # Stages 1-2: size + extension, then quick hash, streamed group by group
+        rows = self.db.iter_exact_duplicate_candidates(session_id, EXACT_MATCH_COLUMNS, min_size)
 
-        # Stage 2: Group by quick hash
         processed = 0
-        for candidate_group in candidates:
+        pending = []
+        pending_unhashed = 0
+        for _, group_rows in groupby(rows, key=self._quick_hash_key):
+            file_group = [row._asdict() for row in group_rows]
+            pending.append(file_group)
+            pending_unhashed += sum(1 for file in file_group if not file['hash_full'])
             processed += 1
-            if processed % 100 == 0:
-                logger.info(f"  -> Processing candidate group {processed}/{len(candidates)}")
-            file_ids = candidate_group['file_ids'].split(',')
-
-            if candidate_group['size_bytes'] < min_size:
-                continue
+            if processed % 1000 == 0:
+                logger.info(f"  -> Collected {processed} quick-hash groups")
+
+            if pending_unhashed >= self.hash_batch_size:
+                self._verify_exact_groups(pending)
+                pending = []
+                pending_unhashed = 0
+
+        self._verify_exact_groups(pending)
+        hash_stats = self.hash_scheduler.get_stats()
+        logger.info(f"  -> Examined {processed} quick-hash groups, hashed {hash_stats['files_hashed']} files "
+                    f"({hash_stats['bytes_per_second'] / 1e6:.1f} MB/s)")
+        if self.progressive_stats['groups']:
+            logger.info(f"  -> Compared {self.progressive_stats['groups']} large groups progressively, "
+                        f"skipped {self.progressive_stats['bytes_skipped'] / 1e9:.2f} GB of reads")
+        self._flush_duplicate_groups()
+
+    def _verify_exact_groups(self, file_groups: List[List[Dict]]):
+        """
+        Stage 3: Verify quick-hash groups with full hashes (always SHA-256).
 
-            # Get files
-            files = [self.db.get_files_by_hash(fid)[0] if self.db.get_files_by_hash(fid)
-                     else None for fid in file_ids]
-            files = [f for f in files if f]
-
-            # Group by quick hash
-            hash_groups = {}
-            for file in files:
-                if file['hash_quick']:
-                    if file['hash_quick'] not in hash_groups:
-                        hash_groups[file['hash_quick']] = []
-                    hash_groups[file['hash_quick']].append(file)
-
-            # Stage 3: Verify with full hash
-            for quick_hash, file_group in hash_groups.items():
-                if len(file_group) < 2:
-                    continue
+        Members without a full hash are hashed together through the
+        per-device scheduler, then each group is split by full hash. Groups
+        of large files that have never been hashed are compared block by
+        block instead, so near-miss files are not read to the end.
+        """
+        scheduled = []
+        for file_group in file_groups:
+            if self._is_progressive_candidate(file_group):
+                self._compare_progressively(file_group)
+            else:
+                scheduled.append(file_group)
+
+        files = [file for file_group in scheduled for file in file_group]
+        to_hash = [(index, file['path'], file['size_bytes'])
+                   for index, file in enumerate(files) if not file['hash_full']]
+        if to_hash:
+            digests = self.hash_scheduler.hash_files(to_hash)
+            for index, _, _ in to_hash:
+                full_hash = digests.get(index)
+                if full_hash:
+                    files[index]['hash_full'] = full_hash
+                    self._pending_hashes.append((files[index]['file_id'], full_hash))
+
+        for file_group in file_groups:
+            full_hash_groups = {}
+            for file in file_group:
+                if file['hash_full']:
+                    full_hash_groups.setdefault(file['hash_full'], []).append(file)
+
+            for duplicates in full_hash_groups.values():
+                if len(duplicates) >= 2:
+                    self._create_duplicate_group(duplicates, 'exact')
+
+        if len(self._pending_hashes) >= self.group_batch_size:
+            self._flush_duplicate_groups()
+
+    def _is_progressive_candidate(self, file_group: List[Dict]) -> bool:
+        """Whether a quick-hash group should be verified by progressive comparison."""
+        if not self.progressive_enabled or not 2 <= len(file_group) <= self.progressive_max_files:
+            return False
+        if file_group[0]['size_bytes'] < self.progressive_min_size:
+            return False
+        if any(file['hash_full'] for file in file_group):
+            return False
+
+        # Full hashes already cached for any member are cheaper than reading the group
+        if self.hash_cache is not None:
+            keys = []
+            for file in file_group:
+                try:
+                    keys.append((cache_key(os.stat(file['path'])), FULL_HASH_ALGORITHM))
+                except OSError:
+                    keys.append((None, FULL_HASH_ALGORITHM))
+            if any(self.hash_cache.get_many(keys)):
+                return False
+        return True
+
+    def _compare_progressively(self, file_group: List[Dict]):
+        """Compare a group in lockstep blocks and record full hashes of the members that match."""
+        digests, bytes_read = progressive_full_hashes(
+            [file['path'] for file in file_group],
+            self.progressive_block_size,
+            self.progressive_max_block_size
+        )
+
+        cache_entries = []
+        for file, full_hash in zip(file_group, digests):
+            if full_hash:
+                file['hash_full'] = full_hash
+                self._pending_hashes.append((file['file_id'], full_hash))
+                if self.hash_cache is not None:
+                    try:
+                        cache_entries.append((cache_key(os.stat(file['path'])), FULL_HASH_ALGORITHM, full_hash))
+                    except OSError:
+                        pass
+        if cache_entries:
+            self.hash_cache.put_many(cache_entries)
+
+        self.progressive_stats['groups'] += 1
+        self.progressive_stats['bytes_read'] += bytes_read
+        self.progressive_stats['bytes_skipped'] += file_group[0]['size_bytes'] * len(file_group) - bytes_read
+
+    @staticmethod
+    def _quick_hash_key(row) -> tuple:
+        """Group key of a candidate row (never mixes quick-hash algorithms)."""
+        algo = 'sha256' if row.hash_quick_algo is None else row.hash_quick_algo
+        return row.size_bytes, row.extension, algo, row.hash_quick
+
+    def _calculate_full_hash(self, file_path: str) -> Optional[str]:
+        """
+        Calculate a file's full hash, consulting the persistent hash cache first.
 
-                # Calculate full hashes if not already present
-                for file in file_group:
-                    if not file['hash_full']:
-                        full_hash = calculate_full_hash(Path(file['path']))
-                        if full_hash:
-                            self.db.update_file_hash(file['file_id'], 'full', full_hash)
-                            file['hash_full'] = full_hash
-
-                # Group by full hash
-                full_hash_groups = {}
-                for file in file_group:
-                    if file['hash_full']:
-                        if file['hash_full'] not in full_hash_groups:
-                            full_hash_groups[file['hash_full']] = []
-                        full_hash_groups[file['hash_full']].append(file)
-
-                # Create duplicate groups
-                for full_hash, duplicates in full_hash_groups.items():
-                    if len(duplicates) >= 2:
-                        self._create_duplicate_group(duplicates, 'exact')
+        Returns:
+            SHA-256 hex digest or None if the file cannot be read
+        """
+        if self.hash_cache is None:
+            return calculate_full_hash(Path(file_path))
+        try:
+            return self.hash_cache.hash_file(file_path)
+        except OSError as e:
+            logger.debug(f"Cannot hash {file_path}: {e}")
+            return None
 
     def _find_fuzzy_duplicates(self, session_id: str):
         """
@@ -149,56 +305,76 @@ class Analyzer:
         max_folder_files = self.config.get('deduplication', {}).get('fuzzy_filename', {}).get('max_folder_files', 1000)
         min_file_size = self.config.get('deduplication', {}).get('fuzzy_filename', {}).get('min_file_size', 1024)  # 1KB
 
-        files = self.db.get_files_by_session(session_id)
-
-        # Pre-filter: skip small files and already marked duplicates
-        files = [f for f in files
-                 if not f['is_duplicate'] and f['size_bytes'] >= min_file_size]
-        logger.info(f"  -> Analyzing {len(files)} files after pre-filtering...")
-
         # Group by folder if required
         if same_folder_only:
-            folder_groups = {}
-            for file in files:
-                folder = str(Path(file['path']).parent)
-                if folder not in folder_groups:
-                    folder_groups[folder] = []
-                folder_groups[folder].append(file)
-
-            logger.info(f"  -> Comparing files in {len(folder_groups)} folders...")
+            # Stream rows ordered by folder so only one folder is held in memory at a time
+            files = self.db.iter_files_by_session(session_id, FUZZY_MATCH_COLUMNS, order_by='parent_id')
+            files = (f for f in files
+                     if not f.is_duplicate and f.size_bytes >= min_file_size)
 
             # Compare within each folder (skip folders with too many files)
+            analyzed = 0
             processed_folders = 0
             skipped_folders = 0
-            for folder, folder_files in folder_groups.items():
+            for folder_files in self._iter_folder_groups(files):
+                analyzed += len(folder_files)
                 processed_folders += 1
                 if processed_folders % 50 == 0:
-                    logger.info(f"  -> Progress: {processed_folders}/{len(folder_groups)} folders processed")
+                    logger.info(f"  -> Progress: {processed_folders} folders processed")
 
                 if len(folder_files) <= max_folder_files:
                     self._compare_filenames_optimized(folder_files, threshold)
                 else:
                     skipped_folders += 1
+                    folder = os.path.dirname(folder_files[0].path)
                     logger.debug(f"Skipping fuzzy match for {folder}: {len(folder_files)} files (threshold: {max_folder_files})")
 
+            logger.info(f"  -> Compared {analyzed} files after pre-filtering in {processed_folders} folders")
             if skipped_folders > 0:
                 logger.info(f"  -> Skipped {skipped_folders} folders with > {max_folder_files} files")
         else:
-            # Compare all files (expensive!)
+            # Compare across folders (candidate pairs come from the bigram index)
+            files = [f for f in self.db.iter_files_by_session(session_id, FUZZY_MATCH_COLUMNS)
+                     if not f.is_duplicate and f.size_bytes >= min_file_size]
+            logger.info(f"  -> Analyzing {len(files)} files after pre-filtering...")
             self._compare_filenames_optimized(files, threshold)
 
-    def _compare_filenames_optimized(self, files: List[Dict], threshold: float):
+        self._flush_duplicate_groups()
+
+    @staticmethod
+    def _iter_folder_groups(files):
+        """
+        Split file rows ordered by parent_id into per-folder lists.
+
+        Rows without a parent_id (inserted outside the scanner) are grouped by
+        their directory path instead.
         """
-        Optimized filename comparison with extension grouping and early filtering.
+        for parent_id, rows in groupby(files, key=attrgetter('parent_id')):
+            if parent_id is not None:
+                yield list(rows)
+                continue
+            by_dir = {}
+            for row in rows:
+                by_dir.setdefault(os.path.dirname(row.path), []).append(row)
+            yield from by_dir.values()
+
+    def _compare_filenames_optimized(self, files: List[tuple], threshold: float):
+        """
+        Filename comparison within extension and size groups.
+
+        Candidate pairs come from a bigram index (see utils.similarity), so
+        only names that can reach the threshold are compared. Matching pairs
+        are merged with union-find and each connected cluster becomes one
+        group, with the canonical file chosen across the whole cluster.
 
         Args:
-            files: List of file records
+            files: List of file rows with FUZZY_MATCH_COLUMNS fields
             threshold: Similarity threshold (0.0 to 1.0)
         """
         # Group by extension first to reduce comparisons
         ext_groups = {}
         for file in files:
-            ext = file.get('extension', '').lower()
+            ext = (file.extension or '').lower()
             if ext not in ext_groups:
                 ext_groups[ext] = []
             ext_groups[ext].append(file)
@@ -208,48 +384,37 @@ class Analyzer:
             # Further group by file size (within 10% tolerance) for efficiency
             size_groups = {}
             for file in ext_files:
-                size_key = file['size_bytes'] // 1024  # Group by KB
+                size_key = file.size_bytes // 1024  # Group by KB
                 if size_key not in size_groups:
                     size_groups[size_key] = []
                 size_groups[size_key].append(file)
 
-            # Compare within size groups
+            # Compare within size groups through the bigram index (names normalized once)
             for size_key, size_files in size_groups.items():
                 if len(size_files) < 2:
                     continue
 
-                for i, file_a in enumerate(size_files):
-                    for file_b in size_files[i + 1:]:
-                        # Early exit if sizes are too different (> 10%)
-                        size_diff = abs(file_a['size_bytes'] - file_b['size_bytes'])
-                        if size_diff > file_a['size_bytes'] * 0.1:
-                            continue
-
-                        # Normalize names
-                        norm_a = normalize_filename(file_a['name'])
-                        norm_b = normalize_filename(file_b['name'])
-
-                        # Quick length check before expensive similarity calculation
-                        len_diff = abs(len(norm_a) - len(norm_b))
-                        if len_diff > max(len(norm_a), len(norm_b)) * (1 - threshold):
-                            continue
-
-                        # Calculate similarity
-                        similarity = SequenceMatcher(None, norm_a, norm_b).ratio()
-
-                        if similarity >= threshold:
-                            self._create_duplicate_group(
-                                [file_a, file_b],
-                                'fuzzy-name',
-                                f"Name similarity: {similarity:.2f}, size: {file_a['size_bytes']}"
-                            )
-
-    def _compare_filenames(self, files: List[Dict], threshold: float):
-        """
-        DEPRECATED: Use _compare_filenames_optimized instead.
-        Kept for backwards compatibility.
-        """
-        self._compare_filenames_optimized(files, threshold)
+                names = [normalize_filename(file.name) for file in size_files]
+                clusters = DisjointSet(len(size_files))
+                lowest = {}
+                for i, j, similarity in iter_similar_pairs(names, threshold):
+                    file_a, file_b = size_files[i], size_files[j]
+                    # Skip if sizes are too different (> 10%)
+                    if abs(file_a.size_bytes - file_b.size_bytes) > file_a.size_bytes * 0.1:
+                        continue
+                    root_a, root_b = clusters.find(i), clusters.find(j)
+                    weakest = min(similarity, lowest.pop(root_a, 1.0), lowest.pop(root_b, 1.0))
+                    lowest[clusters.union(i, j)] = weakest
+
+                # One group per connected cluster of matches
+                for members in clusters.components():
+                    cluster = [size_files[index]._asdict() for index in members]
+                    self._create_duplicate_group(
+                        cluster,
+                        'fuzzy-name',
+                        f"Name similarity: {lowest[clusters.find(members[0])]:.2f}, "
+                        f"size: {cluster[0]['size_bytes']}"
+                    )
 
     def _create_duplicate_group(
         self,
@@ -258,17 +423,49 @@ class Analyzer:
         detection_rule: Optional[str] = None
     ):
         """
-        Create a duplicate group and select canonical file.
+        Create a duplicate group.
+
+        The group is buffered; its canonical file is selected (and wasted
+        space counted) when the batch is flushed, so call
+        _flush_duplicate_groups() before reading groups or space_wasted back.
 
         Args:
             files: List of duplicate file records
             similarity_type: Type of duplicate (exact, fuzzy-name, etc.)
             detection_rule: Rule used to detect duplicates
         """
-        # Select canonical file
-        canonical = self._select_canonical(files)
+        self._pending_groups.append((files, similarity_type, detection_rule or similarity_type))
+        self.stats['duplicate_groups'] += 1
+        self.stats['duplicate_files'] += len(files) - 1
+        if len(self._pending_groups) >= self.group_batch_size:
+            self._flush_duplicate_groups()
 
-        # Build member list
+    def _flush_duplicate_groups(self):
+        """
+        Select canonical files for buffered groups, then write the groups and
+        buffered full hashes in a single transaction.
+        """
+        if not self._pending_groups and not self._pending_hashes:
+            return
+
+        # Score every buffered group in one pass
+        canonicals = self.canonical_selector.select_many([files for files, _, _ in self._pending_groups])
+        groups = [
+            self._build_group(files, canonical, similarity_type, detection_rule)
+            for (files, similarity_type, detection_rule), canonical in zip(self._pending_groups, canonicals)
+        ]
+
+        with self.db.transaction():
+            self.db.update_file_hashes('full', self._pending_hashes)
+            group_ids = self.db.create_duplicate_groups(groups)
+        logger.debug(f"Created {len(group_ids)} duplicate groups, "
+                     f"stored {len(self._pending_hashes)} full hashes")
+        self._pending_groups = []
+        self._pending_hashes = []
+
+    def _build_group(self, files: List[Dict], canonical: Dict, similarity_type: str,
+                     detection_rule: str) -> Dict:
+        """Build the group record for a scored group and count its wasted space."""
         members = []
         for file in files:
             is_canonical = (file['file_id'] == canonical['file_id'])
@@ -279,25 +476,18 @@ class Analyzer:
             })
 
         # Calculate space wasted (all copies except canonical)
-        space_wasted = sum(f['size_bytes'] for f in files if f['file_id'] != canonical['file_id'])
+        self.stats['space_wasted'] += sum(f['size_bytes'] for f in files
+                                          if f['file_id'] != canonical['file_id'])
 
-        group_data = {
+        return {
             'canonical_file': canonical['file_id'],
             'member_count': len(files),
             'total_size': files[0]['size_bytes'],
             'similarity_type': similarity_type,
-            'detection_rule': detection_rule or similarity_type,
+            'detection_rule': detection_rule,
             'members': members
         }
 
-        group_id = self.db.create_duplicate_group(group_data)
-
-        self.stats['duplicate_groups'] += 1
-        self.stats['duplicate_files'] += len(files) - 1
-        self.stats['space_wasted'] += space_wasted
-
-        logger.debug(f"Created duplicate group {group_id} with {len(files)} members")
-
     def _select_canonical(self, files: List[Dict]) -> Dict:
         """
         Select canonical file from duplicates using priority scoring.
@@ -308,40 +498,7 @@ class Analyzer:
         Returns:
             Canonical file record
         """
-        priorities = self.config.get('deduplication', {}).get('canonical_selection', {}).get('priorities', [])
-        preferred_paths = self.config.get('deduplication', {}).get('canonical_selection', {}).get('preferred_paths', [])
-
-        for file in files:
-            score = 0
-
-            # Priority 1: Newest modified
-            newest = max(files, key=lambda f: f['modified_at'])
-            if file['file_id'] == newest['file_id']:
-                score += 10
-
-            # Priority 2: Preferred path
-            for preferred_path in preferred_paths:
-                if preferred_path in file['path']:
-                    score += 20
-                    break
-
-            # Priority 3: Shorter path (closer to root)
-            depth = file['path'].count(os.sep)
-            score += max(0, 10 - depth)
-
-            # Priority 4: Descriptive name (not generic)
-            import re
-            if not re.search(r'(copy|backup|\(\d+\)|untitled)', file['name'], re.I):
-                score += 5
-
-            # Priority 5: Access frequency
-            if file['access_count'] > 0:
-                score += min(15, file['access_count'])
-
-            file['_priority_score'] = score
-
-        # Return highest scoring file
-        return max(files, key=lambda f: f['_priority_score'])
+        return self.canonical_selector.select(files)
 
     def _identify_orphaned_files(self, session_id: str):
         """
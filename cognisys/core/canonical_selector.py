@@ -0,0 +1,174 @@
+"""
+Canonical file selection for duplicate groups.
+
+Every file in a group is scored with weighted rules and the highest score
+wins (the first file on ties). Rules and their default weights:
+
+    newest_modified   +weight for the most recently modified file
+    preferred_path    +weight if the path contains a preferred path
+    shorter_path      +max(0, weight - path depth)
+    descriptive_name  +weight unless the name looks generic (copy, backup, (1), untitled)
+    access_frequency  +min(weight, access_count)
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+DEFAULT_RULE_WEIGHTS = {
+    'newest_modified': 10,
+    'preferred_path': 20,
+    'shorter_path': 10,
+    'descriptive_name': 5,
+    'access_frequency': 15,
+}
+
+GENERIC_NAME_RE = re.compile(r'(copy|backup|\(\d+\)|untitled)', re.I)
+
+# Batches with at least this many files are scored with NumPy arrays when available
+NUMPY_MIN_FILES = 256
+
+
+def parse_rule_weights(priorities: Optional[Sequence]) -> Dict[str, int]:
+    """
+    Build rule weights from the ``canonical_selection.priorities`` config.
+
+    Entries are ``{'rule': name, 'weight': n}`` dicts or bare rule names
+    (default weight). When any known rule is listed, only the listed rules
+    apply; otherwise every rule applies with its default weight.
+    """
+    weights = {}
+    for entry in priorities or []:
+        if isinstance(entry, dict):
+            rule = entry.get('rule')
+            weight = entry.get('weight', DEFAULT_RULE_WEIGHTS.get(rule, 0))
+        else:
+            rule, weight = entry, DEFAULT_RULE_WEIGHTS.get(entry, 0)
+        if rule in DEFAULT_RULE_WEIGHTS:
+            weights[rule] = weight
+    return weights or dict(DEFAULT_RULE_WEIGHTS)
+
+
+class CanonicalSelector:
+    """
+    Scores duplicate groups and picks each group's canonical file.
+    """
+
+    def __init__(
+        self,
+        priorities: Optional[Sequence] = None,
+        preferred_paths: Optional[Sequence[str]] = None,
+        numpy_min_files: int = NUMPY_MIN_FILES
+    ):
+        """
+        Args:
+            priorities: Weighted rules (see parse_rule_weights)
+            preferred_paths: Path fragments that mark a preferred location
+            numpy_min_files: Files per batch from which NumPy scoring is used
+        """
+        self.weights = parse_rule_weights(priorities)
+        self.numpy_min_files = numpy_min_files
+        # One alternation instead of a substring test per preferred path
+        self.preferred_re = (
+            re.compile('|'.join(re.escape(path) for path in preferred_paths))
+            if preferred_paths else None
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'CanonicalSelector':
+        """Create a selector from the ``deduplication.canonical_selection`` config section."""
+        return cls(config.get('priorities'), config.get('preferred_paths'))
+
+    def select(self, files: List[Dict]) -> Dict:
+        """
+        Score one group and return its canonical file.
+        Each file's score is stored in its ``_priority_score`` key.
+        """
+        return self.select_many([files])[0]
+
+    def select_many(self, groups: Sequence[List[Dict]]) -> List[Dict]:
+        """
+        Score many groups in one pass and return each group's canonical file.
+
+        The rules that depend on a single file are scored for all files of
+        all groups at once; the newest-file bonus and the winner are then
+        picked per group.
+        """
+        files = [file for group in groups for file in group]
+        if NUMPY_AVAILABLE and len(files) >= self.numpy_min_files:
+            scores = self._file_scores_numpy(files)
+        else:
+            scores = self._file_scores(files)
+
+        newest_weight = self.weights.get('newest_modified', 0)
+        canonicals = []
+        offset = 0
+        for group in groups:
+            group_scores = scores[offset:offset + len(group)]
+            if newest_weight:
+                newest = max(range(len(group)), key=lambda k: _modified_key(group[k]))
+                group_scores[newest] += newest_weight
+            for file, score in zip(group, group_scores):
+                file['_priority_score'] = score
+            canonicals.append(group[max(range(len(group)), key=group_scores.__getitem__)])
+            offset += len(group)
+        return canonicals
+
+    def _file_scores(self, files: List[Dict]) -> List[int]:
+        """Scores of the per-file rules, one file at a time."""
+        preferred = self.weights.get('preferred_path', 0) if self.preferred_re else 0
+        shorter = self.weights.get('shorter_path', 0)
+        descriptive = self.weights.get('descriptive_name', 0)
+        access = self.weights.get('access_frequency', 0)
+
+        scores = []
+        for file in files:
+            score = 0
+            if preferred and self.preferred_re.search(file['path']):
+                score += preferred
+            if shorter:
+                score += max(0, shorter - file['path'].count(os.sep))
+            if descriptive and not GENERIC_NAME_RE.search(file['name']):
+                score += descriptive
+            if access:
+                score += max(0, min(access, file['access_count'] or 0))
+            scores.append(score)
+        return scores
+
+    def _file_scores_numpy(self, files: List[Dict]) -> List[int]:
+        """Scores of the per-file rules, computed as arrays."""
+        preferred = self.weights.get('preferred_path', 0) if self.preferred_re else 0
+        shorter = self.weights.get('shorter_path', 0)
+        descriptive = self.weights.get('descriptive_name', 0)
+        access = self.weights.get('access_frequency', 0)
+
+        scores = np.zeros(len(files), dtype=np.int64)
+        if preferred:
+            search = self.preferred_re.search
+            scores += preferred * np.fromiter((search(file['path']) is not None for file in files),
+                                              dtype=bool, count=len(files))
+        if shorter:
+            paths = np.array([file['path'] for file in files], dtype=str)
+            scores += np.maximum(0, shorter - np.char.count(paths, os.sep))
+        if descriptive:
+            search = GENERIC_NAME_RE.search
+            scores += descriptive * np.fromiter((search(file['name']) is None for file in files),
+                                                dtype=bool, count=len(files))
+        if access:
+            counts = np.fromiter((file['access_count'] or 0 for file in files),
+                                 dtype=np.int64, count=len(files))
+            scores += np.clip(counts, 0, access)
+        return scores.tolist()
+
+
+def _modified_key(file: Dict):
+    """Sort key for modification times; files without one sort oldest."""
+    modified = file.get('modified_at')
+    return (modified is not None, modified)
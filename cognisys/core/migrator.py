@@ -57,112 +57,95 @@ class MigrationPlanner:
         """, (plan_id, datetime.now(), session_id, 'draft'))
         self.db.conn.commit()
 
-        # Generate actions
-        self._generate_duplicate_actions(plan_id, session_id)
-        self._generate_reorganization_actions(plan_id, session_id, structure_config)
-        self._generate_archive_actions(plan_id, session_id, structure_config)
+        # Generate actions (committed together)
+        with self.db.transaction():
+            self._generate_duplicate_actions(plan_id, session_id)
+            self._generate_reorganization_actions(plan_id, session_id, structure_config)
+            self._generate_archive_actions(plan_id, session_id, structure_config)
 
         logger.info(f"Migration plan {plan_id} created")
         return plan_id
 
     def _generate_duplicate_actions(self, plan_id: str, session_id: str):
         """Generate actions for handling duplicates."""
-        cursor = self.db.conn.cursor()
+        quarantine = Path("Quarantine") / f"Duplicates_{datetime.now().strftime('%Y-%m-%d')}"
 
-        # Get all duplicate groups
-        cursor.execute("""
-            SELECT dg.group_id, dg.canonical_file
+        # Stream every non-canonical member of the session's duplicate groups
+        files = self.db.iter_query("""
+            SELECT dg.group_id, f.path, f.name, f.size_bytes
             FROM duplicate_groups dg
-            JOIN files f ON dg.canonical_file = f.file_id
-            WHERE f.scan_session_id = ?
+            JOIN files c ON dg.canonical_file = c.file_id
+            JOIN duplicate_members dm ON dm.group_id = dg.group_id
+            JOIN files f ON dm.file_id = f.file_id
+            WHERE c.scan_session_id = ? AND dm.file_id != dg.canonical_file
         """, (session_id,))
 
-        for row in cursor.fetchall():
-            group_id, canonical_id = row
-
-            # Get all members except canonical
-            cursor.execute("""
-                SELECT f.*
-                FROM duplicate_members dm
-                JOIN files f ON dm.file_id = f.file_id
-                WHERE dm.group_id = ? AND dm.file_id != ?
-            """, (group_id, canonical_id))
-
-            for file_row in cursor.fetchall():
-                file = dict(file_row)
-                target_path = Path("Quarantine") / f"Duplicates_{datetime.now().strftime('%Y-%m-%d')}" / file['name']
-
-                self._add_action(
-                    plan_id=plan_id,
-                    source_path=file['path'],
-                    target_path=str(target_path),
-                    action_type='move',
-                    rule_id='duplicate_quarantine',
-                    reason=f"Duplicate (group {group_id})",
-                    file_size=file['size_bytes']
-                )
+        for file in files:
+            self._add_action(
+                plan_id=plan_id,
+                source_path=file.path,
+                target_path=str(quarantine / file.name),
+                action_type='move',
+                rule_id='duplicate_quarantine',
+                reason=f"Duplicate (group {file.group_id})",
+                file_size=file.size_bytes
+            )
 
     def _generate_reorganization_actions(self, plan_id: str, session_id: str, structure_config: Dict):
         """Generate actions for reorganizing files by category."""
-        cursor = self.db.conn.cursor()
+        repo_root = structure_config.get('repository_root', 'C:\\Repository')
+        classification = structure_config.get('classification', {})
 
-        # Get files that need reorganization (not duplicates, not orphaned)
-        cursor.execute("""
-            SELECT * FROM files
+        # Stream files that need reorganization (not duplicates, not orphaned)
+        files = self.db.iter_query("""
+            SELECT path, name, extension, size_bytes, file_category, modified_at
+            FROM files
             WHERE scan_session_id = ?
               AND is_duplicate = 0
               AND is_orphaned = 0
               AND is_temp = 0
         """, (session_id,))
 
-        repo_root = structure_config.get('repository_root', 'C:\\Repository')
-        classification = structure_config.get('classification', {})
-
-        for row in cursor.fetchall():
-            file = dict(row)
-
+        for file in files:
             # Determine target path based on category
-            category = file['file_category']
+            category = file.file_category
             if category in classification:
-                target_path = self._compute_target_path(file, classification[category], repo_root)
+                target_path = self._compute_target_path(file._asdict(), classification[category], repo_root)
 
-                if target_path and target_path != file['path']:
+                if target_path and target_path != file.path:
                     self._add_action(
                         plan_id=plan_id,
-                        source_path=file['path'],
+                        source_path=file.path,
                         target_path=target_path,
                         action_type='move',
                         rule_id=f'reorganize_{category}',
                         reason=f'Reorganize to {category} structure',
-                        file_size=file['size_bytes']
+                        file_size=file.size_bytes
                     )
 
     def _generate_archive_actions(self, plan_id: str, session_id: str, structure_config: Dict):
         """Generate actions for archiving stale files."""
-        cursor = self.db.conn.cursor()
+        repo_root = structure_config.get('repository_root', 'C:\\Repository')
+        year = datetime.now().strftime('%Y')
 
-        cursor.execute("""
-            SELECT * FROM files
+        files = self.db.iter_query("""
+            SELECT path, name, size_bytes, file_category
+            FROM files
             WHERE scan_session_id = ?
               AND is_orphaned = 1
         """, (session_id,))
 
-        repo_root = structure_config.get('repository_root', 'C:\\Repository')
-
-        for row in cursor.fetchall():
-            file = dict(row)
-
-            target_path = Path(repo_root) / 'Archive' / file['file_category'] / \
-                         datetime.now().strftime('%Y') / file['name']
+        for file in files:
+            target_path = Path(repo_root) / 'Archive' / file.file_category / year / file.name
 
             self._add_action(
                 plan_id=plan_id,
-                source_path=file['path'],
+                source_path=file.path,
                 target_path=str(target_path),
                 action_type='move',
                 rule_id='lifecycle_archive',
                 reason=f'Orphaned file (not accessed recently)',
-                file_size=file['size_bytes']
+                file_size=file.size_bytes
             )
 
     def _compute_target_path(self, file: Dict, category_config: Dict, repo_root: str) -> Optional[str]:
@@ -226,7 +209,7 @@ class MigrationPlanner:
         reason: str,
         file_size: int
     ):
-        """Add an action to the migration plan."""
+        """Add an action to the migration plan (committed by create_plan's transaction)."""
         cursor = self.db.conn.cursor()
         cursor.execute("""
             INSERT INTO migration_actions
@@ -243,7 +226,6 @@ class MigrationPlanner:
             reason,
             file_size
         ))
-        self.db.conn.commit()
 
     def get_plan_summary(self, plan_id: str) -> Dict:
         """Get summary of a migration plan."""
@@ -107,29 +107,15 @@ class Reporter:
         ]
 
     def _get_largest_folders(self, session_id: str, limit: int = 20) -> List[Dict]:
-        """Get largest folders."""
-        cursor = self.db.conn.cursor()
-        cursor.execute("""
-            SELECT f.path,
-                   COUNT(DISTINCT files.file_id) as file_count,
-                   SUM(files.size_bytes) as total_size
-            FROM folders f
-            LEFT JOIN files ON files.path LIKE f.path || '%'
-            WHERE f.scan_session_id = ?
-            GROUP BY f.folder_id
-            ORDER BY total_size DESC
-            LIMIT ?
-        """, (session_id, limit))
-
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'path': row[0],
-                'file_count': row[1],
-                'size_gb': row[2] / 1e9 if row[2] else 0
-            })
-
-        return results
+        """Get largest folders (uses the rollups stored at scan time)."""
+        return [
+            {
+                'path': f['path'],
+                'file_count': f['file_count'] or 0,
+                'size_gb': f['total_size'] / 1e9 if f['total_size'] else 0
+            }
+            for f in self.db.get_largest_folders(session_id, limit)
+        ]
 
     def _get_duplication_metrics(self, session_id: str) -> Dict:
         """Get duplication analysis."""
@@ -478,12 +464,14 @@ class Reporter:
         """Export data to CSV files."""
         import csv
 
-        # Export files inventory
-        files = self.db.get_files_by_session(session_id)
+        # Export files inventory, streamed so large sessions are never held in memory
+        files = self.db.iter_files_by_session(session_id)
         with open(output_dir / 'files_inventory.csv', 'w', newline='', encoding='utf-8') as f:
-            if files:
-                writer = csv.DictWriter(f, fieldnames=files[0].keys())
-                writer.writeheader()
+            first = next(files, None)
+            if first is not None:
+                writer = csv.writer(f)
+                writer.writerow(first._fields)
+                writer.writerow(first)
                 writer.writerows(files)
 
         logger.info(f"CSV exports saved to {output_dir}")
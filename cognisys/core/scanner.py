@@ -1,25 +1,44 @@
 """
 File scanning engine for CogniSys.
 Traverses directories, extracts metadata, and indexes files with multi-threading support.
+
+Scanning runs as a pipeline: an os.scandir walker feeds directory entries into a
+bounded queue, a fixed pool of hashing workers turns them into records (reusing
+the DirEntry stat), and a single writer thread batches records into the database.
 """
 
 import os
+import json
 import mimetypes
+import queue
 import uuid
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Set, Tuple
 import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
-from ..models.database import Database
-from ..utils.hashing import calculate_adaptive_hash
+from ..models.database import Database, folder_id_for
+from ..utils.hashing import (
+    FULL_HASH_ALGORITHM,
+    create_hashing_backend,
+    quick_hash_algorithm_for,
+    resolve_hash_algorithm,
+)
+from ..utils.hash_cache import HashCache, cache_key, quick_hash_cache_algorithm
 from ..utils.categorization import FileCategorizer
 from ..utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Queue sentinel telling pipeline workers to exit
+_STOP = object()
+
+# Accepted values for the writer connection pragmas
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_LEVELS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
 
 class FileScanner:
     """
@@ -41,28 +60,104 @@ class FileScanner:
             'files_scanned': 0,
             'folders_scanned': 0,
             'errors': 0,
-            'total_size': 0
+            'total_size': 0,
+            'files_reused': 0,
+            'files_rehashed': 0,
+            'files_new': 0,
+            'files_deleted': 0,
+            'dir_listings': 0,
+            'stat_calls': 0
         }
         self.lock = threading.Lock()
         self.db_lock = threading.Lock()  # Separate lock for database writes
         self.categorizer = FileCategorizer()  # File categorization engine
 
         # Batch processing
-        self.batch_size = self.config.get('scanning', {}).get('performance', {}).get('batch_size', 100)
+        performance = self.config.get('scanning', {}).get('performance', {})
+        self.batch_size = performance.get('batch_size', 100)
         self.file_batch = []
         self.folder_batch = []
 
+        # Pipeline: walker -> path_queue -> hash workers -> record_queue -> writer
+        self.num_workers = max(1, performance.get('threads', 4))
+        self.queue_size = performance.get('queue_size', 1000)
+        self.listing_threads = max(1, performance.get('listing_threads', 1))
+        self.path_queue = None
+        self.record_queue = None
+        self.workers = []
+        self.writer = None
+        self.stage_metrics = {
+            stage: {'items': 0, 'busy_seconds': 0.0, 'blocked_seconds': 0.0}
+            for stage in ('walk', 'hash', 'write')
+        }
+
+        # Writer transactions: commit every batch_size rows or commit_interval
+        # seconds, whichever comes first
+        self.commit_interval = performance.get('commit_interval', 2.0)
+        self.journal_mode = performance.get('journal_mode')
+        self.synchronous = performance.get('synchronous')
+        self.last_commit_time = time.perf_counter()
+        self.writer_metrics = {
+            'commits': 0,
+            'rows_committed': 0,
+            'commit_seconds': 0.0,
+            'max_commit_seconds': 0.0,
+            'queue_depth_samples': 0,
+            'queue_depth_total': 0,
+            'max_queue_depth': 0
+        }
+
+        # Hashing backend: 'thread' hashes in the workers, 'process' offloads
+        # chunks of hash_chunk_size files to a process pool
+        self.hashing_backend = performance.get('hashing_backend', 'thread')
+        self.hash_processes = performance.get('hash_processes')
+        self.hash_chunk_size = max(1, performance.get('hash_chunk_size', 64))
+        self.hasher = create_hashing_backend('thread')
+        self.quick_hash_algorithm = resolve_hash_algorithm(
+            self.config.get('scanning', {}).get('hashing', {}).get('quick_hash_algorithm', 'auto')
+        )
+
+        # Persistent hash cache shared with the analyzer and registry commands
+        self.hash_cache = HashCache.for_database(
+            self.db.db_path,
+            self.config.get('scanning', {}).get('hashing', {}).get('cache')
+        )
+
+        # Resumable scans: the walk frontier is checkpointed at each batch flush.
+        # A directory is done once its folder and every file record are written.
+        self.frontier_pending = set()     # Discovered directories not yet done
+        self.frontier_outstanding = {}    # Listed directory -> files not yet written
+        self.checkpoint_pending = []      # Frontier changes since the last checkpoint
+        self.checkpoint_done = []
+        self.resume_known_dirs = set()    # Checkpointed directories (resume only)
+        self.resume_written_paths = set()  # Files already written (resume only)
+        self.root_folders = set()         # Scan roots, which have no parent folder
+
+        # Incremental rescan: signatures from the previous session, keyed by path
+        self.incremental = self.config.get('scanning', {}).get('incremental', False)
+        self.base_session_id = None
+        self.previous_files = {}
+
         # Progress tracking
         self.start_time = None
         self.last_progress_time = None
         self.progress_interval = 1000  # Report every N files
 
-    def scan_roots(self, root_paths: List[str]) -> str:
+    def scan_roots(
+        self,
+        root_paths: List[str],
+        incremental: Optional[bool] = None,
+        base_session_id: Optional[str] = None
+    ) -> str:
         """
         Scan multiple root directories.
 
         Args:
             root_paths: List of root directory paths to scan
+            incremental: Reuse hashes and categories of files unchanged since a
+                previous session (defaults to scanning.incremental config)
+            base_session_id: Session to compare against in incremental mode
+                (defaults to the latest completed session)
 
         Returns:
             Session ID for this scan
@@ -72,23 +167,104 @@ class FileScanner:
         # Create scan session
         self.session_id = self.db.create_session(root_paths, self.config)
 
+        if incremental is not None:
+            self.incremental = incremental
+        if self.incremental:
+            self._load_previous_session(base_session_id)
+
+        walk_roots = [str(Path(root)) for root in root_paths]
+        self.frontier_pending.update(walk_roots)
+        self.checkpoint_pending.extend(walk_roots)
+
+        return self._run_scan(root_paths, walk_roots)
+
+    def resume_scan(self, session_id: str) -> str:
+        """
+        Resume an interrupted scan session from its checkpointed walk frontier.
+        Directories completed before the interruption are not listed or indexed again.
+
+        Args:
+            session_id: Session to resume
+
+        Returns:
+            Session ID of the resumed scan
+        """
+        session = self.db.get_session(session_id)
+        if session is None:
+            raise ValueError(f"Unknown scan session: {session_id}")
+        if session['status'] == 'completed':
+            raise ValueError(f"Scan session already completed: {session_id}")
+
+        root_paths = json.loads(session['root_paths'])
+        frontier = self.db.get_scan_checkpoint(session_id)
+        if not frontier['pending'] and not frontier['done']:
+            # Interrupted before the first checkpoint
+            frontier['pending'] = {str(Path(root)) for root in root_paths}
+
+        self.session_id = session_id
+        written = self.db.get_file_signatures(session_id)
+        self.resume_written_paths = set(written)
+        self.resume_known_dirs = frontier['pending'] | frontier['done']
+        self.frontier_pending = set(frontier['pending'])
+        self.stats['files_scanned'] = len(written)
+        self.stats['total_size'] = sum(f['size_bytes'] or 0 for f in written.values())
+
+        logger.info(
+            f"Resuming scan {session_id}: {len(frontier['done']):,} folders done, "
+            f"{len(frontier['pending']):,} pending, {len(written):,} files already indexed"
+        )
+        self.db.update_session(session_id, status='running')
+
+        if self.incremental:
+            self._load_previous_session()
+            for path in self.resume_written_paths:
+                self.previous_files.pop(path, None)
+
+        return self._run_scan(root_paths, sorted(frontier['pending']))
+
+    def _run_scan(self, root_paths: List[str], walk_roots: List[str]) -> str:
+        """
+        Walk the given directories through the pipeline and complete the session.
+
+        Args:
+            root_paths: Root directories of the session
+            walk_roots: Directories to walk (the roots, or the frontier when resuming)
+
+        Returns:
+            Session ID for this scan
+        """
+        self.root_folders = {str(Path(root)) for root in root_paths}
+
         # Start progress tracking
         self.start_time = time.time()
         self.last_progress_time = self.start_time
 
         try:
-            # Scan each root
-            for root in root_paths:
-                root_path = Path(root)
-                if not root_path.exists():
-                    logger.warning(f"Root path does not exist: {root}")
-                    continue
+            self._start_pipeline()
+            try:
+                # Scan each root
+                for root in walk_roots:
+                    root_path = Path(root)
+                    if not root_path.exists():
+                        logger.warning(f"Root path does not exist: {root}")
+                        continue
 
-                logger.info(f"Scanning: {root}")
-                self._scan_directory_tree(root_path)
+                    logger.info(f"Scanning: {root}")
+                    self._scan_directory_tree(root_path)
+            finally:
+                self._stop_pipeline()
 
             # Flush any remaining batches
             self._flush_batches()
+            self.stats['writer'] = self._writer_summary()
+
+            # Roll folder sizes up from the files written for this session
+            started = time.perf_counter()
+            folders = self.db.update_folder_rollups(self.session_id)
+            logger.debug(f"Rolled up sizes for {folders:,} folders in {time.perf_counter() - started:.2f}s")
+
+            if self.incremental:
+                self._count_deleted_files(root_paths)
 
             # Update session stats
             self.db.update_session(
@@ -97,6 +273,7 @@ class FileScanner:
                 files_scanned=self.stats['files_scanned'],
                 status='completed'
             )
+            self.db.clear_scan_checkpoint(self.session_id)
 
             # Calculate final statistics
             elapsed = time.time() - self.start_time
@@ -107,7 +284,29 @@ class FileScanner:
             logger.info(f"  Folders scanned: {self.stats['folders_scanned']:,}")
             logger.info(f"  Total size: {self.stats['total_size'] / 1e9:.2f} GB")
             logger.info(f"  Errors: {self.stats['errors']:,}")
+            if self.incremental:
+                logger.info(
+                    f"  Incremental: {self.stats['files_reused']:,} reused, "
+                    f"{self.stats['files_rehashed']:,} rehashed, "
+                    f"{self.stats['files_new']:,} new, "
+                    f"{self.stats['files_deleted']:,} deleted"
+                )
             logger.info(f"  Duration: {elapsed:.1f}s ({files_per_sec:.1f} files/sec)")
+            for stage, rate in self.stats['stage_throughput'].items():
+                logger.info(f"  Stage {stage}: {rate:,.1f} items/sec")
+            writer = self.stats['writer']
+            logger.info(
+                f"  Writer: {writer['commits']:,} commits, {writer['rows_per_commit']:,.0f} rows/commit, "
+                f"{writer['avg_commit_ms']:.1f} ms avg / {writer['max_commit_ms']:.1f} ms max latency, "
+                f"queue depth {writer['avg_queue_depth']:.0f} avg / {writer['max_queue_depth']} max"
+            )
+            if self.hash_cache:
+                cache_stats = self.hash_cache.get_stats()
+                self.stats['hash_cache'] = cache_stats
+                logger.info(
+                    f"  Hash cache: {cache_stats['hits']:,} hits, "
+                    f"{cache_stats['misses']:,} misses ({cache_stats['hit_rate']:.0%})"
+                )
 
             return self.session_id
 
@@ -117,47 +316,361 @@ class FileScanner:
             self.db.update_session(self.session_id, status='failed')
             raise
 
+    def _load_previous_session(self, base_session_id: Optional[str] = None):
+        """
+        Load file signatures from the base session for incremental rescans.
+
+        Args:
+            base_session_id: Session to compare against, or None for the latest
+                completed session
+        """
+        if base_session_id is None:
+            previous = self.db.get_latest_session(exclude_session_id=self.session_id)
+            base_session_id = previous['session_id'] if previous else None
+
+        if base_session_id is None:
+            logger.info("No previous completed session found; performing full scan")
+            self.previous_files = {}
+            return
+
+        self.base_session_id = base_session_id
+        self.previous_files = self.db.get_file_signatures(base_session_id)
+        logger.info(
+            f"Incremental scan against session {base_session_id} "
+            f"({len(self.previous_files):,} known files)"
+        )
+
+    def _count_deleted_files(self, root_paths: List[str]):
+        """
+        Count files from the base session that were not seen under the scanned roots.
+        Matched entries are removed from previous_files as files are indexed, so
+        whatever remains beneath a scanned root no longer exists.
+
+        Args:
+            root_paths: Root directories scanned in this session
+        """
+        prefixes = tuple(str(Path(root)) for root in root_paths)
+        deleted = sum(
+            1 for path in self.previous_files
+            if any(path == prefix or path.startswith(prefix.rstrip(os.sep) + os.sep)
+                   for prefix in prefixes)
+        )
+        self.stats['files_deleted'] = deleted
+        self.previous_files = {}
+
+    def _start_pipeline(self):
+        """Start the hashing worker pool and the database writer thread."""
+        self.path_queue = queue.Queue(maxsize=self.queue_size)
+        self.record_queue = queue.Queue(maxsize=self.queue_size)
+        self._apply_writer_pragmas()
+        if self.hashing_backend != 'thread':
+            self.hasher = create_hashing_backend(self.hashing_backend, self.hash_processes)
+
+        self.workers = [
+            threading.Thread(target=self._hash_worker, name=f"scan-hash-{i}", daemon=True)
+            for i in range(self.num_workers)
+        ]
+        self.writer = threading.Thread(target=self._write_worker, name="scan-writer", daemon=True)
+
+        for worker in self.workers:
+            worker.start()
+        self.writer.start()
+
+    def _stop_pipeline(self):
+        """Drain the pipeline: wait for hashing workers, then for the writer."""
+        if self.path_queue is None:
+            return
+
+        for _ in self.workers:
+            self.path_queue.put(_STOP)
+        for worker in self.workers:
+            worker.join()
+
+        self.record_queue.put(_STOP)
+        self.writer.join()
+
+        self.hasher.close()
+        self.hasher = create_hashing_backend('thread')
+
+        self.path_queue = None
+        self.record_queue = None
+        self.workers = []
+        self.writer = None
+
+        self.stats['stage_throughput'] = {
+            stage: (m['items'] / m['busy_seconds'] if m['busy_seconds'] > 0 else 0.0)
+            for stage, m in self.stage_metrics.items()
+        }
+
+    def _record_stage(self, stage: str, started: float, items: int = 1, blocked: float = 0.0):
+        """Accumulate item count and busy time for a pipeline stage."""
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            metrics = self.stage_metrics[stage]
+            metrics['items'] += items
+            metrics['busy_seconds'] += elapsed - blocked
+            metrics['blocked_seconds'] += blocked
+
+    def _hash_worker(self):
+        """
+        Hashing stage: index file entries taken from the path queue.
+        With the process backend, whatever is already queued (up to
+        hash_chunk_size entries) is indexed as one chunk.
+        """
+        chunk_size = self.hash_chunk_size if self.hasher.name == 'process' else 1
+        stopping = False
+
+        while not stopping:
+            item = self.path_queue.get()
+            if item is _STOP:
+                break
+
+            chunk = [item]
+            while len(chunk) < chunk_size:
+                try:
+                    item = self.path_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                chunk.append(item)
+
+            started = time.perf_counter()
+            emitted = set()
+            try:
+                self._index_files(chunk, emitted)
+            except Exception as e:
+                logger.error(f"Error processing file: {e}")
+                with self.lock:
+                    self.stats['errors'] += 1
+                # Files already sent to the writer were counted off the frontier
+                self._queue_record('skipped', [os.path.dirname(str(path)) for path, _ in chunk
+                                               if str(path) not in emitted])
+            self._record_stage('hash', started, items=len(chunk))
+
+    def _apply_writer_pragmas(self):
+        """Apply the configured journal mode and synchronous level to the scan connection."""
+        if self.journal_mode:
+            journal_mode = str(self.journal_mode).upper()
+            if journal_mode not in JOURNAL_MODES:
+                raise ValueError(f"Unknown journal_mode: {self.journal_mode}")
+            self.db.conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        if self.synchronous:
+            synchronous = str(self.synchronous).upper()
+            if synchronous not in SYNCHRONOUS_LEVELS:
+                raise ValueError(f"Unknown synchronous level: {self.synchronous}")
+            self.db.conn.execute(f"PRAGMA synchronous={synchronous}")
+
+    def _write_worker(self):
+        """
+        Writer stage: the only thread that writes scan records. Records are batched
+        and committed every batch_size rows or commit_interval seconds.
+        """
+        metrics = self.writer_metrics
+        while True:
+            timeout = None
+            if self.commit_interval:
+                timeout = max(0.0, self.commit_interval - (time.perf_counter() - self.last_commit_time))
+            try:
+                item = self.record_queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                break
+            if item is None:
+                # Nothing arrived within the commit interval
+                with self.db_lock:
+                    self._commit_batches()
+                continue
+
+            depth = self.record_queue.qsize()
+            metrics['queue_depth_samples'] += 1
+            metrics['queue_depth_total'] += depth
+            metrics['max_queue_depth'] = max(metrics['max_queue_depth'], depth)
+
+            started = time.perf_counter()
+            kind, record = item
+            if kind in ('file', 'folder'):
+                self._add_to_batch(kind, record)
+            if kind != 'folder':
+                self._track_frontier(kind, record)
+            # Frontier messages are bookkeeping, not written records
+            self._record_stage('write', started, items=int(kind in ('file', 'folder')))
+
+            if self.commit_interval and time.perf_counter() - self.last_commit_time >= self.commit_interval:
+                with self.db_lock:
+                    self._commit_batches()
+
+    def _track_frontier(self, kind: str, record):
+        """
+        Update walk frontier bookkeeping from a writer-stage message (writer thread only).
+
+        Args:
+            kind: 'listing' (dir_path, files queued, subdirectories), 'file' (file
+                record) or 'skipped' (directories of files that produced no record)
+            record: Message payload
+        """
+        if kind == 'listing':
+            dir_path, queued, subdirs = record
+            changes = {dir_path: queued}
+        elif kind == 'file':
+            changes = {os.path.dirname(record['path']): -1}
+        else:
+            changes = {}
+            for dir_path in record:
+                changes[dir_path] = changes.get(dir_path, 0) - 1
+
+        with self.db_lock:
+            if kind == 'listing':
+                self.frontier_pending.discard(dir_path)
+                self.frontier_pending.update(subdirs)
+                self.checkpoint_pending.extend(subdirs)
+
+            for dir_path, delta in changes.items():
+                remaining = self.frontier_outstanding.get(dir_path, 0) + delta
+                if remaining == 0 and dir_path not in self.frontier_pending:
+                    self.frontier_outstanding.pop(dir_path, None)
+                    self.checkpoint_done.append(dir_path)
+                else:
+                    self.frontier_outstanding[dir_path] = remaining
+
     def _scan_directory_tree(self, root: Path):
         """
-        Recursively scan directory tree with multi-threading for file processing.
+        Walk a directory tree with os.scandir, feeding file entries to the hashing workers.
+        Blocks when the path queue is full so the walk never outruns hashing.
+
+        With scanning.performance.listing_threads > 1, sibling directories are listed
+        concurrently, which hides per-directory round trips on network shares.
 
         Args:
             root: Root directory path
         """
-        exclusion_patterns = self.config.get('scanning', {}).get('exclusions', {}).get('patterns', [])
-        exclusion_folders = self.config.get('scanning', {}).get('exclusions', {}).get('folders', [])
-        max_threads = self.config.get('scanning', {}).get('performance', {}).get('threads', 4)
-
-        for dirpath, dirnames, filenames in os.walk(root):
-            current_path = Path(dirpath)
-
-            # Apply folder exclusions (modify dirnames in-place to prune walk)
-            dirnames[:] = [
-                d for d in dirnames
-                if not self._is_excluded(d, exclusion_folders)
-            ]
-
-            # Index this folder
-            self._index_folder(current_path)
-
-            # Process files with thread pool
-            with ThreadPoolExecutor(max_workers=max_threads) as executor:
-                futures = []
-
-                for filename in filenames:
-                    if not self._is_excluded(filename, exclusion_patterns):
-                        filepath = current_path / filename
-                        future = executor.submit(self._index_file, filepath)
-                        futures.append(future)
-
-                # Wait for all files in this directory to complete
-                for future in as_completed(futures):
-                    try:
-                        future.result()
-                    except Exception as e:
-                        logger.error(f"Error processing file: {e}")
-                        with self.lock:
-                            self.stats['errors'] += 1
+        if self.listing_threads > 1:
+            with ThreadPoolExecutor(max_workers=self.listing_threads) as pool:
+                pending = {pool.submit(self._list_directory, root, None)}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for subdir, subdir_entry in self._process_listing(*future.result()):
+                            pending.add(pool.submit(self._list_directory, subdir, subdir_entry))
+        else:
+            stack = [(root, None)]
+            while stack:
+                subdirs = self._process_listing(*self._list_directory(*stack.pop()))
+                stack.extend(reversed(subdirs))
+
+    def _list_directory(
+        self,
+        dir_path: Path,
+        dir_entry: Optional[os.DirEntry]
+    ) -> Tuple[Path, Optional[os.DirEntry], List[os.DirEntry], float]:
+        """
+        List a directory's entries.
+
+        Args:
+            dir_path: Directory to list
+            dir_entry: DirEntry for the directory from its parent listing (None for roots)
+
+        Returns:
+            Tuple of (dir_path, dir_entry, entries, seconds spent listing)
+        """
+        started = time.perf_counter()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.debug(f"Cannot list folder {dir_path}: {e}")
+            entries = []
+
+        with self.lock:
+            self.stats['dir_listings'] += 1
+
+        return dir_path, dir_entry, entries, time.perf_counter() - started
+
+    def _process_listing(
+        self,
+        dir_path: Path,
+        dir_entry: Optional[os.DirEntry],
+        entries: List[os.DirEntry],
+        listing_seconds: float
+    ) -> List[Tuple[Path, os.DirEntry]]:
+        """
+        Index a listed folder, queue its files and return its subdirectories to walk.
+
+        Args:
+            dir_path: Directory that was listed
+            dir_entry: DirEntry for the directory (None for roots)
+            entries: Directory entries
+            listing_seconds: Time spent listing the directory
+
+        Returns:
+            List of (path, DirEntry) for non-excluded subdirectories
+        """
+        started = time.perf_counter() - listing_seconds
+        blocked = 0.0
+        queued = 0
+        exclusions = self.config.get('scanning', {}).get('exclusions', {})
+        exclusion_patterns = exclusions.get('patterns', [])
+        exclusion_folders = exclusions.get('folders', [])
+
+        # Index this folder
+        self._index_folder(dir_path, dir_entry)
+
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                # Like os.walk, do not descend into symlinked directories
+                if entry.is_symlink() or self._is_excluded(entry.name, exclusion_folders):
+                    continue
+                # When resuming, checkpointed directories are walked from the frontier
+                if str(dir_path / entry.name) in self.resume_known_dirs:
+                    continue
+                subdirs.append((dir_path / entry.name, entry))
+            elif str(dir_path / entry.name) in self.resume_written_paths:
+                continue
+            elif not self._is_excluded(entry.name, exclusion_patterns):
+                # Hand files to the hashing workers
+                put_started = time.perf_counter()
+                self.path_queue.put((dir_path / entry.name, entry))
+                blocked += time.perf_counter() - put_started
+                queued += 1
+
+        self._queue_record('listing', (str(dir_path), queued, [str(path) for path, _ in subdirs]))
+        self._record_stage('walk', started, items=queued, blocked=blocked)
+        return subdirs
+
+    def _stat(self, path: Path, entry: Optional[os.DirEntry] = None) -> os.stat_result:
+        """
+        Stat a path, reusing the DirEntry's cached result when available.
+
+        On Windows a DirEntry carries its stat data from the directory listing, so no
+        extra syscall is needed; elsewhere the first entry.stat() call issues one.
+
+        Args:
+            path: Path to stat
+            entry: DirEntry for the path, if it came from a directory listing
+
+        Returns:
+            stat result
+        """
+        if entry is None:
+            result = path.stat()
+            issued = True
+        else:
+            issued = os.name != 'nt' or entry.is_symlink()
+            result = entry.stat()
+
+        if issued:
+            with self.lock:
+                self.stats['stat_calls'] += 1
+        return result
 
     def _is_excluded(self, name: str, exclusion_list: List[str]) -> bool:
         """
@@ -187,20 +700,23 @@ class FileScanner:
 
         return False
 
-    def _index_folder(self, folder_path: Path):
+    def _index_folder(self, folder_path: Path, entry: Optional[os.DirEntry] = None):
         """
         Index a folder and store metadata.
 
         Args:
             folder_path: Path to the folder
+            entry: DirEntry from the parent listing, reused for stat info
         """
         try:
-            stat = folder_path.stat()
+            stat = self._stat(folder_path, entry)
 
             folder_record = {
-                'folder_id': str(uuid.uuid4()),
+                'folder_id': folder_id_for(str(folder_path)),
                 'path': str(folder_path),
-                'parent_id': None,  # TODO: Link to parent folder
+                # Scan roots have no indexed parent
+                'parent_id': None if str(folder_path) in self.root_folders
+                else folder_id_for(str(folder_path.parent)),
                 'name': folder_path.name,
                 'depth': len(folder_path.parts),
                 'created_at': datetime.fromtimestamp(stat.st_ctime),
@@ -208,10 +724,7 @@ class FileScanner:
                 'scan_session_id': self.session_id
             }
 
-            with self.db_lock:
-                self.folder_batch.append(folder_record)
-                if len(self.folder_batch) >= self.batch_size:
-                    self._flush_folder_batch()
+            self._queue_record('folder', folder_record)
 
             with self.lock:
                 self.stats['folders_scanned'] += 1
@@ -219,93 +732,314 @@ class FileScanner:
         except (PermissionError, OSError) as e:
             logger.debug(f"Cannot access folder {folder_path}: {e}")
 
-    def _index_file(self, file_path: Path):
+    def _index_file(self, file_path: Path, entry: Optional[os.DirEntry] = None):
         """
         Index a single file with full metadata extraction.
 
         Args:
             file_path: Path to the file
+            entry: DirEntry from the directory listing, reused for stat info
         """
-        try:
-            stat = file_path.stat()
+        self._index_files([(file_path, entry)])
+
+    def _index_files(self, items: List[Tuple[Path, Optional[os.DirEntry]]],
+                     emitted: Optional[Set[str]] = None):
+        """
+        Index a chunk of files. Files that need hashing are sent to the hashing
+        backend in a single call, so the process backend pays IPC cost per chunk.
+
+        Args:
+            items: List of (file_path, DirEntry or None) tuples
+            emitted: Optional set that receives the path of every file a 'file'
+                or 'skipped' record has been queued for
+        """
+        if emitted is None:
+            emitted = set()
+        skip_size = self.config.get('scanning', {}).get('hashing', {}).get('skip_files_larger_than', 0)
+        records = []
+        to_hash = []
+        skipped = []
+
+        for file_path, entry in items:
+            try:
+                stat = self._stat(file_path, entry)
+            except (PermissionError, OSError, IOError) as e:
+                logger.debug(f"Cannot access file {file_path}: {e}")
+                with self.lock:
+                    self.stats['errors'] += 1
+                skipped.append(str(file_path))
+                continue
 
             # Skip if file is too large (configurable)
-            skip_size = self.config.get('scanning', {}).get('hashing', {}).get('skip_files_larger_than', 0)
             if skip_size > 0 and stat.st_size > skip_size:
                 logger.debug(f"Skipping large file: {file_path} ({stat.st_size / 1e9:.2f} GB)")
-                return
+                skipped.append(str(file_path))
+                continue
 
-            # Calculate hashes
-            quick_hash, full_hash = calculate_adaptive_hash(file_path, stat.st_size)
-
-            # Determine MIME type and category
-            mime_type, _ = mimetypes.guess_type(str(file_path))
-            file_category, file_subcategory = self.categorizer.categorize(
-                file_path.suffix,
-                mime_type,
-                file_path.name
-            )
+            modified_at = datetime.fromtimestamp(stat.st_mtime)
+            previous = self.previous_files.pop(str(file_path), None) if self.incremental else None
 
             file_record = {
                 'file_id': str(uuid.uuid4()),
                 'path': str(file_path),
-                'parent_id': None,  # TODO: Link to parent folder
+                'parent_id': folder_id_for(os.path.dirname(str(file_path))),
                 'name': file_path.name,
                 'extension': file_path.suffix.lower(),
                 'size_bytes': stat.st_size,
                 'created_at': datetime.fromtimestamp(stat.st_ctime),
-                'modified_at': datetime.fromtimestamp(stat.st_mtime),
+                'modified_at': modified_at,
                 'accessed_at': datetime.fromtimestamp(stat.st_atime),
-                'mime_type': mime_type,
-                'file_category': file_category,
-                'file_subcategory': file_subcategory,
-                'hash_quick': quick_hash,
-                'hash_full': full_hash,
                 'access_count': 0,  # TODO: Extract from OS logs
+                'inode': stat.st_ino,
                 'scan_session_id': self.session_id
             }
 
-            with self.db_lock:
-                self.file_batch.append(file_record)
-                if len(self.file_batch) >= self.batch_size:
-                    self._flush_file_batch()
+            if (previous is not None
+                    and self._is_unchanged(previous, stat, modified_at)
+                    and self._hash_algorithm_unchanged(previous, stat.st_size)):
+                # Unchanged since base session - reuse hashes and categorization
+                for field in ('hash_quick', 'hash_quick_algo', 'hash_full',
+                              'mime_type', 'file_category', 'file_subcategory'):
+                    file_record[field] = previous[field]
+                change_stat = 'files_reused'
+            else:
+                # Determine MIME type and category
+                mime_type, _ = mimetypes.guess_type(str(file_path))
+                file_category, file_subcategory = self.categorizer.categorize(
+                    file_path.suffix,
+                    mime_type,
+                    file_path.name
+                )
+                file_record['mime_type'] = mime_type
+                file_record['file_category'] = file_category
+                file_record['file_subcategory'] = file_subcategory
+                sample = self.categorizer.get_quick_hash_sample(file_category, file_subcategory)
+                file_record['hash_quick_algo'] = quick_hash_algorithm_for(
+                    stat.st_size, self.quick_hash_algorithm, sample
+                )
+                to_hash.append((file_record, sample, cache_key(stat)))
+                change_stat = 'files_rehashed' if previous is not None else 'files_new'
 
-            with self.lock:
-                self.stats['files_scanned'] += 1
-                self.stats['total_size'] += stat.st_size
-
-                # Log progress periodically with enhanced stats
-                if self.stats['files_scanned'] % self.progress_interval == 0:
-                    current_time = time.time()
-                    elapsed = current_time - self.start_time
-                    interval_elapsed = current_time - self.last_progress_time
-
-                    # Calculate speeds
-                    overall_speed = self.stats['files_scanned'] / elapsed if elapsed > 0 else 0
-                    interval_speed = self.progress_interval / interval_elapsed if interval_elapsed > 0 else 0
-
-                    logger.info(
-                        f"[PROGRESS] {self.stats['files_scanned']:,} files | "
-                        f"{self.stats['total_size'] / 1e9:.2f} GB | "
-                        f"{overall_speed:.0f} files/sec | "
-                        f"Errors: {self.stats['errors']}"
-                    )
-
-                    self.last_progress_time = current_time
-
-        except (PermissionError, OSError, IOError) as e:
-            logger.debug(f"Cannot access file {file_path}: {e}")
-            with self.lock:
-                self.stats['errors'] += 1
+            records.append((file_record, change_stat))
+
+        # Reuse hashes from the persistent cache, calculate the rest
+        if to_hash and self.hash_cache:
+            to_hash = self._apply_cached_hashes(to_hash)
+        if to_hash:
+            hashes = self.hasher.hash_many(
+                [(r['path'], r['size_bytes'], sample) for r, sample, _ in to_hash],
+                self.quick_hash_algorithm
+            )
+            for (file_record, _, _), (quick_hash, full_hash) in zip(to_hash, hashes):
+                file_record['hash_quick'] = quick_hash
+                file_record['hash_full'] = full_hash
+            if self.hash_cache:
+                self.hash_cache.put_many(
+                    (key, quick_hash_cache_algorithm(r['size_bytes'], r['hash_quick_algo']), r['hash_quick'])
+                    for r, _, key in to_hash
+                )
+
+        for file_record, change_stat in records:
+            self._queue_record('file', file_record)
+            emitted.add(file_record['path'])
+            self._count_file(file_record['size_bytes'], change_stat)
+        if skipped:
+            self._queue_record('skipped', [os.path.dirname(path) for path in skipped])
+            emitted.update(skipped)
+
+    def _apply_cached_hashes(self, to_hash: List[Tuple]) -> List[Tuple]:
+        """
+        Fill in hashes the persistent cache already holds.
+
+        Args:
+            to_hash: List of (file_record, sample, cache_key) tuples
+
+        Returns:
+            The entries that still need hashing
+        """
+        cache_algorithms = [
+            quick_hash_cache_algorithm(r['size_bytes'], r['hash_quick_algo'])
+            for r, _, _ in to_hash
+        ]
+        digests = self.hash_cache.get_many(
+            (key, algorithm) for (_, _, key), algorithm in zip(to_hash, cache_algorithms)
+        )
+
+        pending = []
+        for item, algorithm, digest in zip(to_hash, cache_algorithms, digests):
+            if digest is None:
+                pending.append(item)
+                continue
+            file_record = item[0]
+            file_record['hash_quick'] = digest
+            file_record['hash_full'] = digest if algorithm == FULL_HASH_ALGORITHM else None
+        return pending
+
+    def _count_file(self, size_bytes: int, change_stat: str):
+        """
+        Update file statistics and log progress periodically.
+
+        Args:
+            size_bytes: Size of the indexed file
+            change_stat: Incremental counter to bump (files_reused, files_rehashed, files_new)
+        """
+        with self.lock:
+            self.stats['files_scanned'] += 1
+            self.stats['total_size'] += size_bytes
+            if self.incremental:
+                self.stats[change_stat] += 1
+
+            # Log progress periodically with enhanced stats
+            if self.stats['files_scanned'] % self.progress_interval == 0:
+                current_time = time.time()
+                elapsed = current_time - self.start_time
+                interval_elapsed = current_time - self.last_progress_time
+
+                # Calculate speeds
+                overall_speed = self.stats['files_scanned'] / elapsed if elapsed > 0 else 0
+                interval_speed = self.progress_interval / interval_elapsed if interval_elapsed > 0 else 0
+
+                logger.info(
+                    f"[PROGRESS] {self.stats['files_scanned']:,} files | "
+                    f"{self.stats['total_size'] / 1e9:.2f} GB | "
+                    f"{overall_speed:.0f} files/sec | "
+                    f"Errors: {self.stats['errors']}"
+                )
+
+                self.last_progress_time = current_time
+
+    def _is_unchanged(self, previous: Dict, stat: os.stat_result, modified_at: datetime) -> bool:
+        """
+        Check whether a file's stat signature matches its record from the base session.
+
+        Args:
+            previous: File signature from the base session
+            stat: Current stat result
+            modified_at: Current modification time
+
+        Returns:
+            True if size, modification time and inode are unchanged
+        """
+        if previous['size_bytes'] != stat.st_size:
+            return False
+        if previous['modified_at'] != str(modified_at):
+            return False
+        # Inode is unavailable for sessions recorded before it was tracked
+        if previous['inode'] is not None and previous['inode'] != stat.st_ino:
+            return False
+        return True
+
+    def _queue_record(self, kind: str, record: Dict):
+        """
+        Hand a record to the writer stage, or batch it directly when no pipeline is running.
+
+        Args:
+            kind: 'file' or 'folder', or a walk frontier message (see _track_frontier)
+            record: Record dictionary or message payload
+        """
+        record_queue = self.record_queue
+        if record_queue is not None:
+            record_queue.put((kind, record))
+        elif kind in ('file', 'folder'):
+            # Frontier messages only matter to the pipeline's writer
+            self._add_to_batch(kind, record)
+
+    def _add_to_batch(self, kind: str, record: Dict):
+        """
+        Append a record to its batch, committing once batch_size rows are pending.
+
+        Args:
+            kind: 'file' or 'folder'
+            record: Record dictionary
+        """
+        with self.db_lock:
+            if kind == 'folder':
+                self.folder_batch.append(record)
+            else:
+                self.file_batch.append(record)
+            if len(self.file_batch) + len(self.folder_batch) >= self.batch_size:
+                self._commit_batches()
+
+    def _hash_algorithm_unchanged(self, previous: Dict, size_bytes: int) -> bool:
+        """
+        Check whether a base-session quick hash was taken with the current hashing settings.
+
+        Args:
+            previous: File signature from the base session
+            size_bytes: Current file size
+
+        Returns:
+            True if the recorded quick hash algorithm matches the current configuration
+        """
+        sample = self.categorizer.get_quick_hash_sample(
+            previous['file_category'], previous['file_subcategory']
+        )
+        expected = quick_hash_algorithm_for(size_bytes, self.quick_hash_algorithm, sample)
+        return (previous['hash_quick_algo'] or FULL_HASH_ALGORITHM) == expected
 
     def _flush_batches(self):
         """Flush all pending batches to database."""
         with self.db_lock:
-            self._flush_folder_batch()
-            self._flush_file_batch()
+            self._commit_batches()
+
+    def _commit_batches(self):
+        """
+        Write pending folders, files and walk frontier changes in one transaction
+        (db_lock held). Folders go first so every directory checkpointed as done
+        has its record.
+        """
+        self.last_commit_time = time.perf_counter()
+        rows = len(self.folder_batch) + len(self.file_batch)
+        if not (rows or self.checkpoint_pending or self.checkpoint_done):
+            return
+
+        started = time.perf_counter()
+        self._flush_folder_batch()
+        self._flush_file_batch()
+        self._save_checkpoint()
+        try:
+            self.db.conn.commit()
+        except Exception as e:
+            logger.error(f"Error committing scan batch: {e}")
+        elapsed = time.perf_counter() - started
+
+        metrics = self.writer_metrics
+        metrics['commits'] += 1
+        metrics['rows_committed'] += rows
+        metrics['commit_seconds'] += elapsed
+        metrics['max_commit_seconds'] = max(metrics['max_commit_seconds'], elapsed)
+        self.last_commit_time = time.perf_counter()
+
+    def _writer_summary(self) -> Dict:
+        """Summarize writer commit latency and record queue depth."""
+        metrics = self.writer_metrics
+        commits = metrics['commits']
+        samples = metrics['queue_depth_samples']
+        return {
+            'commits': commits,
+            'rows_per_commit': metrics['rows_committed'] / commits if commits else 0.0,
+            'avg_commit_ms': metrics['commit_seconds'] * 1000 / commits if commits else 0.0,
+            'max_commit_ms': metrics['max_commit_seconds'] * 1000,
+            'avg_queue_depth': metrics['queue_depth_total'] / samples if samples else 0.0,
+            'max_queue_depth': metrics['max_queue_depth']
+        }
+
+    def _save_checkpoint(self):
+        """Stage walk frontier changes in the current transaction (db_lock held)."""
+        if not (self.checkpoint_pending or self.checkpoint_done) or self.session_id is None:
+            return
+
+        try:
+            self.db.save_scan_checkpoint(
+                self.session_id, self.checkpoint_pending, self.checkpoint_done, commit=False
+            )
+        except Exception as e:
+            logger.error(f"Error saving scan checkpoint: {e}")
+        self.checkpoint_pending = []
+        self.checkpoint_done = []
 
     def _flush_file_batch(self):
-        """Flush pending file records to database."""
+        """Insert pending file records (committed by _commit_batches)."""
         if not self.file_batch:
             return
 
@@ -316,27 +1050,30 @@ class FileScanner:
                 INSERT INTO files (
                     file_id, path, parent_id, name, extension, size_bytes,
                     created_at, modified_at, accessed_at, mime_type, file_category,
-                    file_subcategory, hash_quick, hash_full, access_count, scan_session_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    file_subcategory, hash_quick, hash_quick_algo, hash_full, access_count,
+                    inode, scan_session_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, [
                 (
                     f.get('file_id'), f.get('path'), f.get('parent_id'), f.get('name'),
                     f.get('extension'), f.get('size_bytes'), f.get('created_at'),
                     f.get('modified_at'), f.get('accessed_at'), f.get('mime_type'),
                     f.get('file_category'), f.get('file_subcategory'), f.get('hash_quick'),
-                    f.get('hash_full'), f.get('access_count', 0), f.get('scan_session_id')
+                    f.get('hash_quick_algo'), f.get('hash_full'), f.get('access_count', 0), f.get('inode'),
+                    f.get('scan_session_id')
                 )
                 for f in self.file_batch
             ])
-            self.db.conn.commit()
             logger.debug(f"Flushed {len(self.file_batch)} files to database")
             self.file_batch = []
         except Exception as e:
             logger.error(f"Error flushing file batch: {e}")
             self.file_batch = []
+            # Records were lost, so their directories must be redone on resume
+            self.checkpoint_done = []
 
     def _flush_folder_batch(self):
-        """Flush pending folder records to database."""
+        """Insert pending folder records (committed by _commit_batches)."""
         if not self.folder_batch:
             return
 
@@ -357,7 +1094,6 @@ class FileScanner:
                 )
                 for f in self.folder_batch
             ])
-            self.db.conn.commit()
             logger.debug(f"Flushed {len(self.folder_batch)} folders to database")
             self.folder_batch = []
         except Exception as e:
@@ -0,0 +1,193 @@
+"""
+Session compaction for CogniSys.
+Collapses old scan sessions into deltas against the next scan of the same roots,
+so the files table grows with change volume rather than with scan count.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from ..models.database import Database
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_KEEP_SESSIONS = 5
+DEFAULT_VACUUM_FREE_RATIO = 0.25
+DEFAULT_BATCH_SIZE = 10000
+
+
+class SessionCompactor:
+    """
+    Compacts old scan sessions into change deltas.
+
+    A session is compacted against its base: the next completed session over
+    the same root paths. Files whose path, size, modification time and quick
+    hash match the base are deleted; files that changed or disappeared by the
+    base are kept, and base paths the session did not have are recorded in
+    session_deltas. Database.iter_session_snapshot rebuilds the full file list.
+    Files still referenced by duplicate groups or ML classifications are
+    always kept, so analysis results stay intact.
+    """
+
+    def __init__(self, database: Database, config: Optional[Dict] = None):
+        """
+        Initialize the compactor.
+
+        Args:
+            database: Database instance
+            config: Configuration; reads database.maintenance (keep_sessions,
+                vacuum_free_ratio, batch_size)
+        """
+        self.db = database
+        maintenance = (config or {}).get('database', {}).get('maintenance', {})
+        self.keep_sessions = maintenance.get('keep_sessions', DEFAULT_KEEP_SESSIONS)
+        self.vacuum_free_ratio = maintenance.get('vacuum_free_ratio', DEFAULT_VACUUM_FREE_RATIO)
+        self.batch_size = maintenance.get('batch_size', DEFAULT_BATCH_SIZE)
+        self.stats = {
+            'sessions_compacted': 0,
+            'files_removed': 0,
+            'files_kept': 0,
+            'paths_recorded': 0,
+            'vacuumed': False,
+        }
+
+    def find_candidates(self, keep: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        Find sessions to compact, oldest first.
+
+        The newest ``keep`` completed sessions of each set of root paths stay
+        in full; every older, not yet compacted session is paired with the
+        next newer session of the same roots as its base.
+
+        Returns:
+            (session_id, base_session_id) pairs
+        """
+        keep = self.keep_sessions if keep is None else keep
+        if keep < 1:
+            raise ValueError("At least one session per root set must be kept in full")
+
+        cursor = self.db.conn.cursor()
+        cursor.execute("""
+            SELECT session_id, root_paths, compacted_at
+            FROM scan_sessions
+            WHERE status = 'completed'
+            ORDER BY started_at, session_id
+        """)
+        by_roots = {}
+        for row in cursor.fetchall():
+            by_roots.setdefault(row['root_paths'], []).append(row)
+
+        candidates = []
+        for sessions in by_roots.values():
+            for older, newer in zip(sessions[:-keep], sessions[1:]):
+                # A compacted base no longer stores its unchanged files
+                if not older['compacted_at'] and not newer['compacted_at']:
+                    candidates.append((older['session_id'], newer['session_id']))
+        return candidates
+
+    def compact(self, keep: Optional[int] = None, dry_run: bool = False,
+                vacuum: Optional[bool] = None) -> Dict:
+        """
+        Compact every candidate session, then refresh statistics and vacuum.
+
+        Args:
+            keep: Completed sessions per root set to keep in full
+            dry_run: Only report the sessions that would be compacted
+            vacuum: True to always VACUUM, False to never, None to VACUUM when
+                the free page ratio reaches vacuum_free_ratio
+
+        Returns:
+            Compaction statistics
+        """
+        candidates = self.find_candidates(keep)
+        self.stats['candidates'] = candidates
+        if dry_run or not candidates:
+            return self.stats
+
+        for session_id, base_session_id in candidates:
+            self.compact_session(session_id, base_session_id)
+
+        # Row counts changed a lot: refresh planner statistics
+        self.db.analyze()
+        if vacuum is not False:
+            self.stats['vacuumed'] = self.db.vacuum(0.0 if vacuum else self.vacuum_free_ratio)
+
+        logger.info(f"Compacted {self.stats['sessions_compacted']} sessions: "
+                    f"{self.stats['files_removed']:,} file rows removed, "
+                    f"{self.stats['files_kept']:,} kept as changes")
+        return self.stats
+
+    def compact_session(self, session_id: str, base_session_id: str) -> Dict:
+        """
+        Compact one session against a base session.
+
+        The base must not be compacted itself, since unchanged files are
+        matched against its stored rows.
+
+        Returns:
+            Counts of removed and kept files and recorded absent paths
+        """
+        base = self.db.get_session(base_session_id)
+        if base is None or base.get('compacted_at'):
+            raise ValueError(f"Base session {base_session_id} is missing or compacted")
+
+        logger.info(f"Compacting session {session_id} against {base_session_id}")
+        conn = self.db.conn
+
+        # Paths the base has that this session did not: excluded when rebuilding
+        with self.db.transaction():
+            cursor = conn.execute("""
+                INSERT OR IGNORE INTO session_deltas (session_id, path)
+                SELECT ?, b.path
+                FROM files b
+                WHERE b.scan_session_id = ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM files s
+                      WHERE s.path = b.path AND s.scan_session_id = ?
+                  )
+            """, (session_id, base_session_id, session_id))
+            recorded = cursor.rowcount
+
+        # Unchanged files, in batches so readers are never blocked for long
+        removed = 0
+        while True:
+            with self.db.transaction():
+                cursor = conn.execute("""
+                    DELETE FROM files WHERE rowid IN (
+                        SELECT s.rowid
+                        FROM files s
+                        JOIN files b ON b.path = s.path AND b.scan_session_id = ?
+                        WHERE s.scan_session_id = ?
+                          AND s.size_bytes IS b.size_bytes
+                          AND s.modified_at IS b.modified_at
+                          AND s.hash_quick IS b.hash_quick
+                          AND NOT EXISTS (SELECT 1 FROM duplicate_members dm
+                                          WHERE dm.file_id = s.file_id)
+                          AND NOT EXISTS (SELECT 1 FROM ml_classifications mc
+                                          WHERE mc.file_id = s.file_id)
+                        LIMIT ?
+                    )
+                """, (base_session_id, session_id, self.batch_size))
+            if cursor.rowcount <= 0:
+                break
+            removed += cursor.rowcount
+
+        with self.db.transaction():
+            kept = conn.execute("SELECT COUNT(*) FROM files WHERE scan_session_id = ?",
+                                (session_id,)).fetchone()[0]
+            conn.execute("""
+                UPDATE scan_sessions
+                SET base_session_id = ?, compacted_at = ?
+                WHERE session_id = ?
+            """, (base_session_id, datetime.now(), session_id))
+
+        self.stats['sessions_compacted'] += 1
+        self.stats['files_removed'] += removed
+        self.stats['files_kept'] += kept
+        self.stats['paths_recorded'] += recorded
+        return {'removed': removed, 'kept': kept, 'recorded': recorded}
+
+    def get_stats(self) -> Dict:
+        """Get compaction statistics."""
+        return self.stats.copy()
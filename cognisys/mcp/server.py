@@ -5,9 +5,9 @@ Exposes CogniSys classification and organization operations via MCP protocol
 """
 
 import asyncio
-import sqlite3
 import os
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 from datetime import datetime
@@ -18,6 +18,8 @@ from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
 import mcp.server.stdio
 import mcp.types as types
 
+from cognisys.models.connection_pool import ConnectionPool
+
 
 # Initialize MCP Server
 app = Server("cognisys")
@@ -26,6 +28,19 @@ app = Server("cognisys")
 DB_PATH = Path(__file__).parent.parent.parent / 'cognisys' / 'data' / 'training' / 'cognisys_ml.db'
 ORGANIZED_ROOT = Path("C:/Users/kjfle/Documents/Organized_V2")
 
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Get the shared connection pool for the ML database"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
@@ -191,44 +206,42 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 async def get_statistics(detailed: bool = False) -> list[TextContent]:
     """Get CogniSys classification statistics"""
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
-
-        # Total documents
-        cursor.execute("SELECT COUNT(*) FROM documents")
-        total_count = cursor.fetchone()[0]
-
-        # Average confidence
-        cursor.execute("SELECT AVG(confidence) FROM documents WHERE confidence IS NOT NULL")
-        avg_confidence = cursor.fetchone()[0] or 0
-
-        # Documents by type
-        cursor.execute("""
-            SELECT document_type, COUNT(*) as count
-            FROM documents
-            GROUP BY document_type
-            ORDER BY count DESC
-        """)
-        types_distribution = cursor.fetchall()
-
-        # Confidence distribution
-        cursor.execute("""
-            SELECT
-                CASE
-                    WHEN confidence >= 0.90 THEN 'Very High (>=90%)'
-                    WHEN confidence >= 0.75 THEN 'High (75-90%)'
-                    WHEN confidence >= 0.50 THEN 'Medium (50-75%)'
-                    WHEN confidence >= 0.25 THEN 'Low (25-50%)'
-                    ELSE 'Very Low (<25%)'
-                END as conf_level,
-                COUNT(*) as count
-            FROM documents
-            WHERE confidence IS NOT NULL
-            GROUP BY conf_level
-        """)
-        confidence_distribution = cursor.fetchall()
-
-        conn.close()
+        with get_pool().reader() as conn:
+            cursor = conn.cursor()
+
+            # Total documents
+            cursor.execute("SELECT COUNT(*) FROM documents")
+            total_count = cursor.fetchone()[0]
+
+            # Average confidence
+            cursor.execute("SELECT AVG(confidence) FROM documents WHERE confidence IS NOT NULL")
+            avg_confidence = cursor.fetchone()[0] or 0
+
+            # Documents by type
+            cursor.execute("""
+                SELECT document_type, COUNT(*) as count
+                FROM documents
+                GROUP BY document_type
+                ORDER BY count DESC
+            """)
+            types_distribution = cursor.fetchall()
+
+            # Confidence distribution
+            cursor.execute("""
+                SELECT
+                    CASE
+                        WHEN confidence >= 0.90 THEN 'Very High (>=90%)'
+                        WHEN confidence >= 0.75 THEN 'High (75-90%)'
+                        WHEN confidence >= 0.50 THEN 'Medium (50-75%)'
+                        WHEN confidence >= 0.25 THEN 'Low (25-50%)'
+                        ELSE 'Very Low (<25%)'
+                    END as conf_level,
+                    COUNT(*) as count
+                FROM documents
+                WHERE confidence IS NOT NULL
+                GROUP BY conf_level
+            """)
+            confidence_distribution = cursor.fetchall()
 
         # Format response
         response = f"""CogniSys Classification Statistics
@@ -269,34 +282,33 @@ async def query_documents(
 ) -> list[TextContent]:
     """Query documents with filters"""
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
+        with get_pool().reader() as conn:
+            cursor = conn.cursor()
 
-        # Build query
-        query = "SELECT id, file_name, document_type, confidence, file_path FROM documents WHERE 1=1"
-        params = []
+            # Build query
+            query = "SELECT id, file_name, document_type, confidence, file_path FROM documents WHERE 1=1"
+            params = []
 
-        if document_type:
-            query += " AND document_type = ?"
-            params.append(document_type)
+            if document_type:
+                query += " AND document_type = ?"
+                params.append(document_type)
 
-        if min_confidence is not None:
-            query += " AND confidence >= ?"
-            params.append(min_confidence)
+            if min_confidence is not None:
+                query += " AND confidence >= ?"
+                params.append(min_confidence)
 
-        if max_confidence is not None:
-            query += " AND confidence <= ?"
-            params.append(max_confidence)
+            if max_confidence is not None:
+                query += " AND confidence <= ?"
+                params.append(max_confidence)
 
-        if filename_pattern:
-            query += " AND file_name LIKE ?"
-            params.append(filename_pattern)
+            if filename_pattern:
+                query += " AND file_name LIKE ?"
+                params.append(filename_pattern)
 
-        query += f" ORDER BY confidence ASC LIMIT {limit}"
+            query += f" ORDER BY confidence ASC LIMIT {limit}"
 
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        conn.close()
+            cursor.execute(query, params)
+            results = cursor.fetchall()
 
         if not results:
             return [TextContent(type="text", text="No documents found matching the criteria.")]
@@ -347,28 +359,24 @@ To classify files now, use:
 async def reclassify_file(file_id: int, new_type: str, confidence: float = 1.0) -> list[TextContent]:
     """Reclassify a file"""
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
+        with get_pool().writer() as conn:
+            cursor = conn.cursor()
 
-        # Get current file info
-        cursor.execute("SELECT file_name, document_type, file_path FROM documents WHERE id = ?", (file_id,))
-        result = cursor.fetchone()
+            # Get current file info
+            cursor.execute("SELECT file_name, document_type, file_path FROM documents WHERE id = ?", (file_id,))
+            result = cursor.fetchone()
 
-        if not result:
-            conn.close()
-            return [TextContent(type="text", text=f"File ID {file_id} not found in database.")]
-
-        filename, old_type, old_path = result
+            if not result:
+                return [TextContent(type="text", text=f"File ID {file_id} not found in database.")]
 
-        # Update database
-        cursor.execute("""
-            UPDATE documents
-            SET document_type = ?, confidence = ?
-            WHERE id = ?
-        """, (new_type, confidence, file_id))
+            filename, old_type, old_path = result
 
-        conn.commit()
-        conn.close()
+            # Update database
+            cursor.execute("""
+                UPDATE documents
+                SET document_type = ?, confidence = ?
+                WHERE id = ?
+            """, (new_type, confidence, file_id))
 
         response = f"""File Reclassified Successfully
 {'=' * 50}
@@ -392,37 +400,36 @@ Run: python scripts/workflows/reorganize_function_form.py --execute
 async def get_review_candidates(priority: str = "critical", limit: int = 20) -> list[TextContent]:
     """Get files needing manual review"""
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
-
-        if priority == "critical":
-            query = """
-                SELECT id, file_name, document_type, confidence
-                FROM documents
-                WHERE confidence < 0.50 OR document_type = 'unknown'
-                ORDER BY confidence ASC
-                LIMIT ?
-            """
-        elif priority == "high":
-            query = """
-                SELECT id, file_name, document_type, confidence
-                FROM documents
-                WHERE confidence < 0.75 OR document_type IN ('unknown', 'general_document')
-                ORDER BY confidence ASC
-                LIMIT ?
-            """
-        else:  # all
-            query = """
-                SELECT id, file_name, document_type, confidence
-                FROM documents
-                WHERE confidence < 0.75 OR document_type IN ('unknown', 'general_document', 'form')
-                ORDER BY confidence ASC
-                LIMIT ?
-            """
-
-        cursor.execute(query, (limit,))
-        results = cursor.fetchall()
-        conn.close()
+        with get_pool().reader() as conn:
+            cursor = conn.cursor()
+
+            if priority == "critical":
+                query = """
+                    SELECT id, file_name, document_type, confidence
+                    FROM documents
+                    WHERE confidence < 0.50 OR document_type = 'unknown'
+                    ORDER BY confidence ASC
+                    LIMIT ?
+                """
+            elif priority == "high":
+                query = """
+                    SELECT id, file_name, document_type, confidence
+                    FROM documents
+                    WHERE confidence < 0.75 OR document_type IN ('unknown', 'general_document')
+                    ORDER BY confidence ASC
+                    LIMIT ?
+                """
+            else:  # all
+                query = """
+                    SELECT id, file_name, document_type, confidence
+                    FROM documents
+                    WHERE confidence < 0.75 OR document_type IN ('unknown', 'general_document', 'form')
+                    ORDER BY confidence ASC
+                    LIMIT ?
+                """
+
+            cursor.execute(query, (limit,))
+            results = cursor.fetchall()
 
         if not results:
             return [TextContent(type="text", text=f"No files need review at {priority} priority level.")]
@@ -444,17 +451,16 @@ async def get_review_candidates(priority: str = "critical", limit: int = 20) ->
 async def get_document_details(file_id: int) -> list[TextContent]:
     """Get detailed document information"""
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
+        with get_pool().reader() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT id, file_name, file_path, document_type, confidence, created_date
-            FROM documents
-            WHERE id = ?
-        """, (file_id,))
+            cursor.execute("""
+                SELECT id, file_name, file_path, document_type, confidence, created_date
+                FROM documents
+                WHERE id = ?
+            """, (file_id,))
 
-        result = cursor.fetchone()
-        conn.close()
+            result = cursor.fetchone()
 
         if not result:
             return [TextContent(type="text", text=f"Document ID {file_id} not found.")]
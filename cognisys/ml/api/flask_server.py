@@ -85,7 +85,8 @@ def get_training_db():
     global training_db
     if training_db is None:
         logger.info("Initializing training database...")
-        training_db = create_database()
+        # Request threads read through pooled read-only connections
+        training_db = create_database(read_pool=True)
     return training_db
 
 
@@ -344,7 +345,8 @@ def get_statistics():
 
         return jsonify({
             'success': True,
-            'statistics': stats
+            'statistics': stats,
+            'connection_pool': db.pool.get_stats() if db.pool else None
         })
 
     except Exception as e:
@@ -9,6 +9,9 @@ from typing import Dict, List, Optional
 from pathlib import Path
 from datetime import datetime
 import json
+from contextlib import contextmanager
+
+from cognisys.models.connection_pool import ConnectionPool
 
 
 class TrainingDatabase:
@@ -16,12 +19,16 @@ class TrainingDatabase:
     Manages training data, predictions, and feedback for continuous learning.
     """
 
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, read_pool: bool = False, wal: bool = False):
         """
         Initialize training database.
 
         Args:
             db_path: Path to SQLite database file
+            read_pool: Serve read queries from a bounded pool of reusable read-only
+                connections instead of the shared write connection
+            wal: Switch the database file to WAL so pooled reads never wait on a
+                write (persistent; avoid on network shares)
         """
         self.logger = logging.getLogger(__name__)
 
@@ -37,6 +44,14 @@ class TrainingDatabase:
         self.connect()
         self.create_tables()
 
+        if wal:
+            # WAL lets pooled readers run while the write connection is busy
+            self.conn.execute('PRAGMA journal_mode=WAL')
+
+        self.pool = None
+        if read_pool:
+            self.pool = ConnectionPool(self.db_path, row_factory=sqlite3.Row)
+
         self.logger.info(f"Training database initialized: {self.db_path}")
 
     def connect(self):
@@ -44,6 +59,15 @@ class TrainingDatabase:
         self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row  # Enable column access by name
 
+    @contextmanager
+    def reader(self):
+        """Get a connection for read-only queries (pooled if enabled)."""
+        if self.pool is None:
+            yield self.conn
+        else:
+            with self.pool.reader() as conn:
+                yield conn
+
     def create_tables(self):
         """Create database tables if they don't exist."""
         cursor = self.conn.cursor()
@@ -245,8 +269,6 @@ class TrainingDatabase:
         Returns:
             List of training documents with labels
         """
-        cursor = self.conn.cursor()
-
         # Query documents with predictions and optional feedback
         query = '''
             SELECT
@@ -263,8 +285,8 @@ class TrainingDatabase:
         if include_feedback:
             query += ' AND (f.correct_category IS NOT NULL OR p.predicted_category IS NOT NULL)'
 
-        cursor.execute(query, (min_confidence,))
-        rows = cursor.fetchall()
+        with self.reader() as conn:
+            rows = conn.execute(query, (min_confidence,)).fetchall()
 
         training_data = []
         for row in rows:
@@ -360,14 +382,12 @@ class TrainingDatabase:
         Returns:
             List of category dicts
         """
-        cursor = self.conn.cursor()
-
         query = 'SELECT * FROM categories'
         if active_only:
             query += ' WHERE is_active = 1'
 
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        with self.reader() as conn:
+            rows = conn.execute(query).fetchall()
 
         return [dict(row) for row in rows]
 
@@ -378,45 +398,48 @@ class TrainingDatabase:
         Returns:
             Statistics dictionary
         """
-        cursor = self.conn.cursor()
-
         stats = {}
 
-        # Document counts
-        cursor.execute('SELECT COUNT(*) FROM documents')
-        stats['total_documents'] = cursor.fetchone()[0]
+        with self.reader() as conn:
+            cursor = conn.cursor()
+
+            # Document counts
+            cursor.execute('SELECT COUNT(*) FROM documents')
+            stats['total_documents'] = cursor.fetchone()[0]
 
-        # Prediction counts
-        cursor.execute('SELECT COUNT(*) FROM predictions')
-        stats['total_predictions'] = cursor.fetchone()[0]
+            # Prediction counts
+            cursor.execute('SELECT COUNT(*) FROM predictions')
+            stats['total_predictions'] = cursor.fetchone()[0]
 
-        # Feedback counts
-        cursor.execute('SELECT COUNT(*) FROM feedback')
-        stats['total_feedback'] = cursor.fetchone()[0]
+            # Feedback counts
+            cursor.execute('SELECT COUNT(*) FROM feedback')
+            stats['total_feedback'] = cursor.fetchone()[0]
 
-        cursor.execute('SELECT COUNT(*) FROM feedback WHERE was_correct = 1')
-        stats['correct_predictions'] = cursor.fetchone()[0]
+            cursor.execute('SELECT COUNT(*) FROM feedback WHERE was_correct = 1')
+            stats['correct_predictions'] = cursor.fetchone()[0]
 
-        cursor.execute('SELECT COUNT(*) FROM feedback WHERE was_correct = 0')
-        stats['corrected_predictions'] = cursor.fetchone()[0]
+            cursor.execute('SELECT COUNT(*) FROM feedback WHERE was_correct = 0')
+            stats['corrected_predictions'] = cursor.fetchone()[0]
 
-        # Category counts
-        cursor.execute('SELECT COUNT(*) FROM categories WHERE is_active = 1')
-        stats['active_categories'] = cursor.fetchone()[0]
+            # Category counts
+            cursor.execute('SELECT COUNT(*) FROM categories WHERE is_active = 1')
+            stats['active_categories'] = cursor.fetchone()[0]
 
-        # Training sessions
-        cursor.execute('SELECT COUNT(*) FROM training_sessions')
-        stats['training_sessions'] = cursor.fetchone()[0]
+            # Training sessions
+            cursor.execute('SELECT COUNT(*) FROM training_sessions')
+            stats['training_sessions'] = cursor.fetchone()[0]
 
-        # Latest accuracy
-        cursor.execute('SELECT accuracy FROM training_sessions ORDER BY id DESC LIMIT 1')
-        row = cursor.fetchone()
-        stats['latest_accuracy'] = row[0] if row else None
+            # Latest accuracy
+            cursor.execute('SELECT accuracy FROM training_sessions ORDER BY id DESC LIMIT 1')
+            row = cursor.fetchone()
+            stats['latest_accuracy'] = row[0] if row else None
 
         return stats
 
     def close(self):
         """Close database connection."""
+        if self.pool:
+            self.pool.close()
         if self.conn:
             self.conn.close()
             self.logger.info("Database connection closed")
@@ -431,14 +454,16 @@ class TrainingDatabase:
 
 
 # Convenience function
-def create_database(db_path: str = None):
+def create_database(db_path: str = None, read_pool: bool = False, wal: bool = False):
     """
     Factory function to create training database.
 
     Args:
         db_path: Database file path
+        read_pool: Serve reads from a pool of read-only connections
+        wal: Switch the database file to WAL (see TrainingDatabase)
 
     Returns:
         Configured TrainingDatabase
     """
-    return TrainingDatabase(db_path=db_path)
+    return TrainingDatabase(db_path=db_path, read_pool=read_pool, wal=wal)
@@ -1,5 +1,6 @@
 """Database models and schemas for CogniSys."""
 
 from .database import Database
+from .connection_pool import ConnectionPool
 
-__all__ = ['Database']
+__all__ = ['Database', 'ConnectionPool']
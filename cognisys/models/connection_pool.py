@@ -0,0 +1,221 @@
+"""
+SQLite connection pool for concurrent readers.
+Read-only connections (URI ``mode=ro``) are checked out of a bounded queue and
+checked back in after each use, so at most max_readers are ever open no matter
+how many threads or requests come and go; all writes go through a single
+lock-guarded connection.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+DEFAULT_MAX_READERS = 8
+DEFAULT_TIMEOUT = 30.0
+
+
+class ConnectionPool:
+    """
+    A bounded set of reusable read-only connections plus one writer, with wait-time and
+    in-use metrics. Readers never take the writer lock, so with WAL enabled
+    dashboard and MCP queries keep running while a write is in progress.
+    The pool leaves the database's journal mode alone unless asked to enable WAL.
+    """
+
+    def __init__(self, db_path, max_readers: int = DEFAULT_MAX_READERS,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 row_factory: Optional[Callable] = None,
+                 wal: bool = False):
+        """
+        Create a pool for a database file.
+
+        Args:
+            db_path: Path to the SQLite database file (must already exist for readers)
+            max_readers: Maximum number of read connections open (and in use) at once
+            timeout: Seconds to wait for a reader slot, the writer, or a busy database
+            row_factory: Optional row factory applied to every connection
+            wal: Switch the database to WAL when the writer first connects. WAL is
+                a persistent file setting and unsafe on network shares, so it is
+                off by default; read-only connections work in any journal mode
+        """
+        if str(db_path) == ':memory:':
+            raise ValueError("ConnectionPool requires a database file, not ':memory:'")
+
+        self.db_path = Path(db_path)
+        self.max_readers = max_readers
+        self.timeout = timeout
+        self.row_factory = row_factory
+        self.wal = wal
+
+        # A slot is held for as long as a connection is checked out; idle
+        # connections wait in the queue, so no more than max_readers are opened
+        self._slots = threading.BoundedSemaphore(max_readers)
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._write_lock = threading.Lock()
+        self._write_conn = None
+        self._lock = threading.Lock()
+        self._readers: List[sqlite3.Connection] = []
+        self._closed = False
+
+        self.stats = {
+            'reader_acquires': 0,
+            'reader_wait_time': 0.0,
+            'reader_max_wait': 0.0,
+            'readers_in_use': 0,
+            'readers_peak': 0,
+            'readers_opened': 0,
+            'readers_closed': 0,
+            'writer_acquires': 0,
+            'writer_wait_time': 0.0,
+            'writer_max_wait': 0.0,
+            'writer_in_use': 0,
+        }
+
+    def _read_uri(self) -> str:
+        """Build the read-only URI for the database file."""
+        return f"{self.db_path.resolve().as_uri()}?mode=ro"
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a new read-only connection (called with a reader slot held)."""
+        conn = sqlite3.connect(self._read_uri(), uri=True, timeout=self.timeout,
+                               check_same_thread=False)
+        if self.row_factory is not None:
+            conn.row_factory = self.row_factory
+
+        with self._lock:
+            self._readers.append(conn)
+            self.stats['readers_opened'] += 1
+
+        return conn
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        """Take an idle read connection, or open one if none is idle."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._open_reader()
+
+    def _checkin_reader(self, conn: sqlite3.Connection):
+        """Return a read connection to the idle queue (close() has already closed it otherwise)."""
+        if self._closed:
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def _record_wait(self, prefix: str, waited: float):
+        """Update acquire/wait counters (pool lock held)."""
+        self.stats[f'{prefix}_acquires'] += 1
+        self.stats[f'{prefix}_wait_time'] += waited
+        self.stats[f'{prefix}_max_wait'] = max(self.stats[f'{prefix}_max_wait'], waited)
+
+    @contextmanager
+    def reader(self):
+        """
+        Check out a read-only connection; it is checked back in when the block exits.
+
+        Raises:
+            TimeoutError: If no reader slot frees up within the pool timeout
+            sqlite3.OperationalError: If the database file cannot be opened
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No read connection available after {self.timeout}s")
+        waited = time.perf_counter() - start
+
+        with self._lock:
+            self._record_wait('reader', waited)
+            self.stats['readers_in_use'] += 1
+            self.stats['readers_peak'] = max(self.stats['readers_peak'],
+                                             self.stats['readers_in_use'])
+
+        conn = None
+        try:
+            conn = self._checkout_reader()
+            yield conn
+        finally:
+            if conn is not None:
+                self._checkin_reader(conn)
+            with self._lock:
+                self.stats['readers_in_use'] -= 1
+            self._slots.release()
+
+    @contextmanager
+    def writer(self):
+        """
+        Borrow the writer connection for a transaction.
+
+        Commits when the block exits normally and rolls back on an exception.
+
+        Raises:
+            TimeoutError: If the writer stays busy for longer than the pool timeout
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        start = time.perf_counter()
+        if not self._write_lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Writer connection busy for more than {self.timeout}s")
+        waited = time.perf_counter() - start
+
+        with self._lock:
+            self._record_wait('writer', waited)
+            self.stats['writer_in_use'] = 1
+
+        try:
+            if self._write_conn is None:
+                self._write_conn = sqlite3.connect(str(self.db_path), timeout=self.timeout,
+                                                   check_same_thread=False)
+                if self.wal:
+                    self._write_conn.execute("PRAGMA journal_mode=WAL")
+                if self.row_factory is not None:
+                    self._write_conn.row_factory = self.row_factory
+            try:
+                yield self._write_conn
+                self._write_conn.commit()
+            except BaseException:
+                self._write_conn.rollback()
+                raise
+        finally:
+            with self._lock:
+                self.stats['writer_in_use'] = 0
+            self._write_lock.release()
+
+    def get_stats(self) -> Dict:
+        """Return pool metrics, including average wait times and open connections."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['readers_open'] = len(self._readers)
+        for prefix in ('reader', 'writer'):
+            acquires = stats[f'{prefix}_acquires']
+            stats[f'{prefix}_avg_wait'] = stats[f'{prefix}_wait_time'] / acquires if acquires else 0.0
+        stats['max_readers'] = self.max_readers
+        return stats
+
+    def close(self):
+        """Close every connection owned by the pool."""
+        with self._lock:
+            self._closed = True
+            for conn in self._readers:
+                conn.close()
+                self.stats['readers_closed'] += 1
+            self._readers.clear()
+        self._idle = queue.LifoQueue()
+        with self._write_lock:
+            if self._write_conn is not None:
+                self._write_conn.close()
+                self._write_conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
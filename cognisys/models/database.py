@@ -5,244 +5,209 @@ Handles all database operations including schema creation and queries.
 
 import sqlite3
 import json
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Sequence, Tuple
 import uuid
 
+from .schema import SCAN_MIGRATIONS, SchemaMigrator
+
+
+# Connection tuning profiles, selected with database.profile in the config
+PRAGMA_PROFILES = {
+    'default': {},  # SQLite defaults (rollback journal, synchronous=FULL)
+    'safe': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'temp_store': 'MEMORY',
+        'cache_size': -65536,  # 64MB
+    },
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 10000,
+        'temp_store': 'MEMORY',
+        'cache_size': -262144,  # 256MB
+        'mmap_size': 1073741824,  # 1GB
+    },
+}
+
+# Pragmas that may be set from config
+TUNABLE_PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'temp_store', 'cache_size', 'mmap_size')
+
+# Rows fetched per round trip by the streaming iter_* methods
+STREAM_CHUNK_SIZE = 5000
+
+# Namespace for deterministic folder IDs
+FOLDER_ID_NAMESPACE = uuid.UUID('5d0f3c2e-8a57-4f4b-9b1e-6c0b7c1f2a90')
+
+
+@lru_cache(maxsize=65536)
+def folder_id_for(folder_path: str) -> str:
+    """
+    Get the folder ID for a folder path.
+
+    IDs are derived from the path, so a folder keeps its ID across scan sessions
+    and a file's parent_id can be computed without looking its folder up.
+    """
+    return str(uuid.uuid5(FOLDER_ID_NAMESPACE, str(folder_path)))
+
+
+def compute_folder_rollups(conn: sqlite3.Connection, session_id: str) -> int:
+    """
+    Compute folder size rollups for a scan session bottom-up and store them
+    (without committing). Shared by Database.update_folder_rollups and the
+    schema migration that backfills rollups for existing sessions.
+
+    Returns:
+        Number of folders updated
+    """
+    folders = conn.execute("""
+        SELECT folder_id, parent_id, path FROM folders WHERE scan_session_id = ?
+    """, (session_id,)).fetchall()
+
+    # [direct_size, direct_file_count, total_size, file_count, subfolder_count]
+    totals = {folder[0]: [0, 0, 0, 0, 0] for folder in folders}
+    for parent_id, file_count, size in conn.execute("""
+        SELECT parent_id, COUNT(*), COALESCE(SUM(size_bytes), 0)
+        FROM files
+        WHERE scan_session_id = ?
+        GROUP BY parent_id
+    """, (session_id,)):
+        folder = totals.get(parent_id)
+        if folder is not None:
+            folder[0] = folder[2] = size
+            folder[1] = folder[3] = file_count
+
+    # Children before parents (a child's path is always longer than its parent's)
+    for folder_id, parent_id, path in sorted(folders, key=lambda f: len(f[2]), reverse=True):
+        parent = totals.get(parent_id)
+        if parent is not None:
+            child = totals[folder_id]
+            parent[2] += child[2]
+            parent[3] += child[3]
+            parent[4] += 1
+
+    conn.executemany("""
+        UPDATE folders
+        SET direct_size = ?, direct_file_count = ?, total_size = ?, file_count = ?,
+            subfolder_count = ?
+        WHERE folder_id = ?
+    """, [(*values, folder_id) for folder_id, values in totals.items()])
+    return len(totals)
+
+
+@lru_cache(maxsize=256)
+def row_type(columns: Tuple[str, ...]):
+    """
+    Get the namedtuple type for a result's column names.
+
+    Streamed rows use these instead of dicts: attribute access (row.path),
+    ``row._asdict()`` when a dict is needed, and a fraction of the memory.
+    """
+    return namedtuple('Row', columns, rename=True)
+
 
 class Database:
     """SQLite database manager for file indexing and analysis."""
 
-    def __init__(self, db_path: str):
-        """Initialize database connection and create schema if needed."""
+    def __init__(self, db_path: str, config: Optional[Dict] = None):
+        """
+        Initialize database connection and create schema if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+            config: Optional ``database`` config section with a pragma ``profile``
+                (see PRAGMA_PROFILES) and per-pragma ``pragmas`` overrides
+        """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self._tx_depth = 0
+        self._tx_lock = threading.RLock()
+        self.pragmas = self._apply_pragmas(config or {})
         self._create_schema()
 
-    def _create_schema(self):
-        """Create all necessary tables."""
-        cursor = self.conn.cursor()
-
-        # Files table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS files (
-                file_id TEXT PRIMARY KEY,
-                path TEXT NOT NULL,
-                parent_id TEXT,
-                name TEXT NOT NULL,
-                extension TEXT,
-                size_bytes INTEGER,
-                created_at DATETIME,
-                modified_at DATETIME,
-                accessed_at DATETIME,
-                mime_type TEXT,
-                file_category TEXT,
-                file_subcategory TEXT,
-                hash_quick TEXT,
-                hash_full TEXT,
-                access_count INTEGER DEFAULT 0,
-                last_opened DATETIME,
-                owner TEXT,
-                permissions TEXT,
-                attributes TEXT,
-                is_duplicate BOOLEAN DEFAULT 0,
-                duplicate_group TEXT,
-                is_orphaned BOOLEAN DEFAULT 0,
-                is_temp BOOLEAN DEFAULT 0,
-                scan_session_id TEXT NOT NULL,
-                indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Indexes for performance
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_path ON files(path)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_hash_quick ON files(hash_quick)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_hash_full ON files(hash_full)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_size ON files(size_bytes)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_modified ON files(modified_at)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_category ON files(file_category)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_session ON files(scan_session_id)")
-
-        # Folders table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS folders (
-                folder_id TEXT PRIMARY KEY,
-                path TEXT NOT NULL UNIQUE,
-                parent_id TEXT,
-                name TEXT NOT NULL,
-                depth INTEGER,
-                total_size INTEGER,
-                file_count INTEGER,
-                subfolder_count INTEGER,
-                folder_type TEXT,
-                created_at DATETIME,
-                modified_at DATETIME,
-                scan_session_id TEXT NOT NULL
-            )
-        """)
-
-        # Duplicate groups
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS duplicate_groups (
-                group_id TEXT PRIMARY KEY,
-                canonical_file TEXT,
-                member_count INTEGER,
-                total_size INTEGER,
-                similarity_type TEXT,
-                detection_rule TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS duplicate_members (
-                group_id TEXT,
-                file_id TEXT,
-                priority_score REAL,
-                reason TEXT,
-                PRIMARY KEY (group_id, file_id)
-            )
-        """)
-
-        # Scan sessions
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS scan_sessions (
-                session_id TEXT PRIMARY KEY,
-                started_at DATETIME,
-                completed_at DATETIME,
-                root_paths TEXT,
-                files_scanned INTEGER DEFAULT 0,
-                status TEXT,
-                config_snapshot TEXT
-            )
-        """)
-
-        # Migration plans
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS migration_plans (
-                plan_id TEXT PRIMARY KEY,
-                created_at DATETIME,
-                session_id TEXT,
-                approved BOOLEAN DEFAULT 0,
-                executed_at DATETIME,
-                status TEXT
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS migration_actions (
-                action_id TEXT PRIMARY KEY,
-                plan_id TEXT,
-                source_path TEXT,
-                target_path TEXT,
-                action_type TEXT,
-                rule_id TEXT,
-                reason TEXT,
-                file_size INTEGER,
-                executed BOOLEAN DEFAULT 0,
-                execution_time DATETIME,
-                rollback_data TEXT
-            )
-        """)
-
-        # ML Classifications table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ml_classifications (
-                classification_id TEXT PRIMARY KEY,
-                file_id TEXT NOT NULL,
-                model_name TEXT NOT NULL,
-                predicted_category TEXT,
-                confidence REAL,
-                probabilities TEXT,
-                classified_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                session_id TEXT,
-                FOREIGN KEY (file_id) REFERENCES files(file_id)
-            )
-        """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ml_file ON ml_classifications(file_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ml_model ON ml_classifications(model_name)")
-
-        # Staging tables for preview/commit workflow
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS staging_plans (
-                plan_id TEXT PRIMARY KEY,
-                created_at DATETIME,
-                session_id TEXT,
-                staging_root TEXT,
-                target_root TEXT,
-                status TEXT,
-                method TEXT,
-                committed_at DATETIME
-            )
-        """)
+    def _apply_pragmas(self, config: Dict) -> Dict:
+        """
+        Apply the configured pragma profile and overrides to the connection.
+
+        Returns:
+            Pragmas that were set
+        """
+        profile = config.get('profile', 'default')
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Unknown database profile: {profile}")
+
+        pragmas = dict(PRAGMA_PROFILES[profile])
+        pragmas.update(config.get('pragmas') or {})
+
+        for name, value in pragmas.items():
+            if name not in TUNABLE_PRAGMAS:
+                raise ValueError(f"Unsupported pragma: {name}")
+            if not isinstance(value, int) and not str(value).isalpha():
+                raise ValueError(f"Invalid value for pragma {name}: {value}")
+            self.conn.execute(f"PRAGMA {name} = {value}")
+        return pragmas
+
+    def get_pragmas(self) -> Dict:
+        """Read back the current value of each tunable pragma."""
+        return {
+            name: self.conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in TUNABLE_PRAGMAS
+        }
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several helper calls into a single commit.
+
+        Helpers called inside the block skip their own commit; the block commits
+        once on success and rolls back on error. Nested blocks join the outer one.
+        Blocks opened from different threads run one at a time; since the
+        connection is shared, other threads' writes during a block join it.
+
+        Usage:
+            with db.transaction():
+                db.update_file_hash(...)
+                db.create_duplicate_group(...)
+        """
+        with self._tx_lock:
+            self._tx_depth += 1
+            try:
+                yield self.conn
+                if self._tx_depth == 1:
+                    self.conn.commit()
+            except BaseException:
+                if self._tx_depth == 1:
+                    self.conn.rollback()
+                raise
+            finally:
+                self._tx_depth -= 1
+
+    def _commit(self):
+        """Commit unless inside a transaction() block."""
+        if self._tx_depth == 0:
+            self.conn.commit()
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS staging_actions (
-                action_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                plan_id TEXT,
-                source_path TEXT,
-                staging_path TEXT,
-                target_path TEXT,
-                action_type TEXT,
-                status TEXT,
-                conflict_type TEXT,
-                validation_errors TEXT,
-                resolution_strategy TEXT,
-                FOREIGN KEY (plan_id) REFERENCES staging_plans(plan_id)
-            )
-        """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_staging_plan ON staging_actions(plan_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_staging_status ON staging_actions(status)")
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS conflict_resolutions (
-                resolution_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                action_id INTEGER,
-                conflict_type TEXT,
-                strategy TEXT,
-                resolved_path TEXT,
-                resolved_at DATETIME,
-                FOREIGN KEY (action_id) REFERENCES staging_actions(action_id)
-            )
-        """)
-
-        # Snapshots for rollback
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS snapshots (
-                snapshot_id TEXT PRIMARY KEY,
-                created_at DATETIME,
-                snapshot_type TEXT,
-                plan_id TEXT,
-                root_path TEXT,
-                file_count INTEGER,
-                total_size INTEGER,
-                manifest_path TEXT
-            )
-        """)
-
-        # Rollback log
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS rollback_log (
-                log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                plan_id TEXT,
-                action_id INTEGER,
-                before_state TEXT,
-                after_state TEXT,
-                rolled_back INTEGER DEFAULT 0,
-                rollback_timestamp DATETIME
-            )
-        """)
-
-        # Add classified_category column to files if not exists
-        try:
-            cursor.execute("ALTER TABLE files ADD COLUMN classified_category TEXT")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+    def _create_schema(self):
+        """
+        Create the schema or apply pending migrations (see schema.SCAN_MIGRATIONS).
 
-        self.conn.commit()
+        An up-to-date database only costs a PRAGMA user_version read.
+        """
+        SchemaMigrator(self.conn, SCAN_MIGRATIONS).migrate()
 
     def create_session(self, root_paths: List[str], config: Dict) -> str:
         """Create a new scan session."""
@@ -259,7 +224,7 @@ class Database:
             'running',
             json.dumps(config)
         ))
-        self.conn.commit()
+        self._commit()
         return session_id
 
     def update_session(self, session_id: str, **kwargs):
@@ -271,7 +236,77 @@ class Database:
                 SET {key} = ?
                 WHERE session_id = ?
             """, (value, session_id))
-        self.conn.commit()
+        self._commit()
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        """Get a scan session by ID."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM scan_sessions WHERE session_id = ?", (session_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def get_latest_session(self, status: str = 'completed',
+                           exclude_session_id: Optional[str] = None) -> Optional[Dict]:
+        """Get the most recently started scan session with the given status."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT * FROM scan_sessions
+            WHERE status = ? AND session_id != ?
+            ORDER BY started_at DESC
+            LIMIT 1
+        """, (status, exclude_session_id or ''))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def get_file_signatures(self, session_id: str) -> Dict[str, Dict]:
+        """
+        Get stat signatures and derived metadata for every file in a session, keyed by path.
+        Used by incremental rescans to detect unchanged files.
+        Compacted sessions are rebuilt from their base sessions.
+        """
+        columns = ('path', 'size_bytes', 'modified_at', 'inode', 'mime_type', 'file_category',
+                   'file_subcategory', 'hash_quick', 'hash_quick_algo', 'hash_full')
+        return {row.path: row._asdict() for row in self.iter_session_snapshot(session_id, columns)}
+
+    def save_scan_checkpoint(self, session_id: str, pending: List[str], done: List[str],
+                             commit: bool = True):
+        """
+        Record walk frontier changes for a scan session.
+
+        Args:
+            session_id: Scan session
+            pending: Directories discovered but not yet fully indexed
+            done: Directories whose folder and file records are all written
+            commit: Commit immediately (False to join the caller's transaction)
+        """
+        cursor = self.conn.cursor()
+        cursor.executemany("""
+            INSERT OR IGNORE INTO scan_checkpoints (session_id, path, status)
+            VALUES (?, ?, 'pending')
+        """, [(session_id, path) for path in pending])
+        cursor.executemany("""
+            INSERT OR REPLACE INTO scan_checkpoints (session_id, path, status)
+            VALUES (?, ?, 'done')
+        """, [(session_id, path) for path in done])
+        if commit:
+            self._commit()
+
+    def get_scan_checkpoint(self, session_id: str) -> Dict[str, set]:
+        """Get the checkpointed walk frontier of a scan session as {'pending': set, 'done': set}."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT path, status FROM scan_checkpoints WHERE session_id = ?
+        """, (session_id,))
+        frontier = {'pending': set(), 'done': set()}
+        for row in cursor.fetchall():
+            frontier[row['status']].add(row['path'])
+        return frontier
+
+    def clear_scan_checkpoint(self, session_id: str):
+        """Delete the checkpointed walk frontier of a scan session."""
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM scan_checkpoints WHERE session_id = ?", (session_id,))
+        self._commit()
 
     def insert_file(self, file_record: Dict[str, Any]):
         """Insert a file record into the database."""
@@ -280,8 +315,9 @@ class Database:
             INSERT INTO files (
                 file_id, path, parent_id, name, extension, size_bytes,
                 created_at, modified_at, accessed_at, mime_type, file_category,
-                file_subcategory, hash_quick, hash_full, access_count, scan_session_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                file_subcategory, hash_quick, hash_quick_algo, hash_full, access_count,
+                inode, scan_session_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             file_record.get('file_id'),
             file_record.get('path'),
@@ -296,11 +332,13 @@ class Database:
             file_record.get('file_category'),
             file_record.get('file_subcategory'),
             file_record.get('hash_quick'),
+            file_record.get('hash_quick_algo'),
             file_record.get('hash_full'),
             file_record.get('access_count', 0),
+            file_record.get('inode'),
             file_record.get('scan_session_id')
         ))
-        self.conn.commit()
+        self._commit()
 
     def insert_folder(self, folder_record: Dict[str, Any]):
         """Insert a folder record into the database."""
@@ -325,14 +363,187 @@ class Database:
             folder_record.get('modified_at'),
             folder_record.get('scan_session_id')
         ))
-        self.conn.commit()
+        self._commit()
+
+    def get_folder_path(self, folder_id: str) -> Optional[str]:
+        """Get the path of a folder by ID."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT path FROM folders WHERE folder_id = ?", (folder_id,))
+        row = cursor.fetchone()
+        return row['path'] if row else None
+
+    def get_files_in_folder(self, folder_id: str, session_id: Optional[str] = None) -> List[Dict]:
+        """Get the files directly inside a folder, optionally limited to one session."""
+        cursor = self.conn.cursor()
+        if session_id:
+            cursor.execute("""
+                SELECT * FROM files WHERE parent_id = ? AND scan_session_id = ?
+            """, (folder_id, session_id))
+        else:
+            cursor.execute("SELECT * FROM files WHERE parent_id = ?", (folder_id,))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_subfolders(self, folder_id: str) -> List[Dict]:
+        """Get the folders directly inside a folder."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM folders WHERE parent_id = ?", (folder_id,))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def update_folder_rollups(self, session_id: str) -> int:
+        """
+        Compute folder size rollups for a scan session bottom-up and store them.
+
+        direct_size/direct_file_count cover files directly in a folder,
+        total_size/file_count include every subfolder, and subfolder_count
+        counts immediate subfolders.
+
+        Returns:
+            Number of folders updated
+        """
+        updated = compute_folder_rollups(self.conn, session_id)
+        self._commit()
+        return updated
+
+    def get_largest_folders(self, session_id: str, limit: int = 20) -> List[Dict]:
+        """Get the largest folders of a session by recursive size."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT path, file_count, total_size, direct_size, subfolder_count
+            FROM folders
+            WHERE scan_session_id = ?
+            ORDER BY total_size DESC
+            LIMIT ?
+        """, (session_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
 
     def get_files_by_session(self, session_id: str) -> List[Dict]:
-        """Retrieve all files from a scan session."""
+        """
+        Retrieve all files from a scan session.
+
+        Materialises every row as a dict; prefer iter_files_by_session for large sessions.
+        """
         cursor = self.conn.cursor()
         cursor.execute("SELECT * FROM files WHERE scan_session_id = ?", (session_id,))
         return [dict(row) for row in cursor.fetchall()]
 
+    def iter_query(self, query: str, params: Sequence = (),
+                   chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Stream query results as namedtuple rows, fetching chunk_size rows at a time.
+
+        The query runs on its own cursor, so other helpers can be called while
+        iterating; writes to the table being read may or may not be seen.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        make_row = row_type(tuple(column[0] for column in cursor.description))._make
+        cursor.row_factory = lambda _cursor, row: make_row(row)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def iter_files_by_session(self, session_id: str, columns: Optional[Sequence[str]] = None,
+                              order_by: Optional[str] = None,
+                              chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Stream the files of a scan session as namedtuple rows.
+
+        Args:
+            session_id: Scan session ID
+            columns: Columns to select (default: all); fewer columns means smaller rows
+            order_by: Optional column to order by, e.g. parent_id to stream folder by folder
+            chunk_size: Rows fetched per round trip
+        """
+        names = list(columns or []) + ([order_by] if order_by else [])
+        invalid = [name for name in names if not name.isidentifier()]
+        if invalid:
+            raise ValueError(f"Invalid column names: {invalid}")
+
+        query = f"SELECT {', '.join(columns) if columns else '*'} FROM files WHERE scan_session_id = ?"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        return self.iter_query(query, (session_id,), chunk_size)
+
+    def iter_session_snapshot(self, session_id: str, columns: Optional[Sequence[str]] = None,
+                              chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Stream every file a session saw, including files removed by compaction.
+
+        A compacted session only stores files that differ from its base
+        session; the rest are read from the base (recursively), skipping paths
+        the session already has and paths recorded in session_deltas as absent
+        from it. For a session that was never compacted this is the same as
+        iter_files_by_session. Rows from a base session keep its file_id and
+        scan_session_id.
+
+        Args:
+            session_id: Scan session ID
+            columns: Columns to select (default: all); path is always included
+        """
+        if columns and 'path' not in columns:
+            columns = ('path',) + tuple(columns)
+
+        seen = set()
+        absent = set()
+        current = session_id
+        while current:
+            for row in self.iter_files_by_session(current, columns, chunk_size=chunk_size):
+                if row.path not in seen and row.path not in absent:
+                    seen.add(row.path)
+                    yield row
+
+            session = self.get_session(current)
+            if not session or not session.get('compacted_at'):
+                break
+            absent.update(row.path for row in self.iter_query(
+                "SELECT path FROM session_deltas WHERE session_id = ?", (current,), chunk_size))
+            current = session['base_session_id']
+
+    def analyze(self):
+        """Refresh query planner statistics for every table and index (ANALYZE)."""
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+
+    def optimize(self):
+        """
+        Run PRAGMA optimize, which re-analyzes only tables whose statistics
+        are stale. Cheap enough to run after every scan or analysis.
+        """
+        self.conn.execute("PRAGMA optimize")
+        self._commit()
+
+    def get_free_page_ratio(self) -> float:
+        """Fraction of database pages on the freelist (reclaimable by VACUUM)."""
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return freelist_count / page_count if page_count else 0.0
+
+    def vacuum(self, min_free_ratio: float = 0.0) -> bool:
+        """
+        Rebuild the database file to reclaim free pages.
+
+        Args:
+            min_free_ratio: Skip the VACUUM unless at least this fraction of
+                pages is free
+
+        Returns:
+            True if VACUUM ran
+        """
+        free_ratio = self.get_free_page_ratio()
+        if free_ratio == 0 or free_ratio < min_free_ratio:
+            return False
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("VACUUM")
+        return True
+
     def get_duplicate_candidates(self, session_id: str) -> List[Dict]:
         """Find potential duplicate files by size and extension."""
         cursor = self.conn.cursor()
@@ -346,11 +557,69 @@ class Database:
         """, (session_id,))
         return [dict(row) for row in cursor.fetchall()]
 
-    def get_files_by_hash(self, hash_value: str, hash_type: str = 'quick') -> List[Dict]:
-        """Get all files with a specific hash value."""
+    def iter_exact_duplicate_candidates(self, session_id: str, columns: Sequence[str],
+                                        min_size: int = 1,
+                                        chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Stream the files of a session whose size, extension and quick hash collide.
+
+        Both passes run in SQL: files are grouped by size + extension, and the
+        members of colliding groups are counted per quick hash (and quick-hash
+        algorithm) with a window function. Only files that still collide are
+        returned, ordered so that each group's rows are adjacent.
+
+        Args:
+            session_id: Scan session ID
+            columns: File columns to select
+            min_size: Smallest file size considered
+            chunk_size: Rows fetched per round trip
+        """
+        invalid = [name for name in columns if not name.isidentifier()]
+        if invalid:
+            raise ValueError(f"Invalid column names: {invalid}")
+
+        select = ', '.join(f"f.{name}" for name in columns)
+        outer = ', '.join(columns)
+        query = f"""
+            WITH sizes AS (
+                SELECT size_bytes, extension
+                FROM files
+                WHERE scan_session_id = ? AND size_bytes >= ?
+                GROUP BY size_bytes, extension
+                HAVING COUNT(*) > 1
+            ),
+            members AS (
+                SELECT {select},
+                       COALESCE(f.hash_quick_algo, 'sha256') AS algo,
+                       COUNT(*) OVER (PARTITION BY f.size_bytes, f.extension,
+                                      COALESCE(f.hash_quick_algo, 'sha256'), f.hash_quick) AS collisions
+                FROM sizes
+                JOIN files f ON f.scan_session_id = ? AND f.size_bytes = sizes.size_bytes
+                            AND f.extension IS sizes.extension
+                WHERE f.hash_quick IS NOT NULL
+            )
+            SELECT {outer}
+            FROM members
+            WHERE collisions > 1
+            ORDER BY size_bytes, extension, algo, hash_quick
+        """
+        return self.iter_query(query, (session_id, max(min_size, 1), session_id), chunk_size)
+
+    def get_files_by_hash(self, hash_value: str, hash_type: str = 'quick',
+                          algorithm: Optional[str] = None) -> List[Dict]:
+        """
+        Get all files with a specific hash value.
+        For quick hashes, pass algorithm so hashes from different algorithms never match.
+        """
         cursor = self.conn.cursor()
         column = 'hash_quick' if hash_type == 'quick' else 'hash_full'
-        cursor.execute(f"SELECT * FROM files WHERE {column} = ?", (hash_value,))
+        if hash_type == 'quick' and algorithm:
+            cursor.execute(f"""
+                SELECT * FROM files
+                WHERE {column} = ? AND COALESCE(hash_quick_algo, 'sha256') = ?
+            """, (hash_value, algorithm))
+        else:
+            cursor.execute(f"SELECT * FROM files WHERE {column} = ?", (hash_value,))
         return [dict(row) for row in cursor.fetchall()]
 
     def update_file_hash(self, file_id: str, hash_type: str, hash_value: str):
@@ -360,44 +629,77 @@ class Database:
         cursor.execute(f"""
             UPDATE files SET {column} = ? WHERE file_id = ?
         """, (hash_value, file_id))
-        self.conn.commit()
+        self._commit()
+
+    def update_file_hashes(self, hash_type: str, updates: Sequence[Tuple[str, str]]):
+        """
+        Update hash values for many files with a single executemany.
+
+        Args:
+            hash_type: 'quick' or 'full'
+            updates: (file_id, hash_value) pairs
+        """
+        column = 'hash_quick' if hash_type == 'quick' else 'hash_full'
+        self.conn.executemany(f"""
+            UPDATE files SET {column} = ? WHERE file_id = ?
+        """, [(hash_value, file_id) for file_id, hash_value in updates])
+        self._commit()
 
     def create_duplicate_group(self, group_data: Dict) -> str:
         """Create a duplicate group."""
-        group_id = f"dup-{uuid.uuid4().hex[:8]}"
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO duplicate_groups
-            (group_id, canonical_file, member_count, total_size,
-             similarity_type, detection_rule)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            group_id,
-            group_data['canonical_file'],
-            group_data['member_count'],
-            group_data['total_size'],
-            group_data['similarity_type'],
-            group_data['detection_rule']
-        ))
-
-        # Insert members
-        for member in group_data['members']:
-            cursor.execute("""
+        return self.create_duplicate_groups([group_data])[0]
+
+    def create_duplicate_groups(self, groups: Sequence[Dict]) -> List[str]:
+        """
+        Create many duplicate groups in one transaction.
+
+        Groups, members and the members' duplicate flags are each written with
+        a single executemany.
+
+        Args:
+            groups: Group dicts with canonical_file, member_count, total_size,
+                similarity_type, detection_rule and members
+                (file_id, priority_score, reason)
+
+        Returns:
+            Group IDs, in the order of ``groups``
+        """
+        # 64 random bits: 8 hex digits collide within a few hundred thousand groups
+        group_ids = [f"dup-{uuid.uuid4().hex[:16]}" for _ in groups]
+
+        with self.transaction():
+            self.conn.executemany("""
+                INSERT INTO duplicate_groups
+                (group_id, canonical_file, member_count, total_size,
+                 similarity_type, detection_rule)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (group_id, group['canonical_file'], group['member_count'], group['total_size'],
+                 group['similarity_type'], group['detection_rule'])
+                for group_id, group in zip(group_ids, groups)
+            ])
+
+            self.conn.executemany("""
                 INSERT INTO duplicate_members
                 (group_id, file_id, priority_score, reason)
                 VALUES (?, ?, ?, ?)
-            """, (group_id, member['file_id'], member['priority_score'], member['reason']))
+            """, [
+                (group_id, member['file_id'], member['priority_score'], member['reason'])
+                for group_id, group in zip(group_ids, groups)
+                for member in group['members']
+            ])
 
-        # Mark files as duplicates
-        for member in group_data['members']:
-            cursor.execute("""
+            self.conn.executemany("""
                 UPDATE files
                 SET is_duplicate = 1, duplicate_group = ?
                 WHERE file_id = ?
-            """, (group_id, member['file_id']))
+            """, [
+                (group_id, member['file_id'])
+                for group_id, group in zip(group_ids, groups)
+                for member in group['members']
+            ])
 
-        self.conn.commit()
-        return group_id
+        return group_ids
 
     def get_overview_stats(self, session_id: str) -> Dict:
         """Get overview statistics for a session."""
@@ -503,7 +805,7 @@ class Database:
             json.dumps(classification.get('probabilities', {})),
             classification.get('session_id')
         ))
-        self.conn.commit()
+        self._commit()
 
     def insert_ml_classifications_batch(self, classifications: List[Dict]):
         """Batch insert ML classifications."""
@@ -525,26 +827,28 @@ class Database:
             )
             for c in classifications
         ])
-        self.conn.commit()
+        self._commit()
 
     def get_ml_classifications(self, session_id: str, model_name: str = None) -> List[Dict]:
         """Get ML classifications for a session."""
-        cursor = self.conn.cursor()
+        return [row._asdict() for row in self.iter_ml_classifications(session_id, model_name)]
+
+    def iter_ml_classifications(self, session_id: str, model_name: str = None,
+                                chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple]:
+        """Stream ML classifications for a session as namedtuple rows."""
         if model_name:
-            cursor.execute("""
+            return self.iter_query("""
                 SELECT mc.*, f.path, f.name
                 FROM ml_classifications mc
                 JOIN files f ON mc.file_id = f.file_id
                 WHERE mc.session_id = ? AND mc.model_name = ?
-            """, (session_id, model_name))
-        else:
-            cursor.execute("""
-                SELECT mc.*, f.path, f.name
-                FROM ml_classifications mc
-                JOIN files f ON mc.file_id = f.file_id
-                WHERE mc.session_id = ?
-            """, (session_id,))
-        return [dict(row) for row in cursor.fetchall()]
+            """, (session_id, model_name), chunk_size)
+        return self.iter_query("""
+            SELECT mc.*, f.path, f.name
+            FROM ml_classifications mc
+            JOIN files f ON mc.file_id = f.file_id
+            WHERE mc.session_id = ?
+        """, (session_id,), chunk_size)
 
     def get_classification_stats(self, session_id: str) -> Dict:
         """Get ML classification statistics for a session."""
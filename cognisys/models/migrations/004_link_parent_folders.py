@@ -0,0 +1,110 @@
+"""
+Database Migration: Link Files and Folders to Parent Folders
+
+Scans now give folders path-derived IDs and store each file's folder in
+files.parent_id (and each folder's parent in folders.parent_id), which folder
+rollups and per-folder fuzzy matching group by; files.path stays the stored
+path every reader uses. This migration converts existing scan
+databases: folder IDs are re-derived from their paths, parent links are
+backfilled for files and folders whose parent folder is indexed, and folder
+size rollups are computed for every existing session.
+
+Schema Version: 4
+"""
+
+import sqlite3
+import logging
+import sys
+from pathlib import Path
+
+try:
+    from cognisys.models.schema import SCAN_MIGRATIONS, migrate_database
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from cognisys.models.schema import SCAN_MIGRATIONS, migrate_database
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 4
+DESCRIPTION = "Link files and folders to parent folders by path-derived folder ID"
+PREVIOUS_VERSION = 3
+
+BATCH_SIZE = 10000
+
+
+def migrate(db_path: str) -> bool:
+    """
+    Run the migration (and any earlier pending scan migrations).
+
+    The schema change and the batched files.parent_id backfill live in
+    cognisys.models.schema.SCAN_MIGRATIONS; opening the database with
+    Database() applies them as well.
+
+    Args:
+        db_path: Path to the scan database file
+
+    Returns:
+        True if successful
+    """
+    logger.info(f"Running migration {SCHEMA_VERSION}: {DESCRIPTION}")
+
+    try:
+        applied = migrate_database(db_path, SCAN_MIGRATIONS, target=SCHEMA_VERSION,
+                                   batch_size=BATCH_SIZE)
+    except sqlite3.Error as e:
+        logger.error(f"Migration {SCHEMA_VERSION} failed: {e}")
+        return False
+
+    if SCHEMA_VERSION in applied:
+        logger.info(f"Migration {SCHEMA_VERSION} completed successfully")
+    else:
+        logger.info(f"Migration {SCHEMA_VERSION} already applied")
+    return True
+
+
+def rollback(db_path: str) -> bool:
+    """
+    Rollback the migration.
+
+    Parent links are cleared; the original random folder IDs cannot be restored.
+    """
+    logger.warning(f"Rolling back migration {SCHEMA_VERSION}")
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("DROP INDEX IF EXISTS idx_parent")
+        cursor.execute("UPDATE files SET parent_id = NULL")
+        cursor.execute("UPDATE folders SET parent_id = NULL")
+        cursor.execute(f"PRAGMA user_version = {PREVIOUS_VERSION}")
+
+        conn.commit()
+        logger.info(f"Rollback of migration {SCHEMA_VERSION} completed")
+        return True
+
+    except Exception as e:
+        logger.error(f"Rollback failed: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) < 2:
+        print("Usage: python 004_link_parent_folders.py <db_path> [--rollback]")
+        sys.exit(1)
+
+    db_path = sys.argv[1]
+    rollback_mode = '--rollback' in sys.argv
+
+    if rollback_mode:
+        success = rollback(db_path)
+    else:
+        success = migrate(db_path)
+
+    sys.exit(0 if success else 1)
@@ -0,0 +1,118 @@
+"""
+Database Migration: Composite, Covering and Partial Indexes
+
+Replaces the single-column session index on files with composite indexes
+that lead with scan_session_id and cover the per-session report, duplicate
+and fuzzy-matching queries, adds a partial index for orphaned files and
+indexes the duplicate, folder, ML and migration-plan join columns.
+The indexes were chosen from EXPLAIN QUERY PLAN output of the query
+catalogue in cognisys.models.query_audit; re-run
+scripts/validation/audit_query_plans.py after changing a hot query.
+
+Schema Version: 5
+"""
+
+import sqlite3
+import logging
+import sys
+from pathlib import Path
+
+try:
+    from cognisys.models.schema import SCAN_MIGRATIONS, migrate_database
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from cognisys.models.schema import SCAN_MIGRATIONS, migrate_database
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 5
+DESCRIPTION = "Composite, covering and partial indexes for hot queries"
+PREVIOUS_VERSION = 4
+
+ADDED_INDEXES = [
+    'idx_files_session_size',
+    'idx_files_session_parent',
+    'idx_files_session_category',
+    'idx_files_session_extension',
+    'idx_files_orphaned',
+    'idx_dup_groups_canonical',
+    'idx_folders_parent',
+    'idx_ml_session_model',
+    'idx_migration_actions_plan',
+]
+
+
+def migrate(db_path: str) -> bool:
+    """
+    Run the migration (and any earlier pending scan migrations).
+
+    The index definitions live in cognisys.models.schema.SCAN_MIGRATIONS;
+    opening the database with Database() applies them as well.
+
+    Args:
+        db_path: Path to the scan database file
+
+    Returns:
+        True if successful
+    """
+    logger.info(f"Running migration {SCHEMA_VERSION}: {DESCRIPTION}")
+
+    try:
+        applied = migrate_database(db_path, SCAN_MIGRATIONS, target=SCHEMA_VERSION)
+    except sqlite3.Error as e:
+        logger.error(f"Migration {SCHEMA_VERSION} failed: {e}")
+        return False
+
+    if SCHEMA_VERSION in applied:
+        logger.info(f"Migration {SCHEMA_VERSION} completed successfully")
+    else:
+        logger.info(f"Migration {SCHEMA_VERSION} already applied")
+    return True
+
+
+def rollback(db_path: str) -> bool:
+    """
+    Rollback the migration.
+
+    Drops the added indexes and restores the single-column session index.
+    """
+    logger.warning(f"Rolling back migration {SCHEMA_VERSION}")
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        for index in ADDED_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {index}")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_session ON files(scan_session_id)")
+        cursor.execute(f"PRAGMA user_version = {PREVIOUS_VERSION}")
+
+        conn.commit()
+        logger.info(f"Rollback of migration {SCHEMA_VERSION} completed")
+        return True
+
+    except Exception as e:
+        logger.error(f"Rollback failed: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) < 2:
+        print("Usage: python 005_add_query_indexes.py <db_path> [--rollback]")
+        sys.exit(1)
+
+    db_path = sys.argv[1]
+    rollback_mode = '--rollback' in sys.argv
+
+    if rollback_mode:
+        success = rollback(db_path)
+    else:
+        success = migrate(db_path)
+
+    sys.exit(0 if success else 1)
@@ -0,0 +1,113 @@
+"""
+Database Migration: Session Compaction Deltas
+
+Adds base_session_id/compacted_at to scan_sessions and the session_deltas
+table used by 'cognisys sessions compact' (cognisys.core.session_compactor)
+to store old sessions as changes against a newer scan of the same roots.
+Replaces the path index with (path, scan_session_id) for the per-session
+path joins compaction runs, and indexes duplicate_members.file_id.
+
+Schema Version: 6
+"""
+
+import sqlite3
+import logging
+import sys
+from pathlib import Path
+
+try:
+    from cognisys.models.schema import SCAN_MIGRATIONS, migrate_database
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from cognisys.models.schema import SCAN_MIGRATIONS, migrate_database
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 6
+DESCRIPTION = "Session compaction deltas"
+PREVIOUS_VERSION = 5
+
+
+def migrate(db_path: str) -> bool:
+    """
+    Run the migration (and any earlier pending scan migrations).
+
+    The schema change lives in cognisys.models.schema.SCAN_MIGRATIONS;
+    opening the database with Database() applies them as well.
+
+    Args:
+        db_path: Path to the scan database file
+
+    Returns:
+        True if successful
+    """
+    logger.info(f"Running migration {SCHEMA_VERSION}: {DESCRIPTION}")
+
+    try:
+        applied = migrate_database(db_path, SCAN_MIGRATIONS, target=SCHEMA_VERSION)
+    except sqlite3.Error as e:
+        logger.error(f"Migration {SCHEMA_VERSION} failed: {e}")
+        return False
+
+    if SCHEMA_VERSION in applied:
+        logger.info(f"Migration {SCHEMA_VERSION} completed successfully")
+    else:
+        logger.info(f"Migration {SCHEMA_VERSION} already applied")
+    return True
+
+
+def rollback(db_path: str) -> bool:
+    """
+    Rollback the migration.
+
+    Refused while any session is compacted, since its files could no longer
+    be rebuilt. The added columns are left in place (SQLite cannot drop them
+    on older versions) and are ignored by the previous schema.
+    """
+    logger.warning(f"Rolling back migration {SCHEMA_VERSION}")
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT COUNT(*) FROM scan_sessions WHERE compacted_at IS NOT NULL")
+        compacted = cursor.fetchone()[0]
+        if compacted:
+            logger.error(f"Rollback refused: {compacted} sessions are compacted")
+            return False
+
+        cursor.execute("DROP TABLE IF EXISTS session_deltas")
+        cursor.execute("DROP INDEX IF EXISTS idx_files_path_session")
+        cursor.execute("DROP INDEX IF EXISTS idx_dup_members_file")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_path ON files(path)")
+        cursor.execute(f"PRAGMA user_version = {PREVIOUS_VERSION}")
+
+        conn.commit()
+        logger.info(f"Rollback of migration {SCHEMA_VERSION} completed")
+        return True
+
+    except Exception as e:
+        logger.error(f"Rollback failed: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) < 2:
+        print("Usage: python 006_session_compaction.py <db_path> [--rollback]")
+        sys.exit(1)
+
+    db_path = sys.argv[1]
+    rollback_mode = '--rollback' in sys.argv
+
+    if rollback_mode:
+        success = rollback(db_path)
+    else:
+        success = migrate(db_path)
+
+    sys.exit(0 if success else 1)
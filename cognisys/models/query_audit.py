@@ -0,0 +1,461 @@
+"""
+EXPLAIN QUERY PLAN audit of the hot queries.
+
+The catalogues below mirror the SQL issued by the analyzer, migration
+planner, reporter and web dashboard (directly or through Database). Each
+query is explained against a database and its plan is checked for full
+table scans and temporary B-trees; redundant indexes (a plain index whose
+columns are a prefix of another index on the same table) are reported too.
+
+Keep the catalogue in step with the code: when a hot query changes, update
+its entry here and re-run scripts/validation/audit_query_plans.py.
+"""
+
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+
+# "SCAN files", "SCAN TABLE files" (SQLite < 3.36), "SCAN f USING COVERING INDEX ..."
+_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+))?')
+_SEARCH_RE = re.compile(r'^SEARCH (?:TABLE )?(\w+)(?: AS \w+)? USING (?:COVERING )?INDEX (\w+)')
+# CTEs and subqueries the plan builds itself; scanning them is not a table scan
+_SUBQUERY_RE = re.compile(r'^(?:MATERIALIZE|CO-ROUTINE) (\w+)')
+
+SAMPLE_SESSION = 'sample-session'
+SAMPLE_PLAN = 'sample-plan'
+
+
+@dataclass
+class AuditQuery:
+    """A hot query to explain, with sample parameters."""
+    name: str
+    source: str
+    sql: str
+    params: Sequence = ()
+    allow_scan: bool = False  # full scan is inherent, e.g. an export or LIKE '%term%'
+
+
+@dataclass
+class PlanResult:
+    """Query plan of one audited query."""
+    query: AuditQuery
+    plan: List[str]
+    full_scans: List[str] = field(default_factory=list)
+    index_scans: List[str] = field(default_factory=list)
+    indexes: List[str] = field(default_factory=list)
+    temp_btrees: List[str] = field(default_factory=list)
+
+    @property
+    def flagged(self) -> bool:
+        """True if the plan scans a whole table and the query is not expected to."""
+        return bool(self.full_scans) and not self.query.allow_scan
+
+
+SCAN_QUERIES = [
+    # Analyzer
+    AuditQuery('exact_candidates', 'analyzer: Database.iter_exact_duplicate_candidates', """
+        WITH sizes AS (
+            SELECT size_bytes, extension
+            FROM files
+            WHERE scan_session_id = ? AND size_bytes >= ?
+            GROUP BY size_bytes, extension
+            HAVING COUNT(*) > 1
+        ),
+        members AS (
+            SELECT f.file_id, f.path, f.name, f.extension, f.size_bytes, f.modified_at,
+                   f.access_count, f.hash_quick, f.hash_quick_algo, f.hash_full,
+                   COALESCE(f.hash_quick_algo, 'sha256') AS algo,
+                   COUNT(*) OVER (PARTITION BY f.size_bytes, f.extension,
+                                  COALESCE(f.hash_quick_algo, 'sha256'), f.hash_quick) AS collisions
+            FROM sizes
+            JOIN files f ON f.scan_session_id = ? AND f.size_bytes = sizes.size_bytes
+                        AND f.extension IS sizes.extension
+            WHERE f.hash_quick IS NOT NULL
+        )
+        SELECT file_id, path, name, extension, size_bytes, modified_at,
+               access_count, hash_quick, hash_quick_algo, hash_full
+        FROM members
+        WHERE collisions > 1
+        ORDER BY size_bytes, extension, algo, hash_quick
+    """, (SAMPLE_SESSION, 1024, SAMPLE_SESSION)),
+    AuditQuery('duplicate_candidates', 'benchmarks: Database.get_duplicate_candidates', """
+        SELECT size_bytes, extension, COUNT(*) as cnt,
+               GROUP_CONCAT(file_id) as file_ids
+        FROM files
+        WHERE scan_session_id = ? AND size_bytes > 0
+        GROUP BY size_bytes, extension
+        HAVING cnt > 1
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('fuzzy_stream_by_folder', 'analyzer: Database.iter_files_by_session', """
+        SELECT file_id, parent_id, path, name, extension, size_bytes, modified_at,
+               access_count, is_duplicate
+        FROM files WHERE scan_session_id = ? ORDER BY parent_id
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('mark_orphaned', 'analyzer: Analyzer._identify_orphaned_files', """
+        UPDATE files
+        SET is_orphaned = 1
+        WHERE scan_session_id = ?
+          AND accessed_at < datetime('now', '-365 days')
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('mark_temp', 'analyzer: Analyzer._mark_temp_files', """
+        UPDATE files
+        SET is_temp = 1
+        WHERE scan_session_id = ?
+          AND (extension = ? OR name LIKE ?)
+    """, (SAMPLE_SESSION, '.tmp', '%.tmp')),
+
+    # Migration planner
+    AuditQuery('plan_duplicate_members', 'migrator: _generate_duplicate_actions', """
+        SELECT dg.group_id, f.path, f.name, f.size_bytes
+        FROM duplicate_groups dg
+        JOIN files c ON dg.canonical_file = c.file_id
+        JOIN duplicate_members dm ON dm.group_id = dg.group_id
+        JOIN files f ON dm.file_id = f.file_id
+        WHERE c.scan_session_id = ? AND dm.file_id != dg.canonical_file
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('plan_reorganization', 'migrator: _generate_reorganization_actions', """
+        SELECT path, name, extension, size_bytes, file_category, modified_at
+        FROM files
+        WHERE scan_session_id = ?
+          AND is_duplicate = 0
+          AND is_orphaned = 0
+          AND is_temp = 0
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('plan_archive', 'migrator: _generate_archive_actions', """
+        SELECT path, name, size_bytes, file_category
+        FROM files
+        WHERE scan_session_id = ?
+          AND is_orphaned = 1
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('plan_summary', 'migrator: MigrationPlanner.get_plan_summary', """
+        SELECT action_type, COUNT(*) as count, SUM(file_size) as total_size
+        FROM migration_actions
+        WHERE plan_id = ?
+        GROUP BY action_type
+    """, (SAMPLE_PLAN,)),
+    AuditQuery('plan_actions', 'migrator: MigrationPlanner.execute_plan', """
+        SELECT * FROM migration_actions
+        WHERE plan_id = ?
+        ORDER BY action_id
+    """, (SAMPLE_PLAN,)),
+
+    # Reporter
+    AuditQuery('overview', 'reporter: Database.get_overview_stats', """
+        SELECT
+            COUNT(*) as total_files,
+            SUM(size_bytes) as total_size,
+            COUNT(DISTINCT extension) as unique_extensions,
+            MIN(created_at) as oldest,
+            MAX(created_at) as newest
+        FROM files
+        WHERE scan_session_id = ?
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('folder_count', 'reporter: Database.get_overview_stats', """
+        SELECT COUNT(*) as total_folders
+        FROM folders
+        WHERE scan_session_id = ?
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('category_distribution', 'reporter: Database.get_file_type_distribution', """
+        SELECT
+            file_category,
+            COUNT(*) as count,
+            SUM(size_bytes) as total_size,
+            ROUND(100.0 * SUM(size_bytes) /
+                  (SELECT SUM(size_bytes) FROM files WHERE scan_session_id = ?), 2)
+                  as pct_of_total
+        FROM files
+        WHERE scan_session_id = ?
+        GROUP BY file_category
+        ORDER BY total_size DESC
+    """, (SAMPLE_SESSION, SAMPLE_SESSION)),
+    AuditQuery('subcategory_distribution', 'reporter: _get_subcategory_distribution', """
+        SELECT file_category, file_subcategory,
+               COUNT(*) as count,
+               SUM(size_bytes) as total_size
+        FROM files
+        WHERE scan_session_id = ?
+        GROUP BY file_category, file_subcategory
+        ORDER BY total_size DESC
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('extension_distribution', 'reporter: _get_extension_distribution', """
+        SELECT extension,
+               COUNT(*) as count,
+               SUM(size_bytes) as total_size,
+               AVG(size_bytes) as avg_size
+        FROM files
+        WHERE scan_session_id = ? AND extension IS NOT NULL AND extension != ''
+        GROUP BY extension
+        ORDER BY total_size DESC
+        LIMIT ?
+    """, (SAMPLE_SESSION, 20)),
+    AuditQuery('size_range', 'reporter: _get_size_distribution', """
+        SELECT COUNT(*), SUM(size_bytes)
+        FROM files
+        WHERE scan_session_id = ? AND size_bytes >= ? AND size_bytes < ?
+    """, (SAMPLE_SESSION, 10240, 102400)),
+    AuditQuery('creation_timeline', 'reporter: _get_timeline_data', """
+        SELECT strftime('%Y-%m', created_at) as month,
+               COUNT(*) as count,
+               SUM(size_bytes) as size
+        FROM files
+        WHERE scan_session_id = ? AND created_at IS NOT NULL
+        GROUP BY month
+        ORDER BY month DESC
+        LIMIT 12
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('largest_files', 'reporter: Database.get_largest_files', """
+        SELECT name, path, size_bytes, modified_at
+        FROM files
+        WHERE scan_session_id = ?
+        ORDER BY size_bytes DESC
+        LIMIT ?
+    """, (SAMPLE_SESSION, 20)),
+    AuditQuery('largest_folders', 'reporter: Database.get_largest_folders', """
+        SELECT path, file_count, total_size, direct_size, subfolder_count
+        FROM folders
+        WHERE scan_session_id = ?
+        ORDER BY total_size DESC
+        LIMIT ?
+    """, (SAMPLE_SESSION, 20)),
+    AuditQuery('duplication_metrics', 'reporter: Database.get_duplication_metrics', """
+        SELECT COUNT(DISTINCT dg.group_id) as duplicate_sets,
+               SUM(dg.member_count - 1) as total_duplicate_files,
+               SUM((dg.member_count - 1) * dg.total_size) as wasted_space
+        FROM duplicate_groups dg
+        JOIN files f ON dg.canonical_file = f.file_id
+        WHERE f.scan_session_id = ?
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('orphan_insight', 'reporter: _generate_insights', """
+        SELECT COUNT(*), SUM(size_bytes)
+        FROM files
+        WHERE scan_session_id = ? AND is_orphaned = 1
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('csv_export', 'reporter: _save_csv_exports', """
+        SELECT * FROM files WHERE scan_session_id = ?
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('ml_classifications', 'reporter: Database.iter_ml_classifications', """
+        SELECT mc.*, f.path, f.name
+        FROM ml_classifications mc
+        JOIN files f ON mc.file_id = f.file_id
+        WHERE mc.session_id = ? AND mc.model_name = ?
+    """, (SAMPLE_SESSION, 'distilbert_v2')),
+    AuditQuery('classification_stats', 'reporter: Database.get_classification_stats', """
+        SELECT
+            model_name,
+            COUNT(*) as total,
+            AVG(confidence) as avg_confidence,
+            COUNT(CASE WHEN confidence >= 0.7 THEN 1 END) as high_conf,
+            COUNT(CASE WHEN confidence < 0.5 THEN 1 END) as low_conf
+        FROM ml_classifications
+        WHERE session_id = ?
+        GROUP BY model_name
+    """, (SAMPLE_SESSION,)),
+
+    # Scanner support queries used by the stages above
+    AuditQuery('folder_rollup_files', 'scanner: Database.update_folder_rollups', """
+        SELECT parent_id, COUNT(*) AS file_count, COALESCE(SUM(size_bytes), 0) AS size
+        FROM files
+        WHERE scan_session_id = ?
+        GROUP BY parent_id
+    """, (SAMPLE_SESSION,)),
+    AuditQuery('subfolders', 'scanner: Database.get_subfolders', """
+        SELECT * FROM folders WHERE parent_id = ?
+    """, ('0' * 16,)),
+    AuditQuery('latest_session', 'scanner: Database.get_latest_session', """
+        SELECT * FROM scan_sessions
+        WHERE status = ? AND session_id != ?
+        ORDER BY started_at DESC
+        LIMIT 1
+    """, ('completed', SAMPLE_SESSION), allow_scan=True),  # one row per scan
+
+    # Session compaction
+    AuditQuery('compact_absent_paths', 'compactor: SessionCompactor.compact_session', """
+        SELECT b.path
+        FROM files b
+        WHERE b.scan_session_id = ?
+          AND NOT EXISTS (
+              SELECT 1 FROM files s
+              WHERE s.path = b.path AND s.scan_session_id = ?
+          )
+    """, ('base-session', SAMPLE_SESSION)),
+    AuditQuery('compact_unchanged', 'compactor: SessionCompactor.compact_session', """
+        SELECT s.rowid
+        FROM files s
+        JOIN files b ON b.path = s.path AND b.scan_session_id = ?
+        WHERE s.scan_session_id = ?
+          AND s.size_bytes IS b.size_bytes
+          AND s.modified_at IS b.modified_at
+          AND s.hash_quick IS b.hash_quick
+          AND NOT EXISTS (SELECT 1 FROM duplicate_members dm
+                          WHERE dm.file_id = s.file_id)
+          AND NOT EXISTS (SELECT 1 FROM ml_classifications mc
+                          WHERE mc.file_id = s.file_id)
+        LIMIT ?
+    """, ('base-session', SAMPLE_SESSION, 10000)),
+]
+
+
+REGISTRY_QUERIES = [
+    AuditQuery('total', 'dashboard: /api/stats', """
+        SELECT COUNT(*) as total FROM file_registry
+    """),
+    AuditQuery('by_state', 'dashboard: /api/stats', """
+        SELECT canonical_state, COUNT(*) as count
+        FROM file_registry
+        GROUP BY canonical_state
+    """),
+    AuditQuery('by_type', 'dashboard: /api/stats', """
+        SELECT document_type, COUNT(*) as count
+        FROM file_registry
+        WHERE document_type IS NOT NULL
+        GROUP BY document_type
+        ORDER BY count DESC
+        LIMIT 15
+    """),
+    AuditQuery('by_method', 'dashboard: /api/stats', """
+        SELECT classification_method, COUNT(*) as count
+        FROM file_registry
+        WHERE classification_method IS NOT NULL
+        GROUP BY classification_method
+    """),
+    AuditQuery('duplicate_count', 'dashboard: /api/stats', """
+        SELECT COUNT(*) as count FROM file_registry WHERE is_duplicate = 1
+    """),
+    AuditQuery('low_confidence_count', 'dashboard: /api/stats', """
+        SELECT COUNT(*) as count FROM file_registry
+        WHERE confidence < 0.70 AND confidence > 0
+    """),
+    AuditQuery('files_page', 'dashboard: /api/files', """
+        SELECT * FROM file_registry WHERE 1=1 ORDER BY file_id DESC LIMIT ? OFFSET ?
+    """, (50, 0), allow_scan=True),  # walks the rowid B-tree and stops at LIMIT
+    AuditQuery('files_page_by_type', 'dashboard: /api/files?type=', """
+        SELECT * FROM file_registry WHERE 1=1 AND document_type = ?
+        ORDER BY file_id DESC LIMIT ? OFFSET ?
+    """, ('financial_invoice', 50, 0)),
+    AuditQuery('files_page_by_type_state', 'dashboard: /api/files?type=&state=', """
+        SELECT * FROM file_registry WHERE 1=1 AND document_type = ? AND canonical_state = ?
+        ORDER BY file_id DESC LIMIT ? OFFSET ?
+    """, ('financial_invoice', 'organized', 50, 0)),
+    AuditQuery('files_page_by_state', 'dashboard: /api/files?state=', """
+        SELECT * FROM file_registry WHERE 1=1 AND canonical_state = ?
+        ORDER BY file_id DESC LIMIT ? OFFSET ?
+    """, ('organized', 50, 0)),
+    AuditQuery('files_count_by_type_state', 'dashboard: /api/files?type=&state=', """
+        SELECT COUNT(*) as total FROM file_registry WHERE 1=1
+        AND document_type = ? AND canonical_state = ?
+    """, ('financial_invoice', 'organized')),
+    AuditQuery('file', 'dashboard: /api/file/<id>', """
+        SELECT * FROM file_registry WHERE file_id = ?
+    """, (1,)),
+    AuditQuery('search', 'dashboard: /api/search', """
+        SELECT * FROM file_registry
+        WHERE original_path LIKE ?
+        ORDER BY file_id DESC
+        LIMIT ?
+    """, ('%invoice%', 50), allow_scan=True),  # substring match cannot use an index
+    AuditQuery('low_confidence', 'dashboard: /api/low_confidence', """
+        SELECT * FROM file_registry
+        WHERE confidence < 0.70 AND confidence > 0
+        ORDER BY confidence ASC
+        LIMIT ?
+    """, (100,)),
+    AuditQuery('export', 'dashboard: /api/export', """
+        SELECT * FROM file_registry
+    """, allow_scan=True),
+]
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Sequence = ()) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines of a query."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params)).fetchall()
+    return [row[3] for row in rows]
+
+
+def analyze_plan(query: AuditQuery, plan: List[str]) -> PlanResult:
+    """Classify the steps of a query plan."""
+    result = PlanResult(query=query, plan=plan)
+    subqueries = {'SUBQUERY', 'CONSTANT'}
+    for detail in plan:
+        match = _SUBQUERY_RE.match(detail)
+        if match:
+            subqueries.add(match.group(1))
+            continue
+
+        if detail.startswith('USE TEMP B-TREE'):
+            result.temp_btrees.append(detail[len('USE TEMP B-TREE FOR '):])
+            continue
+
+        match = _SCAN_RE.match(detail)
+        if match and match.group(1) not in subqueries:
+            if match.group(2):
+                result.index_scans.append(match.group(1))
+                result.indexes.append(match.group(2))
+            else:
+                result.full_scans.append(match.group(1))
+            continue
+
+        match = _SEARCH_RE.match(detail)
+        if match:
+            result.indexes.append(match.group(2))
+    return result
+
+
+def audit_queries(conn: sqlite3.Connection, queries: List[AuditQuery]) -> List[PlanResult]:
+    """Explain every query in a catalogue against a connection."""
+    return [analyze_plan(query, explain(conn, query.sql, query.params)) for query in queries]
+
+
+def redundant_indexes(conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+    """
+    Find plain indexes made redundant by a wider index on the same table.
+
+    Returns:
+        (redundant index, covering index) pairs
+    """
+    indexes = {}
+    for name, table, sql in conn.execute("""
+        SELECT name, tbl_name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL
+    """):
+        columns = tuple(row[2] for row in conn.execute(f"PRAGMA index_info({name})"))
+        partial = ' WHERE ' in sql.upper()
+        unique = sql.upper().startswith('CREATE UNIQUE')
+        indexes[name] = (table, columns, partial, unique)
+
+    redundant = []
+    for name, (table, columns, partial, unique) in sorted(indexes.items()):
+        if partial or unique:
+            continue
+        for other, (other_table, other_columns, other_partial, _) in sorted(indexes.items()):
+            if (other != name and other_table == table and not other_partial
+                    and len(other_columns) > len(columns)
+                    and other_columns[:len(columns)] == columns):
+                redundant.append((name, other))
+                break
+    return redundant
+
+
+def format_report(title: str, results: List[PlanResult],
+                  redundant: Optional[List[Tuple[str, str]]] = None) -> str:
+    """Render audit results as a plain-text report."""
+    lines = [title, '=' * len(title)]
+    for result in results:
+        if result.flagged:
+            status = 'FULL SCAN'
+        elif result.full_scans:
+            status = 'scan (expected)'
+        else:
+            status = 'ok'
+        lines.append(f"[{status}] {result.query.name}  ({result.query.source})")
+        for detail in result.plan:
+            lines.append(f"      {detail}")
+
+    flagged = [r for r in results if r.flagged]
+    lines.append('')
+    lines.append(f"{len(results)} queries, {len(flagged)} with unexpected full table scans, "
+                 f"{sum(1 for r in results if r.temp_btrees)} using temp B-trees")
+    for name, covering in redundant or []:
+        lines.append(f"Redundant index: {name} (prefix of {covering})")
+    return '\n'.join(lines)
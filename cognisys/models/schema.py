@@ -0,0 +1,769 @@
+"""
+Versioned schema migrations for CogniSys databases.
+
+Each database records the last migration applied in ``PRAGMA user_version``.
+Opening an up-to-date database costs a single PRAGMA read; otherwise only the
+pending migrations run, in version order. A migration has a transactional DDL
+step (tables, columns, indexes) followed by optional batched backfills, each
+batch committed on its own so other connections are never blocked for long.
+The version is bumped only after every backfill finishes, so an interrupted
+migration is simply re-run: DDL steps are idempotent and backfills only touch
+rows that still need it.
+
+Two databases are versioned independently:
+    SCAN_MIGRATIONS      scan/analysis database (Database)
+    REGISTRY_MIGRATIONS  file registry (.cognisys/file_registry.db)
+"""
+
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKFILL_BATCH_SIZE = 10000
+
+
+@dataclass
+class Backfill:
+    """
+    Batched data update run after a migration's DDL step.
+
+    ``sql`` must take the batch size as its only parameter and only match rows
+    that still need updating, e.g.
+    ``UPDATE t SET c = f(x) WHERE rowid IN (SELECT rowid FROM t WHERE c IS NULL LIMIT ?)``.
+    """
+    description: str
+    sql: str
+
+
+@dataclass
+class Migration:
+    """
+    A single schema version: an idempotent DDL step plus optional backfills.
+
+    ``finalize`` runs after the backfills (before the version is bumped) for
+    data updates that are not row-batched SQL; it must commit its own work
+    and skip anything already done, so an interrupted run can resume.
+    """
+    version: int
+    description: str
+    upgrade: Callable[[sqlite3.Connection], None]
+    backfills: List[Backfill] = field(default_factory=list)
+    finalize: Optional[Callable[[sqlite3.Connection], None]] = None
+
+
+def column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    """Check if a column exists in a table."""
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_info({table})"))
+
+
+def add_column(conn: sqlite3.Connection, table: str, column_def: str):
+    """Add a column unless the table already has it."""
+    if not column_exists(conn, table, column_def.split()[0]):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column_def}")
+
+
+class SchemaMigrator:
+    """Applies pending migrations to a connection and tracks user_version."""
+
+    def __init__(self, conn: sqlite3.Connection, migrations: List[Migration],
+                 batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE):
+        """
+        Args:
+            conn: Open connection to migrate
+            migrations: Migrations for this database, in any order
+            batch_size: Rows updated per backfill batch
+        """
+        self.conn = conn
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.batch_size = batch_size
+
+    @property
+    def latest_version(self) -> int:
+        """Version the schema is at once every migration has run."""
+        return self.migrations[-1].version if self.migrations else 0
+
+    def current_version(self) -> int:
+        """Read the schema version stored in the database."""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def pending(self) -> List[Migration]:
+        """Migrations not yet applied to this database."""
+        version = self.current_version()
+        return [m for m in self.migrations if m.version > version]
+
+    def migrate(self, target: Optional[int] = None) -> List[int]:
+        """
+        Apply pending migrations up to ``target`` (default: all).
+
+        Returns:
+            Versions that were applied
+        """
+        target = self.latest_version if target is None else target
+        version = self.current_version()
+        if version >= target:
+            if version > self.latest_version:
+                logger.warning(f"Database schema version {version} is newer than "
+                               f"this release ({self.latest_version})")
+            return []
+
+        applied = []
+        for migration in self.migrations:
+            if version < migration.version <= target:
+                if self._apply(migration):
+                    applied.append(migration.version)
+        return applied
+
+    def _apply(self, migration: Migration) -> bool:
+        """Run one migration; returns False if another connection already applied it."""
+        conn = self.conn
+        if conn.in_transaction:
+            conn.commit()
+
+        # IMMEDIATE takes the write lock up front so concurrent openers serialise
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.current_version() >= migration.version:
+                conn.rollback()
+                return False
+            logger.info(f"Applying schema migration {migration.version}: {migration.description}")
+            migration.upgrade(conn)
+            deferred = bool(migration.backfills or migration.finalize)
+            if not deferred:
+                conn.execute(f"PRAGMA user_version = {migration.version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        if deferred:
+            for backfill in migration.backfills:
+                self.run_backfill(backfill)
+            if migration.finalize:
+                migration.finalize(conn)
+            conn.execute(f"PRAGMA user_version = {migration.version}")
+            conn.commit()
+        return True
+
+    def run_backfill(self, backfill: Backfill) -> int:
+        """
+        Run a backfill to completion, committing after each batch.
+
+        Returns:
+            Number of rows updated
+        """
+        total = 0
+        while True:
+            cursor = self.conn.execute(backfill.sql, (self.batch_size,))
+            self.conn.commit()
+            if cursor.rowcount <= 0:
+                break
+            total += cursor.rowcount
+            logger.info(f"  {backfill.description}: {total:,} rows")
+        return total
+
+
+def migrate_database(db_path, migrations: List[Migration], target: Optional[int] = None,
+                     batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE) -> List[int]:
+    """
+    Open a database file, apply its pending migrations and close it.
+
+    Args:
+        db_path: Path to the database file
+        migrations: SCAN_MIGRATIONS or REGISTRY_MIGRATIONS
+        target: Stop after this version (default: apply all)
+        batch_size: Rows updated per backfill batch
+
+    Returns:
+        Versions that were applied
+    """
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        register_functions(conn)
+        return SchemaMigrator(conn, migrations, batch_size).migrate(target)
+    finally:
+        conn.close()
+
+
+def register_functions(conn: sqlite3.Connection):
+    """Register the SQL functions used by migrations and backfills."""
+    from .database import folder_id_for
+
+    conn.create_function('folder_id_for', 1, folder_id_for, deterministic=True)
+    conn.create_function('dirname', 1, os.path.dirname, deterministic=True)
+
+
+# ---------------------------------------------------------------------------
+# Scan database
+# ---------------------------------------------------------------------------
+
+def _scan_v1_initial(conn: sqlite3.Connection):
+    """Files, folders, sessions, duplicates, migration plans, ML and staging tables."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS files (
+            file_id TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            parent_id TEXT,
+            name TEXT NOT NULL,
+            extension TEXT,
+            size_bytes INTEGER,
+            created_at DATETIME,
+            modified_at DATETIME,
+            accessed_at DATETIME,
+            mime_type TEXT,
+            file_category TEXT,
+            file_subcategory TEXT,
+            hash_quick TEXT,
+            hash_full TEXT,
+            access_count INTEGER DEFAULT 0,
+            last_opened DATETIME,
+            owner TEXT,
+            permissions TEXT,
+            attributes TEXT,
+            is_duplicate BOOLEAN DEFAULT 0,
+            duplicate_group TEXT,
+            is_orphaned BOOLEAN DEFAULT 0,
+            is_temp BOOLEAN DEFAULT 0,
+            scan_session_id TEXT NOT NULL,
+            indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    add_column(conn, 'files', 'classified_category TEXT')
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_path ON files(path)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_hash_quick ON files(hash_quick)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_hash_full ON files(hash_full)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_size ON files(size_bytes)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_modified ON files(modified_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_category ON files(file_category)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_session ON files(scan_session_id)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS folders (
+            folder_id TEXT PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            parent_id TEXT,
+            name TEXT NOT NULL,
+            depth INTEGER,
+            total_size INTEGER,
+            file_count INTEGER,
+            subfolder_count INTEGER,
+            folder_type TEXT,
+            created_at DATETIME,
+            modified_at DATETIME,
+            scan_session_id TEXT NOT NULL
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS duplicate_groups (
+            group_id TEXT PRIMARY KEY,
+            canonical_file TEXT,
+            member_count INTEGER,
+            total_size INTEGER,
+            similarity_type TEXT,
+            detection_rule TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS duplicate_members (
+            group_id TEXT,
+            file_id TEXT,
+            priority_score REAL,
+            reason TEXT,
+            PRIMARY KEY (group_id, file_id)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scan_sessions (
+            session_id TEXT PRIMARY KEY,
+            started_at DATETIME,
+            completed_at DATETIME,
+            root_paths TEXT,
+            files_scanned INTEGER DEFAULT 0,
+            status TEXT,
+            config_snapshot TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS migration_plans (
+            plan_id TEXT PRIMARY KEY,
+            created_at DATETIME,
+            session_id TEXT,
+            approved BOOLEAN DEFAULT 0,
+            executed_at DATETIME,
+            status TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS migration_actions (
+            action_id TEXT PRIMARY KEY,
+            plan_id TEXT,
+            source_path TEXT,
+            target_path TEXT,
+            action_type TEXT,
+            rule_id TEXT,
+            reason TEXT,
+            file_size INTEGER,
+            executed BOOLEAN DEFAULT 0,
+            execution_time DATETIME,
+            rollback_data TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ml_classifications (
+            classification_id TEXT PRIMARY KEY,
+            file_id TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            predicted_category TEXT,
+            confidence REAL,
+            probabilities TEXT,
+            classified_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            session_id TEXT,
+            FOREIGN KEY (file_id) REFERENCES files(file_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ml_file ON ml_classifications(file_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ml_model ON ml_classifications(model_name)")
+
+    # Staging tables for preview/commit workflow
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS staging_plans (
+            plan_id TEXT PRIMARY KEY,
+            created_at DATETIME,
+            session_id TEXT,
+            staging_root TEXT,
+            target_root TEXT,
+            status TEXT,
+            method TEXT,
+            committed_at DATETIME
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS staging_actions (
+            action_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan_id TEXT,
+            source_path TEXT,
+            staging_path TEXT,
+            target_path TEXT,
+            action_type TEXT,
+            status TEXT,
+            conflict_type TEXT,
+            validation_errors TEXT,
+            resolution_strategy TEXT,
+            FOREIGN KEY (plan_id) REFERENCES staging_plans(plan_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_staging_plan ON staging_actions(plan_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_staging_status ON staging_actions(status)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS conflict_resolutions (
+            resolution_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            action_id INTEGER,
+            conflict_type TEXT,
+            strategy TEXT,
+            resolved_path TEXT,
+            resolved_at DATETIME,
+            FOREIGN KEY (action_id) REFERENCES staging_actions(action_id)
+        )
+    """)
+
+    # Snapshots for rollback
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS snapshots (
+            snapshot_id TEXT PRIMARY KEY,
+            created_at DATETIME,
+            snapshot_type TEXT,
+            plan_id TEXT,
+            root_path TEXT,
+            file_count INTEGER,
+            total_size INTEGER,
+            manifest_path TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rollback_log (
+            log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan_id TEXT,
+            action_id INTEGER,
+            before_state TEXT,
+            after_state TEXT,
+            rolled_back INTEGER DEFAULT 0,
+            rollback_timestamp DATETIME
+        )
+    """)
+
+
+def _scan_v2_incremental(conn: sqlite3.Connection):
+    """Inode for incremental rescans and the quick hash algorithm label."""
+    add_column(conn, 'files', 'inode INTEGER')
+    add_column(conn, 'files', 'hash_quick_algo TEXT')  # NULL means legacy SHA-256
+
+
+def _scan_v3_checkpoints(conn: sqlite3.Connection):
+    """Walk frontier of in-progress scans, used to resume interrupted sessions."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scan_checkpoints (
+            session_id TEXT NOT NULL,
+            path TEXT NOT NULL,
+            status TEXT NOT NULL,
+            PRIMARY KEY (session_id, path)
+        )
+    """)
+
+
+def _scan_v4_parent_links(conn: sqlite3.Connection):
+    """Path-derived folder IDs, parent links and folder size rollups."""
+    register_functions(conn)
+
+    # Re-derive folder IDs from paths and link folders to their indexed parent
+    conn.execute("""
+        UPDATE folders SET folder_id = folder_id_for(path)
+        WHERE folder_id != folder_id_for(path)
+    """)
+    conn.execute("""
+        UPDATE folders SET parent_id = (
+            SELECT p.folder_id FROM folders p WHERE p.path = dirname(folders.path)
+        )
+        WHERE parent_id IS NULL
+    """)
+
+    # direct_* are non-recursive; total_size/file_count are recursive
+    add_column(conn, 'folders', 'direct_size INTEGER')
+    add_column(conn, 'folders', 'direct_file_count INTEGER')
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_parent ON files(parent_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_folder_session_size ON folders(scan_session_id, total_size)")
+
+
+def _scan_v4_folder_rollups(conn: sqlite3.Connection):
+    """Compute folder size rollups for sessions scanned before they were stored."""
+    from .database import compute_folder_rollups
+
+    sessions = [row[0] for row in conn.execute(
+        "SELECT DISTINCT scan_session_id FROM folders WHERE direct_size IS NULL"
+    )]
+    for session_id in sessions:
+        folders = compute_folder_rollups(conn, session_id)
+        conn.commit()
+        logger.info(f"  Folder rollups for session {session_id}: {folders:,} folders")
+
+
+def _scan_v5_query_indexes(conn: sqlite3.Connection):
+    """
+    Composite, covering and partial indexes for the per-session queries
+    (see cognisys.models.query_audit for the query catalogue they were
+    designed from).
+    """
+    # Duplicate candidates (GROUP BY size_bytes, extension), largest files and
+    # size-range counts; covering for the candidate GROUP_CONCAT(file_id)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_files_session_size
+        ON files(scan_session_id, size_bytes, extension, file_id)
+    """)
+    # Fuzzy matching streams files ORDER BY parent_id; covers folder rollups
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_files_session_parent
+        ON files(scan_session_id, parent_id, size_bytes)
+    """)
+    # Report distributions, answered from the index alone
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_files_session_category
+        ON files(scan_session_id, file_category, file_subcategory, size_bytes)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_files_session_extension
+        ON files(scan_session_id, extension, size_bytes)
+    """)
+    # Orphaned files are a small minority: archive planning and the report insight
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_files_orphaned
+        ON files(scan_session_id, size_bytes) WHERE is_orphaned = 1
+    """)
+    # Every composite above starts with scan_session_id
+    conn.execute("DROP INDEX IF EXISTS idx_session")
+
+    # Duplicate metrics and plan generation join groups to their canonical file
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_dup_groups_canonical
+        ON duplicate_groups(canonical_file)
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_folders_parent ON folders(parent_id)")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ml_session_model
+        ON ml_classifications(session_id, model_name, confidence)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_migration_actions_plan
+        ON migration_actions(plan_id, action_type, file_size)
+    """)
+
+
+def _scan_v6_session_compaction(conn: sqlite3.Connection):
+    """Delta storage for compacted scan sessions (see core.session_compactor)."""
+    # A compacted session stores only files that differ from its base session
+    add_column(conn, 'scan_sessions', 'base_session_id TEXT')
+    add_column(conn, 'scan_sessions', 'compacted_at DATETIME')
+
+    # Paths in the base session that the compacted session did not have
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS session_deltas (
+            session_id TEXT NOT NULL,
+            path TEXT NOT NULL,
+            PRIMARY KEY (session_id, path)
+        ) WITHOUT ROWID
+    """)
+
+    # Path lookups within a session (compaction joins sessions on path)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_files_path_session ON files(path, scan_session_id)")
+    conn.execute("DROP INDEX IF EXISTS idx_path")
+    # Compaction keeps files that duplicate groups still reference
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_dup_members_file ON duplicate_members(file_id)")
+
+
+SCAN_MIGRATIONS = [
+    Migration(1, "Initial scan schema", _scan_v1_initial),
+    Migration(2, "Inode and quick hash algorithm columns", _scan_v2_incremental),
+    Migration(3, "Scan checkpoints for resumable scans", _scan_v3_checkpoints),
+    Migration(4, "Link files and folders to parent folders", _scan_v4_parent_links, [
+        Backfill("Linking files to folders", """
+            UPDATE files SET parent_id = folder_id_for(dirname(path))
+            WHERE rowid IN (SELECT rowid FROM files WHERE parent_id IS NULL LIMIT ?)
+        """),
+    ], finalize=_scan_v4_folder_rollups),
+    Migration(5, "Composite, covering and partial indexes for hot queries", _scan_v5_query_indexes),
+    Migration(6, "Session compaction deltas", _scan_v6_session_compaction),
+]
+
+
+# ---------------------------------------------------------------------------
+# File registry database
+# ---------------------------------------------------------------------------
+
+def _record_schema_info(conn: sqlite3.Connection, version: int, description: str):
+    """Keep the legacy schema_info table in step with user_version."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_info (
+            schema_version INTEGER PRIMARY KEY,
+            applied_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            description TEXT
+        )
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO schema_info (schema_version, description)
+        VALUES (?, ?)
+    """, (version, description))
+
+
+def _registry_v1_initial(conn: sqlite3.Connection):
+    """File provenance, move history, rules, corrections and metrics."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS file_registry (
+            file_id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+            -- Provenance
+            original_path TEXT NOT NULL,
+            drop_timestamp TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            file_size INTEGER,
+
+            -- Current canonical location
+            canonical_path TEXT,
+            canonical_state TEXT DEFAULT 'pending',  -- 'pending', 'classified', 'organized', 'review'
+
+            -- Classification
+            document_type TEXT,
+            confidence REAL,
+            classification_method TEXT,  -- 'ml_model', 'keyword', 'manual', 'pattern'
+
+            -- Metadata (JSON blob)
+            extracted_metadata TEXT,  -- JSON: {invoice_numbers, vins, dates, etc.}
+
+            -- Move history tracking
+            move_count INTEGER DEFAULT 0,
+            last_moved TEXT,
+
+            -- Flags
+            requires_review INTEGER DEFAULT 0,  -- Boolean: needs manual review
+            is_duplicate INTEGER DEFAULT 0,     -- Boolean: duplicate of another file
+            duplicate_of INTEGER,               -- Foreign key to original file_id
+            is_missing INTEGER DEFAULT 0,       -- Boolean: file not found on disk
+
+            -- Timestamps
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (duplicate_of) REFERENCES file_registry(file_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_hash ON file_registry(content_hash)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_canonical_path ON file_registry(canonical_path)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_document_type ON file_registry(document_type)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_canonical_state ON file_registry(canonical_state)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS move_history (
+            move_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_id INTEGER NOT NULL,
+            from_path TEXT NOT NULL,
+            to_path TEXT NOT NULL,
+            move_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+            reason TEXT,           -- 'initial_classification', 'reclassification', 'manual_override', 'rule_update'
+            rule_applied TEXT,     -- Which rule triggered this move
+
+            FOREIGN KEY (file_id) REFERENCES file_registry(file_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_move_file_id ON move_history(file_id)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS classification_rules (
+            rule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            rule_name TEXT NOT NULL,
+            rule_version INTEGER NOT NULL,
+            rule_type TEXT NOT NULL,       -- 'pattern', 'keyword', 'ml_model'
+            rule_pattern TEXT,             -- Regex or keyword pattern
+            target_document_type TEXT,
+            target_path_template TEXT,     -- e.g., "Financial/{YYYY}/{MM}/{invoice_id}_{original}"
+            priority INTEGER DEFAULT 100,
+            active INTEGER DEFAULT 1,      -- Boolean: rule is active
+            created_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+
+            UNIQUE(rule_name, rule_version)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS manual_corrections (
+            correction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_id INTEGER NOT NULL,
+            wrong_type TEXT,               -- What CogniSys classified it as
+            correct_type TEXT,             -- What user corrected it to
+            correction_reason TEXT,        -- Why user made this correction
+            correction_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+            corrected_by TEXT,             -- Username (optional)
+
+            FOREIGN KEY (file_id) REFERENCES file_registry(file_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_correction_file_id ON manual_corrections(file_id)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS metrics_snapshots (
+            snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            snapshot_date TEXT NOT NULL,
+            metric_type TEXT NOT NULL,     -- 'accuracy', 'stability', 'duplication', etc.
+            metric_value REAL,
+            metric_data TEXT,              -- JSON blob with detailed data
+            created_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+
+            UNIQUE(snapshot_date, metric_type)
+        )
+    """)
+
+    _record_schema_info(conn, 1, 'Initial schema - file provenance and accuracy tracking')
+
+
+def _registry_v3_sources(conn: sqlite3.Connection):
+    """Multiple file sources (local, network, cloud) and per-source scan history."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sources (
+            source_id TEXT PRIMARY KEY,
+            source_name TEXT NOT NULL UNIQUE,
+            source_type TEXT NOT NULL,
+            provider TEXT,
+            path TEXT NOT NULL,
+            scan_mode TEXT DEFAULT 'manual',
+            schedule TEXT,
+            priority INTEGER DEFAULT 50,
+            is_active INTEGER DEFAULT 1,
+            last_scan_at TEXT,
+            last_scan_files INTEGER,
+            last_scan_errors INTEGER,
+            config_json TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sources_name ON sources(source_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sources_type ON sources(source_type)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cloud_providers (
+            provider_id TEXT PRIMARY KEY,
+            provider_type TEXT NOT NULL,
+            account_name TEXT,
+            account_email TEXT,
+            last_auth_at TEXT,
+            token_expires_at TEXT,
+            is_active INTEGER DEFAULT 1,
+            config_json TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scan_history (
+            scan_id TEXT PRIMARY KEY,
+            source_id TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            completed_at TEXT,
+            files_scanned INTEGER DEFAULT 0,
+            files_new INTEGER DEFAULT 0,
+            files_updated INTEGER DEFAULT 0,
+            files_deleted INTEGER DEFAULT 0,
+            errors INTEGER DEFAULT 0,
+            status TEXT,
+            error_message TEXT,
+            FOREIGN KEY (source_id) REFERENCES sources(source_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_history_source ON scan_history(source_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_history_started ON scan_history(started_at)")
+
+    for column_def in ('source_id TEXT', 'source_path TEXT', 'cloud_id TEXT',
+                       'etag TEXT', 'sync_status TEXT', 'last_seen_at TEXT'):
+        add_column(conn, 'file_registry', column_def)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_file_registry_source ON file_registry(source_id)")
+
+    _record_schema_info(conn, 3, 'Add sources table and source_id to file_registry')
+
+
+def _registry_v4_dashboard_indexes(conn: sqlite3.Connection):
+    """Partial indexes for the dashboard's review queues and a classification method index."""
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_registry_method
+        ON file_registry(classification_method)
+    """)
+    # Review queue; the WHERE clause must match the dashboard query's terms
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_registry_low_confidence
+        ON file_registry(confidence) WHERE confidence < 0.70 AND confidence > 0
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_registry_duplicates
+        ON file_registry(file_id) WHERE is_duplicate = 1
+    """)
+
+    _record_schema_info(conn, 4, 'Partial and method indexes for dashboard queries')
+
+
+# Versions follow the schema_info numbering used by models/migrations/003_add_sources.py
+REGISTRY_MIGRATIONS = [
+    Migration(1, "Initial file registry schema", _registry_v1_initial),
+    Migration(3, "Add sources table and source_id to file_registry", _registry_v3_sources),
+    Migration(4, "Partial and method indexes for dashboard queries", _registry_v4_dashboard_indexes),
+]
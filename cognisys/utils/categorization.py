@@ -128,6 +128,24 @@ class FileCategorizer:
 
         return None
 
+    def get_quick_hash_sample(self, category: str, subcategory: str) -> Optional[Tuple[int, int]]:
+        """
+        Get sampled quick hash parameters for a category.
+
+        Args:
+            category: Category name
+            subcategory: Subcategory name
+
+        Returns:
+            Tuple of (window_size, windows) if files in this category are
+            quick-hashed from sampled windows, otherwise None
+        """
+        sampled = self.config.get('sampled_quick_hash') or {}
+        if (category in sampled.get('categories', [])
+                or subcategory in sampled.get('subcategories', [])):
+            return (sampled.get('window_size', 1_048_576), sampled.get('windows', 5))
+        return None
+
     def get_category_description(self, category: str) -> str:
         """Get description for a category."""
         categories = self.config.get('categories', {})
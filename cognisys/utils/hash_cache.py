@@ -0,0 +1,238 @@
+"""
+Persistent content-hash cache shared by the scanner, analyzer and registry commands.
+Entries are keyed by (device, inode, algorithm) and only trusted while the file's
+size and mtime_ns still match, so an unchanged file is never hashed twice.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .hashing import FULL_HASH_ALGORITHM, hash_file
+
+
+DEFAULT_CACHE_NAME = 'hash_cache.db'
+DEFAULT_CACHE_PATH = Path('db') / DEFAULT_CACHE_NAME  # Beside the CLI's default db/cognisys.db
+DEFAULT_MAX_ENTRIES = 2_000_000
+EVICTION_HEADROOM = 0.9  # Evict down to this fraction of max_entries
+
+# (device, inode, size_bytes, mtime_ns)
+CacheKey = Tuple[int, int, int, int]
+
+
+def cache_key(stat: os.stat_result) -> Optional[CacheKey]:
+    """
+    Build a cache key from a stat result.
+
+    Returns None when the filesystem does not report a stable inode
+    (e.g. some network shares and FAT volumes), in which case the file
+    must not be cached.
+    """
+    if not stat.st_ino:
+        return None
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def quick_hash_cache_algorithm(file_size: int, quick_hash_algo: str) -> str:
+    """
+    Get the cache algorithm name for a scanner quick hash.
+
+    Small files are quick-hashed in full, so they share the full-hash entry;
+    large-file quick hashes only cover part of the file and are namespaced
+    so they are never mistaken for a full content hash.
+    """
+    if file_size <= 1_048_576:
+        return FULL_HASH_ALGORITHM
+    return f"quick:{quick_hash_algo}"
+
+
+class HashCache:
+    """
+    SQLite-backed hash cache with LRU eviction and hit/miss counters.
+    Safe to share between threads; separate processes share the file via WAL.
+    """
+
+    def __init__(self, cache_path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Open (or create) a hash cache.
+
+        Args:
+            cache_path: Path to the cache database file
+            max_entries: Entries kept before least-recently-used ones are evicted
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        self.conn = sqlite3.connect(str(self.cache_path), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS hash_cache (
+                device INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                algorithm TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (device, inode, algorithm)
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_hash_cache_lru ON hash_cache(last_used)")
+        self.conn.commit()
+        self._entries = self.conn.execute("SELECT COUNT(*) FROM hash_cache").fetchone()[0]
+
+    @classmethod
+    def for_database(cls, db_path=None, config: Optional[Dict] = None) -> Optional['HashCache']:
+        """
+        Open the cache configured for a CogniSys database.
+
+        The configured ``path`` wins, so every command pointed at the same
+        path shares one cache whatever database it works on.
+
+        Args:
+            db_path: Path to the scan database; without a configured path the cache
+                lives beside it, or at DEFAULT_CACHE_PATH when no database is given
+            config: Optional ``hash_cache`` config section (enabled, path, max_entries)
+
+        Returns:
+            HashCache instance, or None if caching is disabled
+        """
+        config = config or {}
+        if not config.get('enabled', True):
+            return None
+        if str(db_path) == ':memory:' and not config.get('path'):
+            return None
+        if config.get('path'):
+            cache_path = config['path']
+        elif db_path is not None:
+            cache_path = Path(db_path).parent / DEFAULT_CACHE_NAME
+        else:
+            cache_path = DEFAULT_CACHE_PATH
+        return cls(cache_path, config.get('max_entries', DEFAULT_MAX_ENTRIES))
+
+    def get_many(self, lookups: Iterable[Tuple[CacheKey, str]]) -> List[Optional[str]]:
+        """
+        Look up digests for (key, algorithm) pairs.
+
+        Returns:
+            List of digests (None for misses) in input order
+        """
+        results = []
+        touched = []
+        now = time.time()
+
+        with self.lock:
+            for key, algorithm in lookups:
+                digest = None
+                if key is not None:
+                    device, inode, size_bytes, mtime_ns = key
+                    row = self.conn.execute("""
+                        SELECT digest FROM hash_cache
+                        WHERE device = ? AND inode = ? AND algorithm = ?
+                        AND size_bytes = ? AND mtime_ns = ?
+                    """, (device, inode, algorithm, size_bytes, mtime_ns)).fetchone()
+                    if row:
+                        digest = row[0]
+                        touched.append((now, device, inode, algorithm))
+
+                self.stats['hits' if digest else 'misses'] += 1
+                results.append(digest)
+
+            if touched:
+                self.conn.executemany("""
+                    UPDATE hash_cache SET last_used = ?
+                    WHERE device = ? AND inode = ? AND algorithm = ?
+                """, touched)
+                self.conn.commit()
+
+        return results
+
+    def get(self, key: Optional[CacheKey], algorithm: str = FULL_HASH_ALGORITHM) -> Optional[str]:
+        """Look up a single digest."""
+        return self.get_many([(key, algorithm)])[0]
+
+    def put_many(self, entries: Iterable[Tuple[CacheKey, str, str]]):
+        """
+        Store (key, algorithm, digest) entries, replacing stale ones for the same inode.
+        """
+        now = time.time()
+        rows = [
+            (key[0], key[1], algorithm, key[2], key[3], digest, now)
+            for key, algorithm, digest in entries
+            if key is not None and digest
+        ]
+        if not rows:
+            return
+
+        with self.lock:
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO hash_cache
+                (device, inode, algorithm, size_bytes, mtime_ns, digest, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self.stats['stores'] += len(rows)
+            # Replacements don't grow the table; the count is an upper bound
+            self._entries += len(rows)
+            if self._entries > self.max_entries:
+                self._evict()
+            self.conn.commit()
+
+    def put(self, key: Optional[CacheKey], digest: str, algorithm: str = FULL_HASH_ALGORITHM):
+        """Store a single digest."""
+        self.put_many([(key, algorithm, digest)])
+
+    def _evict(self):
+        """Drop least-recently-used entries down to the eviction headroom (lock held)."""
+        self._entries = self.conn.execute("SELECT COUNT(*) FROM hash_cache").fetchone()[0]
+        excess = self._entries - int(self.max_entries * EVICTION_HEADROOM)
+        if self._entries <= self.max_entries or excess <= 0:
+            return
+
+        self.conn.execute("""
+            DELETE FROM hash_cache WHERE (device, inode, algorithm) IN (
+                SELECT device, inode, algorithm FROM hash_cache ORDER BY last_used LIMIT ?
+            )
+        """, (excess,))
+        self._entries -= excess
+        self.stats['evictions'] += excess
+
+    def hash_file(self, file_path, algorithm: str = FULL_HASH_ALGORITHM) -> str:
+        """
+        Return the content hash of a file, computing and storing it on a miss.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        key = cache_key(os.stat(file_path))
+        digest = self.get(key, algorithm)
+        if digest is None:
+            digest = hash_file(file_path, algorithm=algorithm)
+            self.put(key, digest, algorithm)
+        return digest
+
+    def get_stats(self) -> Dict:
+        """Return hit/miss/store/eviction counters and the current hit rate."""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['entries'] = self._entries
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self.lock:
+            self.conn.execute("DELETE FROM hash_cache")
+            self.conn.commit()
+            self._entries = 0
+
+    def close(self):
+        """Close the cache connection."""
+        self.conn.close()
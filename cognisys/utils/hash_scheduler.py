@@ -0,0 +1,181 @@
+"""
+I/O-aware scheduling for on-demand full hashing.
+
+Files are grouped by the device they live on and sorted by inode (a proxy
+for on-disk placement on most filesystems) and then path. Each device gets
+its own bounded worker pool sized for its storage: a rotational disk is read
+by one worker in sorted order so the head sweeps instead of seeking, while
+SSD and network devices run several reads at once. All devices are hashed
+concurrently.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from .hashing import detect_storage_type
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Default workers per device, by storage kind
+DEFAULT_DEVICE_WORKERS = {
+    'hdd': 1,
+    'ssd': 8,
+    'network': 4,
+}
+
+# Seconds between progress log lines
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+
+def classify_device(device: int, sample_path: str) -> str:
+    """
+    Classify the storage behind a device number as 'hdd', 'ssd' or 'network'.
+
+    Rotational disks are detected from /sys/dev/block (Linux only). Devices
+    that cannot be classified are treated as SSDs.
+
+    Args:
+        device: st_dev of a file on the device
+        sample_path: Path of that file, used to detect network mounts
+    """
+    if detect_storage_type(sample_path) == 'network':
+        return 'network'
+
+    block = f"/sys/dev/block/{os.major(device)}:{os.minor(device)}"
+    # Partitions keep the queue attributes on their parent disk
+    for queue in (os.path.join(block, 'queue'), os.path.join(block, '..', 'queue')):
+        try:
+            with open(os.path.join(queue, 'rotational')) as f:
+                return 'hdd' if f.read().strip() == '1' else 'ssd'
+        except OSError:
+            continue
+    return 'ssd'
+
+
+class FullHashScheduler:
+    """
+    Hash batches of files with one bounded thread pool per device.
+    """
+
+    def __init__(
+        self,
+        hash_func: Callable[[str], Optional[str]],
+        device_workers: Optional[Dict[str, int]] = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL
+    ):
+        """
+        Args:
+            hash_func: Returns the full hash of a path, or None if it cannot be read.
+                Called from worker threads.
+            device_workers: Workers per storage kind (hdd, ssd, network)
+            progress_interval: Seconds between progress log lines
+        """
+        self.hash_func = hash_func
+        self.device_workers = dict(DEFAULT_DEVICE_WORKERS)
+        self.device_workers.update(device_workers or {})
+        self.progress_interval = progress_interval
+        self._device_kinds = {}
+        self.stats = {
+            'files_hashed': 0,
+            'bytes_hashed': 0,
+            'errors': 0,
+            'seconds': 0.0,
+            'devices': {}
+        }
+
+    def hash_files(self, files: Iterable[Tuple[Hashable, str, int]]) -> Dict[Hashable, Optional[str]]:
+        """
+        Hash files, scheduling reads per device.
+
+        Args:
+            files: (key, path, size_bytes) tuples
+
+        Returns:
+            Mapping of key to full hash (None if the file could not be read)
+        """
+        results = {}
+        by_device = {}
+        for key, path, size_bytes in files:
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                logger.debug(f"Cannot stat {path}: {e}")
+                results[key] = None
+                self.stats['errors'] += 1
+                continue
+            by_device.setdefault(stat.st_dev, []).append((stat.st_ino, path, key, size_bytes))
+
+        total_files = sum(len(items) for items in by_device.values())
+        if not total_files:
+            return results
+        total_bytes = sum(item[3] for items in by_device.values() for item in items)
+
+        pools = []
+        futures = {}
+        started = time.perf_counter()
+        try:
+            for device, items in by_device.items():
+                items.sort()
+                kind = self._device_kind(device, items[0][1])
+                workers = max(1, self.device_workers.get(kind, 1))
+                self.stats['devices'][device] = kind
+                logger.debug(f"Hashing {len(items)} files on device {device} ({kind}, {workers} workers)")
+
+                pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"hash-{kind}")
+                pools.append(pool)
+                for _, path, key, size_bytes in items:
+                    futures[pool.submit(self.hash_func, path)] = (key, size_bytes)
+
+            done_files = 0
+            done_bytes = 0
+            last_report = started
+            for future in as_completed(futures):
+                key, size_bytes = futures[future]
+                digest = future.result()
+                results[key] = digest
+                done_files += 1
+                if digest:
+                    done_bytes += size_bytes
+                    self.stats['files_hashed'] += 1
+                    self.stats['bytes_hashed'] += size_bytes
+                else:
+                    self.stats['errors'] += 1
+
+                now = time.perf_counter()
+                if now - last_report >= self.progress_interval:
+                    last_report = now
+                    logger.info(self._progress_line(done_files, total_files, done_bytes,
+                                                    total_bytes, now - started))
+        finally:
+            for pool in pools:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        elapsed = time.perf_counter() - started
+        self.stats['seconds'] += elapsed
+        logger.info(self._progress_line(total_files, total_files, done_bytes, total_bytes, elapsed))
+        return results
+
+    def _device_kind(self, device: int, sample_path: str) -> str:
+        """Classify a device once per scheduler."""
+        kind = self._device_kinds.get(device)
+        if kind is None:
+            kind = self._device_kinds[device] = classify_device(device, sample_path)
+        return kind
+
+    @staticmethod
+    def _progress_line(done_files: int, total_files: int, done_bytes: int,
+                       total_bytes: int, elapsed: float) -> str:
+        rate = done_bytes / elapsed / 1e6 if elapsed > 0 else 0.0
+        return (f"  -> Full hashing: {done_files}/{total_files} files, "
+                f"{done_bytes / 1e9:.2f}/{total_bytes / 1e9:.2f} GB ({rate:.1f} MB/s)")
+
+    def get_stats(self) -> Dict:
+        """Return cumulative hashing counters and throughput."""
+        stats = dict(self.stats)
+        stats['devices'] = dict(self.stats['devices'])
+        seconds = stats['seconds']
+        stats['bytes_per_second'] = stats['bytes_hashed'] / seconds if seconds > 0 else 0.0
+        return stats
@@ -1,27 +1,151 @@
 """
 Hashing utilities for file content comparison.
-Implements both quick hash (first 1MB) and full hash (entire file) strategies.
+Implements quick hash (first 1MB, or sampled windows for large media) and
+full hash (entire file) strategies.
+
+Quick hashes only pre-filter duplicate candidates, so they may use any algorithm
+from the registry below (including fast non-cryptographic ones). Full hashes are
+always SHA-256 and are what exact-duplicate detection ultimately trusts.
 """
 
 import hashlib
+import mmap
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+# Algorithm used for full hashes (and for quick hashes of files small enough
+# that the quick hash is the full hash)
+FULL_HASH_ALGORITHM = 'sha256'
+
+# Full-hash read sizing
+MIN_BUFFER_SIZE = 65_536
+LOCAL_BUFFER_SIZE = 1_048_576
+NETWORK_BUFFER_SIZE = 4_194_304
+MMAP_THRESHOLD = 67_108_864  # Files at least this large are mmap'ed when local
+
+# Progressive comparison block sizing (blocks double from the first size up to the cap)
+PROGRESSIVE_BLOCK_SIZE = 262_144
+PROGRESSIVE_MAX_BLOCK_SIZE = 4_194_304
+
+NETWORK_FILESYSTEMS = frozenset({
+    'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'fuse.sshfs', 'fuse.rclone', '9p', 'afs', 'ceph', 'glusterfs'
+})
+
+
+class _Crc32Hash:
+    """hashlib-style wrapper around zlib.crc32 (stdlib, non-cryptographic)."""
+
+    def __init__(self):
+        self._value = 0
+
+    def update(self, data: bytes):
+        self._value = zlib.crc32(data, self._value)
+
+    def hexdigest(self) -> str:
+        return f"{self._value:08x}"
+
+
+# Registry of hash algorithms: name -> factory returning a hashlib-style object
+HASH_ALGORITHMS: Dict[str, Callable] = {
+    'sha256': hashlib.sha256,
+    'blake2b': lambda: hashlib.blake2b(digest_size=16),
+    'crc32': _Crc32Hash,
+}
+
+if XXHASH_AVAILABLE:
+    HASH_ALGORITHMS['xxh64'] = xxhash.xxh64
+    HASH_ALGORITHMS['xxh3_128'] = xxhash.xxh3_128
+
+
+def register_hash_algorithm(name: str, factory: Callable):
+    """
+    Register a hash algorithm for quick hashing.
+    Registrations are per-process; the process hashing backend only sees
+    algorithms registered at import time.
+
+    Args:
+        name: Algorithm name stored alongside each hash
+        factory: Callable returning an object with update() and hexdigest()
+    """
+    HASH_ALGORITHMS[name] = factory
+
+
+def resolve_hash_algorithm(name: str = 'auto') -> str:
+    """
+    Resolve an algorithm name, mapping 'auto' to the fastest available one.
+    Without xxhash, 'auto' falls back to SHA-256, which is hardware-accelerated
+    on most CPUs and usually beats blake2b there.
+
+    Args:
+        name: Algorithm name or 'auto'
+
+    Returns:
+        Registered algorithm name
+    """
+    if name == 'auto':
+        return 'xxh3_128' if XXHASH_AVAILABLE else FULL_HASH_ALGORITHM
+    if name not in HASH_ALGORITHMS:
+        raise ValueError(f"Unknown hash algorithm: {name}")
+    return name
+
+
+def quick_hash_algorithm_for(
+    file_size: int,
+    algorithm: str = FULL_HASH_ALGORITHM,
+    sample: Optional[Tuple[int, int]] = None
+) -> str:
+    """
+    Get the algorithm calculate_adaptive_hash uses for a file's quick hash.
+    Sampled hashes are labelled with their window layout so hashes taken with
+    different sampling parameters are never compared.
+
+    Args:
+        file_size: Size of file in bytes
+        algorithm: Configured quick hash algorithm
+        sample: Optional (window_size, windows) for sampled quick hashes
+
+    Returns:
+        Algorithm name to record alongside the quick hash
+    """
+    if file_size <= 1_048_576:
+        return FULL_HASH_ALGORITHM
+    if sample:
+        window_size, windows = sample
+        return f"{algorithm}+sampled:{windows}x{window_size}"
+    return algorithm
 
 
-def calculate_quick_hash(file_path: Path, chunk_size: int = 1_048_576) -> Optional[str]:
+def calculate_quick_hash(
+    file_path: Path,
+    chunk_size: int = 1_048_576,
+    algorithm: str = FULL_HASH_ALGORITHM
+) -> Optional[str]:
     """
-    Calculate SHA-256 hash of first chunk of file (default 1MB).
+    Calculate hash of first chunk of file (default 1MB).
     Used for fast pre-filtering of potential duplicates.
 
     Args:
         file_path: Path to the file
         chunk_size: Size of chunk to hash (default 1MB)
+        algorithm: Registered hash algorithm (default SHA-256)
 
     Returns:
         Hexadecimal hash string, or None if file cannot be read
     """
     try:
-        hash_obj = hashlib.sha256()
+        hash_obj = HASH_ALGORITHMS[algorithm]()
 
         with open(file_path, 'rb') as f:
             chunk = f.read(chunk_size)
@@ -33,43 +157,298 @@ def calculate_quick_hash(file_path: Path, chunk_size: int = 1_048_576) -> Option
         return None
 
 
-def calculate_full_hash(file_path: Path, buffer_size: int = 65536) -> Optional[str]:
+def calculate_sampled_hash(
+    file_path: Path,
+    file_size: int,
+    window_size: int = 1_048_576,
+    windows: int = 5,
+    algorithm: str = FULL_HASH_ALGORITHM
+) -> Optional[str]:
     """
-    Calculate SHA-256 hash of entire file.
-    Used for exact duplicate verification.
+    Calculate hash of fixed-size windows spread across the file (head, evenly
+    spaced middle offsets, tail) plus the file size.
+    Large media files often share identical container headers, so sampling the
+    whole file separates distinct files that a head-only quick hash would group.
 
     Args:
         file_path: Path to the file
-        buffer_size: Buffer size for reading (default 64KB)
+        file_size: Size of file in bytes
+        window_size: Bytes read per window (default 1MB)
+        windows: Number of windows, including head and tail (minimum 2)
+        algorithm: Registered hash algorithm (default SHA-256)
 
     Returns:
         Hexadecimal hash string, or None if file cannot be read
     """
+    windows = max(2, windows)
     try:
-        hash_obj = hashlib.sha256()
+        hash_obj = HASH_ALGORITHMS[algorithm]()
+        hash_obj.update(file_size.to_bytes(8, 'little'))
 
         with open(file_path, 'rb') as f:
+            if file_size <= window_size * windows:
+                # Windows would overlap - hash the whole file
+                while True:
+                    data = f.read(window_size)
+                    if not data:
+                        break
+                    hash_obj.update(data)
+            else:
+                last_offset = file_size - window_size
+                for i in range(windows):
+                    f.seek(last_offset * i // (windows - 1))
+                    hash_obj.update(f.read(window_size))
+
+        return hash_obj.hexdigest()
+
+    except (PermissionError, OSError, IOError) as e:
+        return None
+
+
+def detect_storage_type(file_path: Path) -> str:
+    """
+    Classify the storage a path lives on as 'local' or 'network'.
+    Recognizes UNC paths and, on Linux, NFS/SMB/FUSE-network mounts.
+
+    Args:
+        file_path: Path to classify
+
+    Returns:
+        'network' or 'local'
+    """
+    path_str = str(file_path)
+    if path_str.startswith('\\\\') or path_str.startswith('//'):
+        return 'network'
+
+    mounts = _network_mount_points()
+    if mounts:
+        resolved = os.path.abspath(path_str)
+        for mount in mounts:
+            if resolved == mount or resolved.startswith(mount.rstrip('/') + '/'):
+                return 'network'
+    return 'local'
+
+
+@lru_cache(maxsize=1)
+def _network_mount_points() -> Tuple[str, ...]:
+    """Read network filesystem mount points from /proc/mounts (Linux only)."""
+    try:
+        with open('/proc/mounts') as f:
+            return tuple(
+                fields[1] for fields in (line.split() for line in f)
+                if len(fields) > 2 and fields[2] in NETWORK_FILESYSTEMS
+            )
+    except OSError:
+        return ()
+
+
+def choose_buffer_size(file_size: int, storage: str = 'local') -> int:
+    """
+    Pick a read buffer size for full hashing.
+    Small files are read in one call; large files use bigger buffers on network
+    storage, where each read is a round trip.
+
+    Args:
+        file_size: Size of file in bytes
+        storage: 'local' or 'network'
+
+    Returns:
+        Buffer size in bytes
+    """
+    cap = NETWORK_BUFFER_SIZE if storage == 'network' else LOCAL_BUFFER_SIZE
+    return max(MIN_BUFFER_SIZE, min(file_size, cap))
+
+
+def hash_file(
+    file_path: Path,
+    algorithm: str = FULL_HASH_ALGORITHM,
+    strategy: str = 'auto',
+    buffer_size: Optional[int] = None
+) -> str:
+    """
+    Hash an entire file. Shared full-hash engine for the scanner, analyzer,
+    register command and consolidation scripts.
+
+    Strategies:
+        read     - f.read() per chunk (allocates a new bytes object per read)
+        readinto - one reusable bytearray filled with readinto(), hashed via memoryview
+        mmap     - map the file and hash it in buffer-sized slices, no copies
+        auto     - mmap for large local files, readinto otherwise
+
+    Args:
+        file_path: Path to the file
+        algorithm: Registered hash algorithm (default SHA-256)
+        strategy: Read strategy (see above)
+        buffer_size: Read size in bytes (default: choose_buffer_size)
+
+    Returns:
+        Hexadecimal hash string
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    hash_obj = HASH_ALGORITHMS[algorithm]()
+
+    with open(file_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+
+        if strategy == 'auto':
+            storage = detect_storage_type(file_path)
+            strategy = 'mmap' if storage == 'local' and file_size >= MMAP_THRESHOLD else 'readinto'
+        else:
+            storage = 'local'
+
+        if buffer_size is None:
+            buffer_size = choose_buffer_size(file_size, storage)
+
+        if strategy == 'mmap' and file_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, file_size, buffer_size):
+                        hash_obj.update(view[offset:offset + buffer_size])
+                finally:
+                    view.release()
+
+        elif strategy in ('readinto', 'mmap'):
+            buffer = bytearray(buffer_size)
+            view = memoryview(buffer)
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hash_obj.update(view[:n])
+
+        elif strategy == 'read':
             while True:
                 data = f.read(buffer_size)
                 if not data:
                     break
                 hash_obj.update(data)
 
-        return hash_obj.hexdigest()
+        else:
+            raise ValueError(f"Unknown hashing strategy: {strategy}")
+
+    return hash_obj.hexdigest()
+
+
+def calculate_full_hash(
+    file_path: Path,
+    buffer_size: Optional[int] = None,
+    strategy: str = 'auto'
+) -> Optional[str]:
+    """
+    Calculate SHA-256 hash of entire file.
+    Used for exact duplicate verification.
+
+    Args:
+        file_path: Path to the file
+        buffer_size: Buffer size for reading (default: sized by file and storage type)
+        strategy: Read strategy for hash_file ('auto', 'read', 'readinto', 'mmap')
+
+    Returns:
+        Hexadecimal hash string, or None if file cannot be read
+    """
+    try:
+        return hash_file(file_path, FULL_HASH_ALGORITHM, strategy, buffer_size)
 
     except (PermissionError, OSError, IOError) as e:
         return None
 
 
-def calculate_adaptive_hash(file_path: Path, file_size: int) -> tuple[Optional[str], Optional[str]]:
+def progressive_full_hashes(
+    paths: List[str],
+    block_size: int = PROGRESSIVE_BLOCK_SIZE,
+    max_block_size: int = PROGRESSIVE_MAX_BLOCK_SIZE
+) -> Tuple[List[Optional[str]], int]:
+    """
+    Compare same-size files block by block, hashing only those that stay identical.
+
+    All files are read in lockstep and the group is split whenever their
+    blocks differ; a file with no remaining match is closed without reading
+    the rest of it. Members of a subgroup have identical content, so each
+    subgroup keeps one SHA-256 object and copies it when it splits. Blocks
+    start at block_size and double up to max_block_size, since near-miss
+    files usually diverge early.
+
+    Args:
+        paths: Files to compare (expected to share a size)
+        block_size: First block size in bytes
+        max_block_size: Largest block size in bytes
+
+    Returns:
+        Tuple of (full hashes in input order, None for files that matched
+        no other file or could not be read; total bytes read)
+    """
+    digests: List[Optional[str]] = [None] * len(paths)
+    handles = {}
+    bytes_read = 0
+
+    try:
+        for index, path in enumerate(paths):
+            try:
+                handles[index] = open(path, 'rb')
+            except OSError:
+                continue
+
+        # (hash of the bytes read so far, member indexes)
+        active = [(HASH_ALGORITHMS[FULL_HASH_ALGORITHM](), list(handles))] if len(handles) > 1 else []
+        size = block_size
+        while active:
+            next_active = []
+            for hash_obj, members in active:
+                blocks = {}
+                for index in members:
+                    try:
+                        data = handles[index].read(size)
+                    except OSError:
+                        handles.pop(index).close()
+                        continue
+                    bytes_read += len(data)
+                    blocks.setdefault(data, []).append(index)
+
+                for data, same in blocks.items():
+                    if len(same) >= 2 and data:
+                        subgroup_hash = hash_obj if len(blocks) == 1 else hash_obj.copy()
+                        subgroup_hash.update(data)
+                        next_active.append((subgroup_hash, same))
+                        continue
+
+                    # Diverged from every other member, or all reached EOF together
+                    if len(same) >= 2:
+                        digest = hash_obj.hexdigest()
+                        for index in same:
+                            digests[index] = digest
+                    for index in same:
+                        handles.pop(index).close()
+
+            active = next_active
+            size = min(size * 2, max_block_size)
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    return digests, bytes_read
+
+
+def calculate_adaptive_hash(
+    file_path: Path,
+    file_size: int,
+    quick_algorithm: str = FULL_HASH_ALGORITHM,
+    sample: Optional[Tuple[int, int]] = None
+) -> tuple[Optional[str], Optional[str]]:
     """
     Adaptively calculate hashes based on file size.
-    For small files (<1MB), quick hash = full hash.
+    For small files (<1MB), quick hash = full hash (SHA-256).
     For larger files, calculate quick hash only (full hash on demand).
 
     Args:
         file_path: Path to the file
         file_size: Size of file in bytes
+        quick_algorithm: Algorithm for large-file quick hashes
+            (see quick_hash_algorithm_for)
+        sample: Optional (window_size, windows) to quick-hash sampled windows
+            instead of the first 1MB
 
     Returns:
         Tuple of (quick_hash, full_hash)
@@ -80,5 +459,101 @@ def calculate_adaptive_hash(file_path: Path, file_size: int) -> tuple[Optional[s
         return full_hash, full_hash
     else:
         # Large file - quick hash only
-        quick_hash = calculate_quick_hash(file_path)
+        if sample:
+            window_size, windows = sample
+            quick_hash = calculate_sampled_hash(file_path, file_size, window_size, windows, quick_algorithm)
+        else:
+            quick_hash = calculate_quick_hash(file_path, algorithm=quick_algorithm)
         return quick_hash, None
+
+
+def calculate_adaptive_hashes(
+    files: List[Tuple],
+    quick_algorithm: str = FULL_HASH_ALGORITHM
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Calculate adaptive hashes for many files in one call.
+    This is the unit of work submitted to the process-pool backend, so that
+    inter-process overhead is paid once per chunk rather than once per file.
+
+    Args:
+        files: List of (file_path, file_size) or (file_path, file_size, sample) tuples
+        quick_algorithm: Algorithm for large-file quick hashes
+
+    Returns:
+        List of (quick_hash, full_hash) tuples, in input order
+    """
+    return [
+        calculate_adaptive_hash(Path(item[0]), item[1], quick_algorithm, item[2] if len(item) > 2 else None)
+        for item in files
+    ]
+
+
+class ThreadHashingBackend:
+    """Hashes in the calling thread (default; best when I/O-bound)."""
+
+    name = 'thread'
+
+    def hash_many(
+        self,
+        files: List[Tuple],
+        quick_algorithm: str = FULL_HASH_ALGORITHM
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Hash a chunk of (path, size[, sample]) tuples."""
+        return calculate_adaptive_hashes(files, quick_algorithm)
+
+    def close(self):
+        """Release backend resources."""
+        pass
+
+
+class ProcessHashingBackend:
+    """
+    Hashes in a pool of worker processes, sidestepping the GIL when hashing
+    is CPU-bound (many cores, fast local storage).
+    """
+
+    name = 'process'
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the process pool.
+
+        Args:
+            max_workers: Number of worker processes (default: CPU count)
+        """
+        # spawn avoids forking a process that already has scanner threads running
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def hash_many(
+        self,
+        files: List[Tuple],
+        quick_algorithm: str = FULL_HASH_ALGORITHM
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Hash a chunk of (path, size[, sample]) tuples in a worker process."""
+        return self.executor.submit(calculate_adaptive_hashes, files, quick_algorithm).result()
+
+    def close(self):
+        """Shut down worker processes."""
+        self.executor.shutdown(wait=True)
+
+
+def create_hashing_backend(backend: str = 'thread', max_workers: Optional[int] = None):
+    """
+    Create a hashing backend by name.
+
+    Args:
+        backend: 'thread' or 'process'
+        max_workers: Worker process count for the process backend
+
+    Returns:
+        Hashing backend instance
+    """
+    if backend == 'thread':
+        return ThreadHashingBackend()
+    if backend == 'process':
+        return ProcessHashingBackend(max_workers)
+    raise ValueError(f"Unknown hashing backend: {backend}")
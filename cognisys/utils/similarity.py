@@ -0,0 +1,173 @@
+"""
+Indexed fuzzy name matching.
+
+Finds every pair of names whose SequenceMatcher ratio meets a threshold
+without comparing all pairs. Names are broken into padded bigrams held in
+an inverted (prefix-filtered) index; a pair is only verified with
+SequenceMatcher when it shares enough bigrams to possibly reach the
+threshold.
+
+Why the count filter never drops a match: ratio = 2M/T, where M is the
+number of matched characters and T the combined length, so a pair at or
+above threshold t is at most d = floor((1 - t) * T) insertions/deletions
+apart. Each insertion or deletion destroys at most two bigrams of the
+padded string (L + 1 bigrams for a name of length L), so the pair shares at
+least max(La, Lb) + 1 - 2d bigrams. For t >= 0.8 a match also always
+shares at least one padded bigram: if no two matched characters are
+adjacent in both names, at least M - 1 characters are unmatched and
+2M / (3M - 1) < 0.8 unless M <= 2 with nothing unmatched before the first
+match, i.e. both names start with the same character. Below
+INDEXED_MIN_THRESHOLD every length-compatible pair is verified.
+"""
+
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Iterator, List, Sequence, Tuple
+
+# Thresholds below this fall back to verifying every length-compatible pair
+INDEXED_MIN_THRESHOLD = 0.8
+
+
+def name_bigrams(name: str) -> List[Tuple[str, int]]:
+    """
+    Padded bigrams of a name, numbered by occurrence so that set
+    intersection counts repeated bigrams correctly.
+    """
+    padded = f"\x02{name}\x03"
+    seen = Counter()
+    tokens = []
+    for i in range(len(padded) - 1):
+        gram = padded[i:i + 2]
+        seen[gram] += 1
+        tokens.append((gram, seen[gram]))
+    return tokens
+
+
+def lengths_compatible(len_a: int, len_b: int, threshold: float) -> bool:
+    """The length pre-check applied before any similarity calculation."""
+    return abs(len_a - len_b) <= max(len_a, len_b) * (1 - threshold)
+
+
+def min_shared_bigrams(length: int, threshold: float) -> int:
+    """
+    Fewest padded bigrams a name of this length can share with any
+    length-compatible name at or above the threshold (at least 1).
+    """
+    required = None
+    low = int(length * threshold) - 1
+    high = int(length / threshold) + 2 if threshold > 0 else length
+    for other in range(max(0, low), high + 1):
+        if not lengths_compatible(length, other, threshold):
+            continue
+        bound = _shared_bigram_bound(length, other, threshold)
+        required = bound if required is None else min(required, bound)
+    return max(1, required if required is not None else 1)
+
+
+def _shared_bigram_bound(len_a: int, len_b: int, threshold: float) -> int:
+    """Bigrams two names at or above the threshold must share (see module docstring)."""
+    max_edits = int((1 - threshold) * (len_a + len_b) + 1e-9)
+    return max(len_a, len_b) + 1 - 2 * max_edits
+
+
+def iter_similar_pairs(names: Sequence[str], threshold: float) -> Iterator[Tuple[int, int, float]]:
+    """
+    Find pairs of names at or above a similarity threshold.
+
+    Bigrams of each name are ordered rarest first and only a prefix of them
+    is indexed and probed: two names sharing at least r bigrams must share
+    one among the first (count - r + 1) of each, so frequent bigrams such
+    as a common leading character rarely generate candidates. Candidates
+    are checked against the full shared-bigram bound before SequenceMatcher.
+
+    Pairs are yielded in (i, j) order with i < j, and the ratio is
+    SequenceMatcher(None, names[i], names[j]).ratio(), exactly as an
+    all-pairs loop over the same list would compute it.
+
+    Args:
+        names: Names to compare (already normalized)
+        threshold: Similarity threshold (0.0 to 1.0)
+
+    Yields:
+        (i, j, ratio) tuples
+    """
+    matcher = SequenceMatcher(None)
+    indexed = threshold >= INDEXED_MIN_THRESHOLD
+    pairs = []
+
+    if indexed:
+        token_lists = [name_bigrams(name) for name in names]
+        frequency = Counter(token for tokens in token_lists for token in tokens)
+        token_sets = [frozenset(tokens) for tokens in token_lists]
+        min_shared = {}
+        postings = {}
+
+    for j, name_b in enumerate(names):
+        len_b = len(name_b)
+        if indexed:
+            if len_b not in min_shared:
+                min_shared[len_b] = min_shared_bigrams(len_b, threshold)
+            tokens = sorted(token_lists[j], key=lambda token: (frequency[token], token))
+            candidates = set()
+            for token in tokens[:len(tokens) - min_shared[len_b] + 1]:
+                posting = postings.setdefault(token, [])
+                candidates.update(posting)
+                posting.append(j)
+            candidates = sorted(candidates)
+        else:
+            candidates = range(j)
+
+        matcher.set_seq2(name_b)
+        for i in candidates:
+            name_a = names[i]
+            len_a = len(name_a)
+            if not lengths_compatible(len_a, len_b, threshold):
+                continue
+            if indexed and len(token_sets[i] & token_sets[j]) < _shared_bigram_bound(len_a, len_b, threshold):
+                continue
+
+            matcher.set_seq1(name_a)
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                pairs.append((i, j, ratio))
+
+    pairs.sort()
+    yield from pairs
+
+
+class DisjointSet:
+    """
+    Union-find over integer items 0..n-1 with path halving and union by size.
+    """
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.sizes = [1] * size
+
+    def find(self, item: int) -> int:
+        """Return the representative of an item's set."""
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> int:
+        """Merge the sets of two items; returns the new representative."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.sizes[root_a] < self.sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.sizes[root_a] += self.sizes[root_b]
+        return root_a
+
+    def components(self) -> List[List[int]]:
+        """Sets with more than one item, each sorted, ordered by their smallest item."""
+        members = {}
+        for item in range(len(self.parent)):
+            members.setdefault(self.find(item), []).append(item)
+        return [items for items in members.values() if len(items) > 1]
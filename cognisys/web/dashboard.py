@@ -5,19 +5,34 @@ Flask-based review and management interface
 
 from flask import Flask, render_template, jsonify, request, send_file
 import sqlite3
+import threading
 from pathlib import Path
 import json
 from datetime import datetime
 
+from cognisys.models.connection_pool import ConnectionPool
+
 app = Flask(__name__)
 app.config['DATABASE'] = '.cognisys/file_registry.db'
 
+_pool = None
+_pool_lock = threading.Lock()
+
 
-def get_db():
-    """Get database connection"""
-    conn = sqlite3.connect(app.config['DATABASE'])
-    conn.row_factory = sqlite3.Row
-    return conn
+def get_pool():
+    """Get the connection pool for the configured database"""
+    global _pool
+    db_path = Path(app.config['DATABASE'])
+    pool = _pool
+    if pool is not None and pool.db_path == db_path:
+        return pool
+    # Request threads race here on first use; only one may build (or swap) the pool
+    with _pool_lock:
+        if _pool is None or _pool.db_path != db_path:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(db_path, row_factory=sqlite3.Row)
+        return _pool
 
 
 @app.route('/')
@@ -29,53 +44,51 @@ def index():
 @app.route('/api/stats')
 def get_stats():
     """Get database statistics"""
-    conn = get_db()
-    cursor = conn.cursor()
-
-    # Total files
-    cursor.execute("SELECT COUNT(*) as total FROM file_registry")
-    total = cursor.fetchone()['total']
-
-    # By state
-    cursor.execute("""
-        SELECT canonical_state, COUNT(*) as count
-        FROM file_registry
-        GROUP BY canonical_state
-    """)
-    by_state = {row['canonical_state']: row['count'] for row in cursor.fetchall()}
-
-    # By document type (top 15)
-    cursor.execute("""
-        SELECT document_type, COUNT(*) as count
-        FROM file_registry
-        WHERE document_type IS NOT NULL
-        GROUP BY document_type
-        ORDER BY count DESC
-        LIMIT 15
-    """)
-    by_type = [dict(row) for row in cursor.fetchall()]
-
-    # By classification method
-    cursor.execute("""
-        SELECT classification_method, COUNT(*) as count
-        FROM file_registry
-        WHERE classification_method IS NOT NULL
-        GROUP BY classification_method
-    """)
-    by_method = {row['classification_method']: row['count'] for row in cursor.fetchall()}
-
-    # Duplicates
-    cursor.execute("SELECT COUNT(*) as count FROM file_registry WHERE is_duplicate = 1")
-    duplicates = cursor.fetchone()['count']
-
-    # Low confidence
-    cursor.execute("""
-        SELECT COUNT(*) as count FROM file_registry
-        WHERE confidence < 0.70 AND confidence > 0
-    """)
-    low_confidence = cursor.fetchone()['count']
-
-    conn.close()
+    with get_pool().reader() as conn:
+        cursor = conn.cursor()
+
+        # Total files
+        cursor.execute("SELECT COUNT(*) as total FROM file_registry")
+        total = cursor.fetchone()['total']
+
+        # By state
+        cursor.execute("""
+            SELECT canonical_state, COUNT(*) as count
+            FROM file_registry
+            GROUP BY canonical_state
+        """)
+        by_state = {row['canonical_state']: row['count'] for row in cursor.fetchall()}
+
+        # By document type (top 15)
+        cursor.execute("""
+            SELECT document_type, COUNT(*) as count
+            FROM file_registry
+            WHERE document_type IS NOT NULL
+            GROUP BY document_type
+            ORDER BY count DESC
+            LIMIT 15
+        """)
+        by_type = [dict(row) for row in cursor.fetchall()]
+
+        # By classification method
+        cursor.execute("""
+            SELECT classification_method, COUNT(*) as count
+            FROM file_registry
+            WHERE classification_method IS NOT NULL
+            GROUP BY classification_method
+        """)
+        by_method = {row['classification_method']: row['count'] for row in cursor.fetchall()}
+
+        # Duplicates
+        cursor.execute("SELECT COUNT(*) as count FROM file_registry WHERE is_duplicate = 1")
+        duplicates = cursor.fetchone()['count']
+
+        # Low confidence
+        cursor.execute("""
+            SELECT COUNT(*) as count FROM file_registry
+            WHERE confidence < 0.70 AND confidence > 0
+        """)
+        low_confidence = cursor.fetchone()['count']
 
     return jsonify({
         'total': total,
@@ -87,6 +100,12 @@ def get_stats():
     })
 
 
+@app.route('/api/pool')
+def get_pool_stats():
+    """Get connection pool metrics"""
+    return jsonify(get_pool().get_stats())
+
+
 @app.route('/api/files')
 def get_files():
     """Get paginated file list"""
@@ -95,41 +114,39 @@ def get_files():
     filter_type = request.args.get('type', None)
     filter_state = request.args.get('state', None)
 
-    conn = get_db()
-    cursor = conn.cursor()
+    with get_pool().reader() as conn:
+        cursor = conn.cursor()
 
-    # Build query
-    query = "SELECT * FROM file_registry WHERE 1=1"
-    params = []
+        # Build query
+        query = "SELECT * FROM file_registry WHERE 1=1"
+        params = []
 
-    if filter_type:
-        query += " AND document_type = ?"
-        params.append(filter_type)
+        if filter_type:
+            query += " AND document_type = ?"
+            params.append(filter_type)
 
-    if filter_state:
-        query += " AND canonical_state = ?"
-        params.append(filter_state)
+        if filter_state:
+            query += " AND canonical_state = ?"
+            params.append(filter_state)
 
-    query += " ORDER BY file_id DESC LIMIT ? OFFSET ?"
-    params.extend([per_page, (page - 1) * per_page])
+        query += " ORDER BY file_id DESC LIMIT ? OFFSET ?"
+        params.extend([per_page, (page - 1) * per_page])
 
-    cursor.execute(query, params)
-    files = [dict(row) for row in cursor.fetchall()]
+        cursor.execute(query, params)
+        files = [dict(row) for row in cursor.fetchall()]
 
-    # Get total count
-    count_query = "SELECT COUNT(*) as total FROM file_registry WHERE 1=1"
-    count_params = []
-    if filter_type:
-        count_query += " AND document_type = ?"
-        count_params.append(filter_type)
-    if filter_state:
-        count_query += " AND canonical_state = ?"
-        count_params.append(filter_state)
+        # Get total count
+        count_query = "SELECT COUNT(*) as total FROM file_registry WHERE 1=1"
+        count_params = []
+        if filter_type:
+            count_query += " AND document_type = ?"
+            count_params.append(filter_type)
+        if filter_state:
+            count_query += " AND canonical_state = ?"
+            count_params.append(filter_state)
 
-    cursor.execute(count_query, count_params)
-    total = cursor.fetchone()['total']
-
-    conn.close()
+        cursor.execute(count_query, count_params)
+        total = cursor.fetchone()['total']
 
     return jsonify({
         'files': files,
@@ -142,16 +159,15 @@ def get_files():
 @app.route('/api/file/<int:file_id>')
 def get_file(file_id):
     """Get single file details"""
-    conn = get_db()
-    cursor = conn.cursor()
+    with get_pool().reader() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("SELECT * FROM file_registry WHERE file_id = ?", (file_id,))
-    file = cursor.fetchone()
+        cursor.execute("SELECT * FROM file_registry WHERE file_id = ?", (file_id,))
+        file = cursor.fetchone()
 
-    if not file:
-        return jsonify({'error': 'File not found'}), 404
+        if not file:
+            return jsonify({'error': 'File not found'}), 404
 
-    conn.close()
     return jsonify(dict(file))
 
 
@@ -165,20 +181,17 @@ def update_file(file_id):
     if not doc_type:
         return jsonify({'error': 'document_type required'}), 400
 
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        UPDATE file_registry
-        SET document_type = ?,
-            confidence = ?,
-            classification_method = 'manual_correction',
-            updated_at = datetime('now')
-        WHERE file_id = ?
-    """, (doc_type, confidence, file_id))
+    with get_pool().writer() as conn:
+        cursor = conn.cursor()
 
-    conn.commit()
-    conn.close()
+        cursor.execute("""
+            UPDATE file_registry
+            SET document_type = ?,
+                confidence = ?,
+                classification_method = 'manual_correction',
+                updated_at = datetime('now')
+            WHERE file_id = ?
+        """, (doc_type, confidence, file_id))
 
     return jsonify({'success': True})
 
@@ -192,18 +205,17 @@ def search_files():
     if len(query) < 3:
         return jsonify({'files': []})
 
-    conn = get_db()
-    cursor = conn.cursor()
+    with get_pool().reader() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT * FROM file_registry
-        WHERE original_path LIKE ?
-        ORDER BY file_id DESC
-        LIMIT ?
-    """, (f'%{query}%', limit))
+        cursor.execute("""
+            SELECT * FROM file_registry
+            WHERE original_path LIKE ?
+            ORDER BY file_id DESC
+            LIMIT ?
+        """, (f'%{query}%', limit))
 
-    files = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+        files = [dict(row) for row in cursor.fetchall()]
 
     return jsonify({'files': files})
 
@@ -213,18 +225,17 @@ def get_low_confidence():
     """Get low confidence classifications for review"""
     limit = request.args.get('limit', 100, type=int)
 
-    conn = get_db()
-    cursor = conn.cursor()
+    with get_pool().reader() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT * FROM file_registry
-        WHERE confidence < 0.70 AND confidence > 0
-        ORDER BY confidence ASC
-        LIMIT ?
-    """, (limit,))
+        cursor.execute("""
+            SELECT * FROM file_registry
+            WHERE confidence < 0.70 AND confidence > 0
+            ORDER BY confidence ASC
+            LIMIT ?
+        """, (limit,))
 
-    files = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+        files = [dict(row) for row in cursor.fetchall()]
 
     return jsonify({'files': files})
 
@@ -232,13 +243,11 @@ def get_low_confidence():
 @app.route('/api/export')
 def export_data():
     """Export data as JSON"""
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT * FROM file_registry")
-    files = [dict(row) for row in cursor.fetchall()]
+    with get_pool().reader() as conn:
+        cursor = conn.cursor()
 
-    conn.close()
+        cursor.execute("SELECT * FROM file_registry")
+        files = [dict(row) for row in cursor.fetchall()]
 
     # Create JSON file
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
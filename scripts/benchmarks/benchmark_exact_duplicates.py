@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Time exact-duplicate detection on a large synthetic session.
+
+Builds a scan database where a fraction of files are copies of each other
+(same size, quick hash and full hash) and some share only their size, then
+times:
+
+- the previous candidate lookup: GROUP_CONCAT of file IDs per size +
+  extension, then one query per file ID
+- Analyzer._find_exact_duplicates, which finds size and quick-hash
+  collisions in SQL and writes groups in bulk
+
+Full hashes are stored up front (as if from the hash cache), so no file is
+read and the timings cover the database work only.
+
+Measured with the defaults (1,000,000 files; 1 vCPU, 5 GB RAM, temp dir on
+local disk):
+    previous per-file lookups    4.0s   0 groups (file IDs were looked up as
+                                        quick hashes, so nothing ever matched)
+    set-based detection         16.0s   89,518 groups, 100,172 duplicate files
+The previous figure is only the cost of its two queries per file. It never
+reached hashing or group writes, so it is not a like-for-like speedup.
+
+Usage:
+    python scripts/benchmarks/benchmark_exact_duplicates.py --files 1000000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from cognisys.core.analyzer import Analyzer
+from cognisys.models.database import Database
+
+
+def build_database(db_path: Path, files: int, duplicate_rate: float, size_collision_rate: float) -> str:
+    """Insert one session of files; returns its session ID."""
+    rng = random.Random(11)
+    db = Database(str(db_path), {'profile': 'performance'})
+    session_id = 'bench-session'
+    db.conn.execute("""
+        INSERT INTO scan_sessions (session_id, started_at, root_paths, status)
+        VALUES (?, '2024-01-01', '["/data"]', 'completed')
+    """, (session_id,))
+
+    rows = []
+    originals = []
+    for i in range(files):
+        roll = rng.random()
+        if originals and roll < duplicate_rate:
+            size, content = rng.choice(originals)           # exact copy
+        elif originals and roll < duplicate_rate + size_collision_rate:
+            size, content = rng.choice(originals)[0], i     # same size, different content
+        else:
+            size, content = rng.randint(1024, 10 ** 9), i
+            originals.append((size, content))
+        rows.append((f"f{i:07d}", f"/data/dir_{i // 200:05d}/file_{i:07d}.bin", f"file_{i:07d}.bin",
+                     size, f"2024-01-{i % 28 + 1:02d}", f"q{content:031x}", f"h{content:063x}", session_id))
+
+    db.conn.executemany("""
+        INSERT INTO files (file_id, path, name, extension, size_bytes, modified_at,
+                           hash_quick, hash_full, access_count, scan_session_id)
+        VALUES (?, ?, ?, '.bin', ?, ?, ?, ?, 0, ?)
+    """, rows)
+    db.conn.commit()
+    db.analyze()
+    db.close()
+    return session_id
+
+
+def time_previous_lookup(db: Database, session_id: str) -> float:
+    """Seconds for the per-file lookups of the previous implementation."""
+    start = time.perf_counter()
+    for candidate_group in db.get_duplicate_candidates(session_id):
+        if candidate_group['size_bytes'] < 1024:
+            continue
+        file_ids = candidate_group['file_ids'].split(',')
+        [db.get_files_by_hash(fid)[0] if db.get_files_by_hash(fid) else None for fid in file_ids]
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark exact duplicate detection')
+    parser.add_argument('--files', type=int, default=1000000, help='Files in the session')
+    parser.add_argument('--duplicate-rate', type=float, default=0.1, help='Fraction of files that are copies')
+    parser.add_argument('--size-collision-rate', type=float, default=0.05,
+                        help='Fraction of files sharing a size but not content')
+    parser.add_argument('--skip-previous', action='store_true', help='Do not time the previous lookup')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='cognisys-bench-') as tmpdir:
+        db_path = Path(tmpdir) / 'bench.db'
+        print(f"Building a session of {args.files:,} files ...")
+        session_id = build_database(db_path, args.files, args.duplicate_rate, args.size_collision_rate)
+
+        db = Database(str(db_path), {'profile': 'performance'})
+        if not args.skip_previous:
+            print(f"Previous per-file lookups:  {time_previous_lookup(db, session_id):8.1f}s")
+
+        analyzer = Analyzer(db, {'deduplication': {'exact_match': {'hash_cache': {'enabled': False}}}})
+        start = time.perf_counter()
+        analyzer._find_exact_duplicates(session_id)
+        elapsed = time.perf_counter() - start
+        stats = analyzer.get_stats()
+        print(f"Set-based detection:        {elapsed:8.1f}s "
+              f"({stats['duplicate_groups']:,} groups, {stats['duplicate_files']:,} duplicate files)")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
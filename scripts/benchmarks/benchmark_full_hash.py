@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark full-hash strategies (read / readinto / mmap) across buffer sizes.
+
+Usage:
+    python scripts/benchmarks/benchmark_full_hash.py --size-mb 512
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from cognisys.utils.hashing import hash_file
+
+
+def build_file(path: Path, size_mb: int):
+    """Write size_mb megabytes of random content to path."""
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(1_048_576))
+
+
+def run_hash(path: Path, strategy: str, buffer_size: int, repeat: int) -> float:
+    """Return the best wall-clock time over repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hash_file(path, strategy=strategy, buffer_size=buffer_size)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark full-hash strategies')
+    parser.add_argument('--size-mb', type=int, default=256, help='Size of the test file in MB')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per configuration (best is reported)')
+    parser.add_argument('--file', help='Existing file to hash instead of a generated one')
+    args = parser.parse_args()
+
+    if args.file:
+        path = Path(args.file)
+        cleanup = False
+    else:
+        fd, name = tempfile.mkstemp(prefix='cognisys-bench-', suffix='.bin')
+        os.close(fd)
+        path = Path(name)
+        cleanup = True
+        print(f"Building {args.size_mb} MB test file at {path} ...")
+        build_file(path, args.size_mb)
+
+    size_mb = path.stat().st_size / 1e6
+    try:
+        print(f"\n{'Strategy':<10} {'Buffer':>10} {'Seconds':>10} {'MB/sec':>10}")
+        print('=' * 43)
+        for strategy in ('read', 'readinto', 'mmap'):
+            for buffer_size in (65_536, 1_048_576, 4_194_304):
+                elapsed = run_hash(path, strategy, buffer_size, args.repeat)
+                print(f"{strategy:<10} {buffer_size // 1024:>8}KB {elapsed:>10.3f} "
+                      f"{size_mb / elapsed if elapsed > 0 else 0:>10.1f}")
+    finally:
+        if cleanup:
+            path.unlink()
+
+
+if __name__ == '__main__':
+    main()
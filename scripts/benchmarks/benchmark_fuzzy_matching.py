@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Time cross-folder fuzzy filename matching.
+
+Generates synthetic file rows whose names include copies, versions and
+typos of a shared vocabulary, then times:
+
+- the previous all-pairs loop: SequenceMatcher on every pair in a size
+  bucket, normalizing both names per pair
+- Analyzer._compare_filenames_optimized, which normalizes each name once
+  and verifies only candidate pairs from the bigram index
+
+The previous loop reports one group per matching pair; the analyzer
+merges pairs into one group per cluster. Groups are counted but not
+written, so the timings cover matching only.
+
+Usage:
+    python scripts/benchmarks/benchmark_fuzzy_matching.py --files 1000000 --skip-previous
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from cognisys.core.analyzer import Analyzer, FUZZY_MATCH_COLUMNS
+from cognisys.models.database import Database
+from cognisys.utils.naming import normalize_filename
+
+FileRow = namedtuple('FileRow', FUZZY_MATCH_COLUMNS)
+
+WORDS = ('report', 'invoice', 'budget', 'photo', 'holiday', 'meeting', 'notes', 'draft', 'summary',
+         'project', 'contract', 'scan', 'receipt', 'slides', 'plan', 'review', 'export', 'data')
+VARIANTS = ('', ' (1)', ' - Copy', '_v2', '_backup', '_final')
+
+
+def build_rows(files: int, size_buckets: int):
+    """Synthetic rows: about a third of names are variants of an earlier name."""
+    rng = random.Random(5)
+    rows = []
+    bases = []
+    for i in range(files):
+        if bases and rng.random() < 0.35:
+            base, size = rng.choice(bases)
+            stem = base + rng.choice(VARIANTS)
+            if rng.random() < 0.3:
+                pos = rng.randrange(len(stem))
+                stem = stem[:pos] + rng.choice('abcdefghijklmnopqrstuvwxyz') + stem[pos + 1:]
+        else:
+            base = '_'.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))) + f"_{rng.randint(1, 9999)}"
+            size = 1024 * rng.randrange(1, size_buckets + 1) + rng.randrange(512)
+            bases.append((base, size))
+            stem = base
+        rows.append(FileRow(f"f{i}", None, f"/data/dir_{i % 5000}/{stem}.pdf", f"{stem}.pdf", '.pdf',
+                            size, '2024-01-01', 0, 0))
+    return rows
+
+
+def previous_compare(files, threshold: float) -> int:
+    """The previous all-pairs loop; returns the number of matching pairs."""
+    size_groups = {}
+    for file in files:
+        size_groups.setdefault(file.size_bytes // 1024, []).append(file)
+
+    found = 0
+    for size_files in size_groups.values():
+        for i, file_a in enumerate(size_files):
+            for file_b in size_files[i + 1:]:
+                if abs(file_a.size_bytes - file_b.size_bytes) > file_a.size_bytes * 0.1:
+                    continue
+                norm_a = normalize_filename(file_a.name)
+                norm_b = normalize_filename(file_b.name)
+                if abs(len(norm_a) - len(norm_b)) > max(len(norm_a), len(norm_b)) * (1 - threshold):
+                    continue
+                if SequenceMatcher(None, norm_a, norm_b).ratio() >= threshold:
+                    found += 1
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fuzzy filename matching')
+    parser.add_argument('--files', type=int, default=50000, help='File rows to match')
+    parser.add_argument('--size-buckets', type=int, default=200, help='Distinct 1KB size buckets')
+    parser.add_argument('--threshold', type=float, default=0.85, help='Similarity threshold')
+    parser.add_argument('--skip-previous', action='store_true', help='Do not time the previous loop')
+    args = parser.parse_args()
+
+    rows = build_rows(args.files, args.size_buckets)
+    print(f"{len(rows):,} names in {args.size_buckets} size buckets")
+
+    if not args.skip_previous:
+        start = time.perf_counter()
+        found = previous_compare(rows, args.threshold)
+        print(f"Previous all-pairs loop: {time.perf_counter() - start:8.1f}s ({found:,} pairs)")
+
+    with tempfile.TemporaryDirectory(prefix='cognisys-bench-') as tmpdir:
+        db = Database(str(Path(tmpdir) / 'bench.db'))
+        analyzer = Analyzer(db, {'deduplication': {'group_batch_size': len(rows) ** 2 + 1}})
+        start = time.perf_counter()
+        analyzer._compare_filenames_optimized(rows, args.threshold)
+        elapsed = time.perf_counter() - start
+        print(f"Indexed matching:        {elapsed:8.1f}s ({analyzer.stats['duplicate_groups']:,} clusters, "
+              f"{analyzer.stats['duplicate_files']:,} duplicate files)")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
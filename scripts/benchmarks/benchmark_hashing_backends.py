@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark thread vs process hashing backends on a synthetic file tree.
+
+Usage:
+    python scripts/benchmarks/benchmark_hashing_backends.py --files 5000 --size-kb 64
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from cognisys.core.scanner import FileScanner
+from cognisys.models.database import Database
+
+
+def build_tree(root: Path, num_files: int, size_kb: int, files_per_dir: int = 100):
+    """Create num_files files of random content spread across subdirectories."""
+    for i in range(num_files):
+        folder = root / f"dir_{i // files_per_dir:04d}"
+        folder.mkdir(exist_ok=True)
+        (folder / f"file_{i:06d}.bin").write_bytes(os.urandom(size_kb * 1024))
+
+
+def run_scan(root: Path, backend: str, threads: int, chunk_size: int) -> dict:
+    """Scan the tree with the given backend and return timing results."""
+    with tempfile.TemporaryDirectory() as db_dir:
+        db = Database(str(Path(db_dir) / 'bench.db'))
+        config = {
+            'scanning': {
+                'performance': {
+                    'threads': threads,
+                    'batch_size': 1000,
+                    'hashing_backend': backend,
+                    'hash_chunk_size': chunk_size,
+                }
+            }
+        }
+        scanner = FileScanner(db, config)
+
+        start = time.perf_counter()
+        scanner.scan_roots([str(root)])
+        elapsed = time.perf_counter() - start
+        db.close()
+
+    stats = scanner.get_stats()
+    return {
+        'backend': backend,
+        'seconds': elapsed,
+        'files_per_sec': stats['files_scanned'] / elapsed if elapsed > 0 else 0,
+        'mb_per_sec': stats['total_size'] / 1e6 / elapsed if elapsed > 0 else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scanner hashing backends')
+    parser.add_argument('--files', type=int, default=5000, help='Number of synthetic files')
+    parser.add_argument('--size-kb', type=int, default=64, help='Size of each file in KB')
+    parser.add_argument('--threads', type=int, default=os.cpu_count() or 4, help='Scanner threads')
+    parser.add_argument('--chunk-size', type=int, default=64, help='Files per process-pool task')
+    parser.add_argument('--dir', help='Existing directory to build the tree in (default: temp dir)')
+    args = parser.parse_args()
+
+    root = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix='cognisys-bench-'))
+    try:
+        print(f"Building {args.files:,} files x {args.size_kb} KB in {root} ...")
+        build_tree(root, args.files, args.size_kb)
+
+        print(f"\n{'Backend':<10} {'Seconds':>10} {'Files/sec':>12} {'MB/sec':>10}")
+        print('=' * 45)
+        for backend in ('thread', 'process'):
+            result = run_scan(root, backend, args.threads, args.chunk_size)
+            print(f"{result['backend']:<10} {result['seconds']:>10.2f} "
+                  f"{result['files_per_sec']:>12,.0f} {result['mb_per_sec']:>10.1f}")
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
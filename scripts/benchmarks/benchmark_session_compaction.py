@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Measure files-table size and query latency before and after session compaction.
+
+Builds a scan database with many sessions of the same root, each changing a
+small fraction of files, times the per-session report queries on the newest
+session, then compacts (keeping --keep sessions in full) and times them again.
+
+Usage:
+    python scripts/benchmarks/benchmark_session_compaction.py --sessions 200 --files 10000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from cognisys.core.session_compactor import SessionCompactor
+from cognisys.models.database import Database
+
+
+def build_database(db_path: Path, sessions: int, files: int, change_rate: float) -> str:
+    """Insert sessions of the same root where change_rate of files change each scan."""
+    rng = random.Random(7)
+    db = Database(str(db_path), {'profile': 'performance'})
+    state = {f"/data/dir_{i // 100:04d}/file_{i:07d}.bin": (rng.randint(1, 10 ** 7), '2024-01-01')
+             for i in range(files)}
+
+    session_id = None
+    for n in range(sessions):
+        session_id = f"session-{n:04d}"
+        db.conn.execute("""
+            INSERT INTO scan_sessions (session_id, started_at, root_paths, status)
+            VALUES (?, ?, ?, 'completed')
+        """, (session_id, f"2024-01-01 00:00:{n:04d}", json.dumps(['/data'])))
+        for path in rng.sample(list(state), int(files * change_rate)):
+            state[path] = (rng.randint(1, 10 ** 7), f"2024-{n:04d}")
+        db.conn.executemany("""
+            INSERT INTO files (file_id, path, name, extension, size_bytes, modified_at,
+                               hash_quick, scan_session_id)
+            VALUES (?, ?, ?, '.bin', ?, ?, ?, ?)
+        """, [(str(uuid.uuid4()), path, path.rsplit('/', 1)[-1], size, modified,
+               f"{size:032x}", session_id) for path, (size, modified) in state.items()])
+        db.conn.commit()
+    db.analyze()
+    db.close()
+    return session_id
+
+
+def time_queries(db: Database, session_id: str, repeat: int = 5) -> float:
+    """Best-of-repeat milliseconds for the newest session's report queries."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db.get_overview_stats(session_id)
+        db.get_duplicate_candidates(session_id)
+        db.get_largest_files(session_id)
+        db.get_file_type_distribution(session_id)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def describe(db: Database, db_path: Path, label: str, session_id: str):
+    """Print row count, file size and query latency."""
+    rows = db.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    size_mb = db_path.stat().st_size / 1e6
+    print(f"{label:<18} {rows:>12,} {size_mb:>10.1f} {time_queries(db, session_id):>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark session compaction')
+    parser.add_argument('--sessions', type=int, default=200, help='Scans of the same root')
+    parser.add_argument('--files', type=int, default=10000, help='Files per scan')
+    parser.add_argument('--change-rate', type=float, default=0.01, help='Fraction of files changed per scan')
+    parser.add_argument('--keep', type=int, default=5, help='Sessions kept in full')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='cognisys-bench-') as tmpdir:
+        db_path = Path(tmpdir) / 'bench.db'
+        print(f"Building {args.sessions} sessions x {args.files:,} files ...")
+        newest = build_database(db_path, args.sessions, args.files, args.change_rate)
+
+        db = Database(str(db_path), {'profile': 'performance'})
+        print(f"\n{'':<18} {'File rows':>12} {'DB (MB)':>10} {'Queries (ms)':>12}")
+        print('=' * 56)
+        describe(db, db_path, 'Before', newest)
+
+        start = time.perf_counter()
+        stats = SessionCompactor(db).compact(keep=args.keep, vacuum=True)
+        elapsed = time.perf_counter() - start
+        describe(db, db_path, 'After compaction', newest)
+        db.close()
+
+        print(f"\nCompacted {stats['sessions_compacted']} sessions in {elapsed:.1f}s "
+              f"({stats['files_removed']:,} rows removed, {stats['files_kept']:,} kept)")
+
+
+if __name__ == '__main__':
+    main()
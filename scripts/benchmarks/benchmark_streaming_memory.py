@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Measure peak RSS of list-materialising vs streaming session reads.
+
+Builds a synthetic scan session, then runs each workload in its own
+subprocess so peak RSS is measured in isolation:
+    list-csv     get_files_by_session() + csv.DictWriter (previous CSV export)
+    stream-csv   Reporter._save_csv_exports() (iter_files_by_session)
+    fuzzy        Analyzer._find_fuzzy_duplicates() (streams folder by folder)
+
+Usage:
+    python scripts/benchmarks/benchmark_streaming_memory.py --files 1000000
+"""
+
+import argparse
+import csv
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from cognisys.models.database import Database, folder_id_for
+
+SESSION_ID = 'bench-session'
+WORKLOADS = ('list-csv', 'stream-csv', 'fuzzy')
+
+
+def build_database(db_path: Path, file_count: int, files_per_folder: int):
+    """Insert file_count synthetic files into one scan session."""
+    db = Database(str(db_path), {'profile': 'performance'})
+    db.conn.execute(
+        "INSERT INTO scan_sessions (session_id, status) VALUES (?, 'completed')", (SESSION_ID,)
+    )
+
+    batch = []
+    for i in range(file_count):
+        folder = f"/data/project_{i // files_per_folder:05d}"
+        name = f"document_{i % files_per_folder:04d}.pdf"
+        batch.append((
+            str(uuid.uuid4()), f"{folder}/{name}", folder_id_for(folder), name, '.pdf',
+            # Distinct KB size per file in a folder keeps fuzzy matching linear
+            4096 + (i % files_per_folder) * 2048, '2024-01-01T00:00:00', 'document',
+            f"{i:064x}", SESSION_ID
+        ))
+        if len(batch) == 50000:
+            _insert(db, batch)
+            batch = []
+    if batch:
+        _insert(db, batch)
+    db.close()
+
+
+def _insert(db: Database, rows):
+    db.conn.executemany("""
+        INSERT INTO files (file_id, path, parent_id, name, extension, size_bytes,
+                           modified_at, file_category, hash_quick, scan_session_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    db.conn.commit()
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process in MB.
+
+    Uses VmHWM on Linux, since ru_maxrss carries the parent's peak across exec.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_workload(db_path: str, workload: str, output_dir: str):
+    """Run one workload and print its peak RSS in MB."""
+    db = Database(db_path)
+    start = time.perf_counter()
+
+    if workload == 'list-csv':
+        files = db.get_files_by_session(SESSION_ID)
+        with open(Path(output_dir) / 'files_inventory.csv', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=files[0].keys())
+            writer.writeheader()
+            writer.writerows(files)
+    elif workload == 'stream-csv':
+        from cognisys.core.reporter import Reporter
+        Reporter(db, {})._save_csv_exports(SESSION_ID, Path(output_dir))
+    elif workload == 'fuzzy':
+        from cognisys.core.analyzer import Analyzer
+        analyzer = Analyzer(db, {'deduplication': {'exact_match': {'hash_cache': {'enabled': False}}}})
+        analyzer._find_fuzzy_duplicates(SESSION_ID)
+
+    elapsed = time.perf_counter() - start
+    print(f"{peak_rss_mb():.1f} {elapsed:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming vs list-materialising reads')
+    parser.add_argument('--files', type=int, default=1_000_000, help='Files in the synthetic session')
+    parser.add_argument('--files-per-folder', type=int, default=200, help='Files per synthetic folder')
+    parser.add_argument('--db', help='Benchmark database to reuse (built there if missing)')
+    parser.add_argument('--worker', choices=WORKLOADS, help=argparse.SUPPRESS)
+    parser.add_argument('--output-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_workload(args.db, args.worker, args.output_dir)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='cognisys-bench-') as tmpdir:
+        db_path = Path(args.db) if args.db else Path(tmpdir) / 'bench.db'
+        if not db_path.exists():
+            print(f"Building session with {args.files:,} files at {db_path} ...")
+            build_database(db_path, args.files, args.files_per_folder)
+
+        print(f"\n{'Workload':<12} {'Peak RSS (MB)':>14} {'Seconds':>10}")
+        print('=' * 38)
+        for workload in WORKLOADS:
+            result = subprocess.run(
+                [sys.executable, __file__, '--worker', workload, '--db', str(db_path),
+                 '--output-dir', tmpdir],
+                capture_output=True, text=True, check=True
+            )
+            peak_mb, seconds = result.stdout.split()[-2:]
+            print(f"{workload:<12} {float(peak_mb):>14.1f} {float(seconds):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
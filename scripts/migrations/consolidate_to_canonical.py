@@ -12,7 +12,6 @@ Features:
 """
 
 import sqlite3
-import hashlib
 import shutil
 import json
 from pathlib import Path
@@ -24,6 +23,8 @@ import sys
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from cognisys.utils.hash_cache import HashCache
+
 # Load config
 CONFIG_PATH = PROJECT_ROOT / ".cognisys" / "config.yml"
 with open(CONFIG_PATH) as f:
@@ -31,17 +32,12 @@ with open(CONFIG_PATH) as f:
 
 DB_PATH = PROJECT_ROOT / config['cognisys']['database']
 CANONICAL_ROOT = Path(config['cognisys']['canonical_root'])
+HASH_CACHE = HashCache(PROJECT_ROOT / config['cognisys'].get('hash_cache', 'db/hash_cache.db'))
 
 
 def compute_hash(filepath):
-    """Compute SHA-256 hash of file"""
-    sha256 = hashlib.sha256()
-
-    with open(filepath, 'rb') as f:
-        while chunk := f.read(8192):
-            sha256.update(chunk)
-
-    return sha256.hexdigest()
+    """Compute SHA-256 hash of file, reusing hashes cached by earlier scans"""
+    return HASH_CACHE.hash_file(filepath)
 
 
 def scan_directory(directory, source_priority=50):
@@ -201,6 +197,8 @@ def consolidate_to_canonical(dry_run=True):
         print(f"    Found: {len(files)} files")
 
     print(f"\nTotal files scanned: {len(all_files)}")
+    cache_stats = HASH_CACHE.get_stats()
+    print(f"  Hash cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
 
     # Step 2: Detect duplicates
     print("\nStep 2: Detecting duplicates...")
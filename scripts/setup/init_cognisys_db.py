@@ -10,165 +10,18 @@ from pathlib import Path
 from datetime import datetime
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from cognisys.models.schema import REGISTRY_MIGRATIONS, SchemaMigrator
+
 COGNISYS_DIR = PROJECT_ROOT / ".cognisys"
 DB_PATH = COGNISYS_DIR / "file_registry.db"
 
 
 def create_schema(conn):
     """Create complete CogniSys database schema"""
-    cursor = conn.cursor()
-
-    # File provenance and current state
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS file_registry (
-            file_id INTEGER PRIMARY KEY AUTOINCREMENT,
-
-            -- Provenance
-            original_path TEXT NOT NULL,
-            drop_timestamp TEXT NOT NULL,
-            content_hash TEXT NOT NULL,
-            file_size INTEGER,
-
-            -- Current canonical location
-            canonical_path TEXT,
-            canonical_state TEXT DEFAULT 'pending',  -- 'pending', 'classified', 'organized', 'review'
-
-            -- Classification
-            document_type TEXT,
-            confidence REAL,
-            classification_method TEXT,  -- 'ml_model', 'keyword', 'manual', 'pattern'
-
-            -- Metadata (JSON blob)
-            extracted_metadata TEXT,  -- JSON: {invoice_numbers, vins, dates, etc.}
-
-            -- Move history tracking
-            move_count INTEGER DEFAULT 0,
-            last_moved TEXT,
-
-            -- Flags
-            requires_review INTEGER DEFAULT 0,  -- Boolean: needs manual review
-            is_duplicate INTEGER DEFAULT 0,     -- Boolean: duplicate of another file
-            duplicate_of INTEGER,               -- Foreign key to original file_id
-            is_missing INTEGER DEFAULT 0,       -- Boolean: file not found on disk
-
-            -- Timestamps
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-
-            FOREIGN KEY (duplicate_of) REFERENCES file_registry(file_id)
-        )
-    """)
-
-    # Create indexes for fast lookups
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_content_hash
-        ON file_registry(content_hash)
-    """)
-
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_canonical_path
-        ON file_registry(canonical_path)
-    """)
-
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_document_type
-        ON file_registry(document_type)
-    """)
-
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_canonical_state
-        ON file_registry(canonical_state)
-    """)
-
-    # Move history log
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS move_history (
-            move_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            file_id INTEGER NOT NULL,
-            from_path TEXT NOT NULL,
-            to_path TEXT NOT NULL,
-            move_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-            reason TEXT,           -- 'initial_classification', 'reclassification', 'manual_override', 'rule_update'
-            rule_applied TEXT,     -- Which rule triggered this move
-
-            FOREIGN KEY (file_id) REFERENCES file_registry(file_id)
-        )
-    """)
-
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_move_file_id
-        ON move_history(file_id)
-    """)
-
-    # Classification rules (version-controlled)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS classification_rules (
-            rule_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            rule_name TEXT NOT NULL,
-            rule_version INTEGER NOT NULL,
-            rule_type TEXT NOT NULL,       -- 'pattern', 'keyword', 'ml_model'
-            rule_pattern TEXT,             -- Regex or keyword pattern
-            target_document_type TEXT,
-            target_path_template TEXT,     -- e.g., "Financial/{YYYY}/{MM}/{invoice_id}_{original}"
-            priority INTEGER DEFAULT 100,
-            active INTEGER DEFAULT 1,      -- Boolean: rule is active
-            created_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-
-            UNIQUE(rule_name, rule_version)
-        )
-    """)
-
-    # Manual corrections (for accuracy tracking)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS manual_corrections (
-            correction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            file_id INTEGER NOT NULL,
-            wrong_type TEXT,               -- What CogniSys classified it as
-            correct_type TEXT,             -- What user corrected it to
-            correction_reason TEXT,        -- Why user made this correction
-            correction_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-            corrected_by TEXT,             -- Username (optional)
-
-            FOREIGN KEY (file_id) REFERENCES file_registry(file_id)
-        )
-    """)
-
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_correction_file_id
-        ON manual_corrections(file_id)
-    """)
-
-    # Metrics snapshots (daily)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS metrics_snapshots (
-            snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            snapshot_date TEXT NOT NULL,
-            metric_type TEXT NOT NULL,     -- 'accuracy', 'stability', 'duplication', etc.
-            metric_value REAL,
-            metric_data TEXT,              -- JSON blob with detailed data
-            created_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-
-            UNIQUE(snapshot_date, metric_type)
-        )
-    """)
-
-    # Schema metadata
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS schema_info (
-            schema_version INTEGER PRIMARY KEY,
-            applied_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            description TEXT
-        )
-    """)
-
-    # Insert schema version
-    cursor.execute("""
-        INSERT OR IGNORE INTO schema_info (schema_version, description)
-        VALUES (1, 'Initial schema - file provenance and accuracy tracking')
-    """)
-
-    conn.commit()
-    print("[OK] Database schema created successfully")
+    applied = SchemaMigrator(conn, REGISTRY_MIGRATIONS).migrate()
+    print(f"[OK] Database schema created successfully (migrations: {applied})")
 
 
 def insert_default_rules(conn):
@@ -261,7 +114,10 @@ def verify_database(conn):
         'classification_rules',
         'manual_corrections',
         'metrics_snapshots',
-        'schema_info'
+        'schema_info',
+        'sources',
+        'cloud_providers',
+        'scan_history'
     ]
 
     missing = set(expected_tables) - set(tables)
@@ -270,9 +126,14 @@ def verify_database(conn):
         return False
 
     # Check schema version
-    cursor.execute("SELECT schema_version, description FROM schema_info")
+    cursor.execute("SELECT schema_version, description FROM schema_info ORDER BY schema_version DESC")
     version, description = cursor.fetchone()
 
+    cursor.execute("PRAGMA user_version")
+    if cursor.fetchone()[0] != version:
+        print(f"[FAIL] user_version does not match schema_info version {version}")
+        return False
+
     print(f"\n[OK] Database verified successfully")
     print(f"  Schema version: {version}")
     print(f"  Description: {description}")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Audit query plans of the analyzer, migrator, reporter and dashboard queries.
+
+Runs EXPLAIN QUERY PLAN for every query in cognisys.models.query_audit
+against a scan database and a file registry, flags full table scans and
+lists temp B-trees and redundant indexes. Without --db/--registry, sample
+databases with several scan sessions are built and ANALYZEd first so the
+planner sees realistic statistics.
+
+Usage:
+    python scripts/validation/audit_query_plans.py
+    python scripts/validation/audit_query_plans.py --db db/cognisys.db --registry .cognisys/file_registry.db
+    python scripts/validation/audit_query_plans.py --schema-version 4 --registry-version 3   # before the query indexes
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from cognisys.models.database import folder_id_for
+from cognisys.models.query_audit import (
+    REGISTRY_QUERIES, SAMPLE_PLAN, SAMPLE_SESSION, SCAN_QUERIES,
+    audit_queries, format_report, redundant_indexes
+)
+from cognisys.models.schema import (
+    REGISTRY_MIGRATIONS, SCAN_MIGRATIONS, SchemaMigrator, register_functions
+)
+
+CATEGORIES = [('document', 'pdf', '.pdf'), ('document', 'word', '.docx'),
+              ('image', 'photo', '.jpg'), ('code', 'python', '.py'),
+              ('archive', 'zip', '.zip'), ('temp', 'backup', '.bak')]
+
+
+def build_sample_scan_db(db_path: Path, sessions: int, files_per_session: int,
+                         schema_version: int = None):
+    """Create a scan database with several sessions of synthetic files."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(str(db_path))
+    register_functions(conn)
+    SchemaMigrator(conn, SCAN_MIGRATIONS).migrate(schema_version)
+
+    session_ids = [f"session-{i}" for i in range(sessions - 1)] + [SAMPLE_SESSION]
+    for session_id in session_ids:
+        conn.execute("INSERT INTO scan_sessions (session_id, started_at, status) VALUES (?, datetime('now'), 'completed')",
+                     (session_id,))
+        root = f"/data/{session_id}"
+        folders, files = {root: folder_id_for(root)}, []
+        for i in range(files_per_session):
+            folder = f"{root}/project_{i // 50:04d}"
+            folders[folder] = folder_id_for(folder)
+            category, subcategory, ext = CATEGORIES[i % len(CATEGORIES)]
+            files.append((
+                str(uuid.uuid4()), f"{folder}/file_{i:06d}{ext}", folders[folder],
+                f"file_{i:06d}{ext}", ext, rng.randint(0, 50) * 4096 or 1,
+                f"20{rng.randint(10, 24)}-{rng.randint(1, 12):02d}-01", category, subcategory,
+                rng.random() < 0.05, rng.random() < 0.1, f"{rng.getrandbits(60):032x}", session_id
+            ))
+        conn.executemany("""
+            INSERT INTO folders (folder_id, path, parent_id, name, depth, total_size, scan_session_id)
+            VALUES (?, ?, ?, ?, ?, 0, ?)
+        """, [(fid, path, folders.get(str(Path(path).parent)), Path(path).name, path.count('/'),
+               session_id) for path, fid in folders.items()])
+        conn.executemany("""
+            INSERT INTO files (file_id, path, parent_id, name, extension, size_bytes, created_at,
+                               file_category, file_subcategory, is_orphaned, is_duplicate,
+                               hash_quick, scan_session_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, files)
+
+        duplicates = [f for f in files if f[10]]
+        for a, b in zip(duplicates[::2], duplicates[1::2]):
+            group_id = f"dup-{uuid.uuid4().hex[:8]}"
+            conn.execute("""
+                INSERT INTO duplicate_groups (group_id, canonical_file, member_count, total_size,
+                                              similarity_type)
+                VALUES (?, ?, 2, ?, 'exact')
+            """, (group_id, a[0], a[5]))
+            conn.executemany("INSERT INTO duplicate_members (group_id, file_id) VALUES (?, ?)",
+                             [(group_id, a[0]), (group_id, b[0])])
+        conn.executemany("""
+            INSERT INTO ml_classifications (classification_id, file_id, model_name,
+                                            predicted_category, confidence, session_id)
+            VALUES (?, ?, 'distilbert_v2', ?, ?, ?)
+        """, [(str(uuid.uuid4()), f[0], f[7], rng.random(), session_id) for f in files[::10]])
+
+    conn.execute("INSERT INTO migration_plans (plan_id, session_id, status) VALUES (?, ?, 'draft')",
+                 (SAMPLE_PLAN, SAMPLE_SESSION))
+    conn.executemany("""
+        INSERT INTO migration_actions (action_id, plan_id, source_path, action_type, file_size)
+        VALUES (?, ?, ?, 'move', 0)
+    """, [(str(uuid.uuid4()), plan, f"/src/{i}")
+          for i in range(files_per_session)
+          for plan in (SAMPLE_PLAN, f"plan-{i % 20}")])
+
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.commit()
+    return conn
+
+
+def build_sample_registry_db(db_path: Path, rows: int, schema_version: int = None):
+    """Create a file registry with synthetic classified files."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(str(db_path))
+    SchemaMigrator(conn, REGISTRY_MIGRATIONS).migrate(schema_version)
+
+    types = ['financial_invoice', 'hr_resume', 'tax_document', 'automotive_technical', None]
+    states = ['pending', 'classified', 'organized', 'review']
+    conn.executemany("""
+        INSERT INTO file_registry (original_path, drop_timestamp, content_hash, document_type,
+                                   canonical_state, confidence, classification_method, is_duplicate)
+        VALUES (?, datetime('now'), ?, ?, ?, ?, ?, ?)
+    """, [(f"/inbox/doc_{i}.pdf", uuid.uuid4().hex, rng.choice(types), rng.choice(states),
+           rng.random(), rng.choice(['ml_model', 'pattern', 'manual']), rng.random() < 0.05)
+          for i in range(rows)])
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.commit()
+    return conn
+
+
+def open_existing(db_path: str) -> sqlite3.Connection:
+    """Open an existing database read-only so the audit never migrates or writes it."""
+    return sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EXPLAIN QUERY PLAN audit of hot queries')
+    parser.add_argument('--db', help='Existing scan database to audit (default: build a sample)')
+    parser.add_argument('--registry', help='Existing file registry to audit (default: build a sample)')
+    parser.add_argument('--sessions', type=int, default=20, help='Scan sessions in the sample database')
+    parser.add_argument('--files', type=int, default=5000, help='Files per sample session')
+    parser.add_argument('--schema-version', type=int,
+                        help='Build the sample scan database at this schema version')
+    parser.add_argument('--registry-version', type=int,
+                        help='Build the sample file registry at this schema version')
+    parser.add_argument('--strict', action='store_true',
+                        help='Exit with status 1 if any query has an unexpected full scan')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='cognisys-audit-') as tmpdir:
+        if args.db:
+            scan_conn = open_existing(args.db)
+        else:
+            print(f"Building sample scan database ({args.sessions} x {args.files:,} files) ...")
+            scan_conn = build_sample_scan_db(Path(tmpdir) / 'scan.db', args.sessions,
+                                             args.files, args.schema_version)
+        if args.registry:
+            registry_conn = open_existing(args.registry)
+        else:
+            registry_conn = build_sample_registry_db(Path(tmpdir) / 'registry.db',
+                                                     args.sessions * args.files, args.registry_version)
+
+        flagged = 0
+        for title, conn, queries in (('Scan database', scan_conn, SCAN_QUERIES),
+                                     ('File registry', registry_conn, REGISTRY_QUERIES)):
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            results = audit_queries(conn, queries)
+            flagged += sum(1 for r in results if r.flagged)
+            print()
+            print(format_report(f"{title} (schema version {version})", results,
+                                redundant_indexes(conn)))
+            conn.close()
+
+    if args.strict and flagged:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -52,13 +52,15 @@ def test_phase3_pipeline(dry_run=True):
 
     db_path = PROJECT_ROOT / config['cognisys']['database']
     drop_dir = Path(config['cognisys']['drop_directory'])
+    hash_cache_path = PROJECT_ROOT / config['cognisys'].get('hash_cache', 'db/hash_cache.db')
 
     # Step 1: Register files from drop directory
     logger.info("STEP 1: Registering files from drop directory")
     logger.info("-"*80)
 
     try:
-        register_stats = register_files_from_drop(drop_dir, db_path, dry_run=dry_run)
+        register_stats = register_files_from_drop(drop_dir, db_path, dry_run=dry_run,
+                                                  hash_cache_config={'path': hash_cache_path})
         logger.info(f"Registration complete: {register_stats['registered']} new files")
     except Exception as e:
         logger.error(f"Registration failed: {e}")
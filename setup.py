@@ -33,6 +33,7 @@ setup(
             'Pillow>=10.0.0',
             'matplotlib>=3.5.0',
             'pandas>=2.0.0',
+            'xxhash>=3.0.0',
         ],
     },
     entry_points={
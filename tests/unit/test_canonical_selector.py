@@ -0,0 +1,113 @@
+"""
+Unit Tests for canonical file selection
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+
+from cognisys.core.canonical_selector import (
+    DEFAULT_RULE_WEIGHTS,
+    CanonicalSelector,
+    parse_rule_weights,
+)
+
+
+def make_file(file_id, path, modified_at=datetime(2024, 1, 1), access_count=0):
+    return {
+        'file_id': file_id,
+        'path': path,
+        'name': path.rsplit('/', 1)[-1],
+        'size_bytes': 1000,
+        'modified_at': modified_at,
+        'access_count': access_count
+    }
+
+
+def random_groups(seed, count):
+    rng = random.Random(seed)
+    names = ['report.pdf', 'report (1).pdf', 'report - Copy.pdf', 'untitled.pdf', 'budget_backup.xlsx']
+    groups = []
+    for g in range(count):
+        groups.append([
+            make_file(f'{g}-{i}',
+                      '/' + '/'.join(rng.choice(['Work', 'Canonical', 'tmp', 'a']) for _ in range(rng.randint(0, 12)))
+                      + '/' + rng.choice(names),
+                      datetime(2024, 1, rng.randint(1, 3)),
+                      rng.choice([0, 0, 3, 40]))
+            for i in range(rng.randint(2, 6))
+        ])
+    return groups
+
+
+class TestRuleWeights:
+    """Test parsing of canonical_selection.priorities"""
+
+    def test_weighted_rules(self):
+        """Listed rules use their configured weights; unlisted rules are off"""
+        weights = parse_rule_weights([{'rule': 'preferred_path', 'weight': 50}, 'newest_modified'])
+        assert weights == {'preferred_path': 50, 'newest_modified': 10}
+
+    def test_unknown_rules_fall_back_to_defaults(self):
+        """Without any known rule every rule applies with its default weight"""
+        assert parse_rule_weights(['modified_date', 'path_depth']) == DEFAULT_RULE_WEIGHTS
+        assert parse_rule_weights(None) == DEFAULT_RULE_WEIGHTS
+
+
+class TestCanonicalSelector:
+    """Test group scoring and winner selection"""
+
+    def test_default_scores(self):
+        """Scores follow the documented default rules"""
+        files = [
+            make_file('old', '/Canonical/report.pdf', datetime(2023, 1, 1), access_count=3),
+            make_file('new', '/a/b/report (1).pdf', datetime(2024, 1, 1)),
+        ]
+        canonical = CanonicalSelector(preferred_paths=['Canonical']).select(files)
+
+        assert canonical['file_id'] == 'old'
+        # preferred 20 + shorter 10-2 + descriptive 5 + access 3
+        assert files[0]['_priority_score'] == 36
+        # newest 10 + shorter 10-3
+        assert files[1]['_priority_score'] == 17
+
+    def test_weights_change_the_winner(self):
+        """A heavier newest_modified weight should outrank the preferred path"""
+        files = [
+            make_file('preferred', '/Canonical/report.pdf', datetime(2023, 1, 1)),
+            make_file('newest', '/other/report.pdf', datetime(2024, 1, 1)),
+        ]
+        selector = CanonicalSelector([{'rule': 'newest_modified', 'weight': 100},
+                                      {'rule': 'preferred_path', 'weight': 20}], ['Canonical'])
+        assert selector.select(files)['file_id'] == 'newest'
+
+    def test_first_file_wins_ties(self):
+        """Equal scores should keep the first file, like max()"""
+        files = [make_file('first', '/a/report.pdf'), make_file('second', '/b/report.pdf')]
+        assert CanonicalSelector().select(files)['file_id'] == 'first'
+
+    def test_select_many_matches_select(self):
+        """Scoring groups in bulk should match scoring them one at a time"""
+        bulk = random_groups(3, 50)
+        single = random_groups(3, 50)
+        selector = CanonicalSelector(preferred_paths=['Canonical', 'Work'], numpy_min_files=10 ** 9)
+
+        bulk_ids = [file['file_id'] for file in selector.select_many(bulk)]
+        single_ids = [selector.select(group)['file_id'] for group in single]
+
+        assert bulk_ids == single_ids
+        assert [[f['_priority_score'] for f in g] for g in bulk] == \
+               [[f['_priority_score'] for f in g] for g in single]
+
+    def test_numpy_scores_match_python(self):
+        """The NumPy path should give the same scores as the Python path"""
+        pytest.importorskip('numpy')
+        python_groups = random_groups(8, 200)
+        numpy_groups = random_groups(8, 200)
+
+        CanonicalSelector(preferred_paths=['Canonical'], numpy_min_files=10 ** 9).select_many(python_groups)
+        CanonicalSelector(preferred_paths=['Canonical'], numpy_min_files=1).select_many(numpy_groups)
+
+        assert [[f['_priority_score'] for f in g] for g in numpy_groups] == \
+               [[f['_priority_score'] for f in g] for g in python_groups]
@@ -0,0 +1,146 @@
+"""
+Unit Tests for the read-only connection pool
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from cognisys.models.connection_pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(temp_dir):
+    """Create a pool over a small database."""
+    db_path = temp_dir / "pool.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("INSERT INTO items (name) VALUES ('first')")
+    conn.commit()
+    conn.close()
+
+    pool = ConnectionPool(db_path, max_readers=2, timeout=1.0)
+    yield pool
+    pool.close()
+
+
+class TestConnectionPool:
+    """Test reader reuse, read-only enforcement, the writer and metrics"""
+
+    def test_reader_is_read_only(self, pool):
+        """Pooled read connections must reject writes"""
+        with pool.reader() as conn:
+            assert conn.execute("SELECT name FROM items").fetchone()[0] == 'first'
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO items (name) VALUES ('second')")
+
+    def test_reader_reused_across_threads(self, pool):
+        """Checked-in connections are handed out again, also to other threads"""
+        with pool.reader() as first:
+            pass
+        with pool.reader() as second:
+            pass
+        assert first is second
+
+        other = []
+
+        def borrow():
+            with pool.reader() as conn:
+                other.append(conn)
+
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        thread.join()
+
+        assert other[0] is first
+        assert pool.get_stats()['readers_opened'] == 1
+
+    def test_short_lived_threads_stay_within_max_readers(self, pool):
+        """One thread per request (as under Flask) must never open more than max_readers"""
+        barrier = threading.Barrier(4)
+        errors = []
+
+        def request():
+            try:
+                barrier.wait(timeout=1.0)
+                with pool.reader() as conn:
+                    conn.execute("SELECT name FROM items").fetchall()
+            except Exception as e:
+                errors.append(e)
+
+        for _ in range(10):
+            threads = [threading.Thread(target=request) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        stats = pool.get_stats()
+        assert errors == []
+        assert stats['reader_acquires'] == 40
+        assert stats['readers_opened'] <= pool.max_readers
+        assert stats['readers_open'] <= pool.max_readers
+        assert stats['readers_peak'] <= pool.max_readers
+
+    def test_writer_commits_and_rolls_back(self, pool):
+        """Writer blocks commit on success and roll back on error"""
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('second')")
+
+        with pytest.raises(RuntimeError):
+            with pool.writer() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('third')")
+                raise RuntimeError("abort")
+
+        with pool.reader() as conn:
+            names = [row[0] for row in conn.execute("SELECT name FROM items ORDER BY id")]
+        assert names == ['first', 'second']
+
+    def test_journal_mode_left_alone_unless_wal_requested(self, pool):
+        """Opening the writer must not switch the database to WAL unless asked"""
+        with pool.writer() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+
+        with ConnectionPool(pool.db_path, wal=True) as wal_pool:
+            with wal_pool.writer() as conn:
+                assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+    def test_metrics_track_readers_in_use(self, pool):
+        """Stats should report in-use and peak readers and time out when exhausted"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with pool.reader():
+                started.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        started.wait()
+
+        with pool.reader():
+            stats = pool.get_stats()
+            assert stats['readers_in_use'] == 2
+            with pytest.raises(TimeoutError):
+                with pool.reader():
+                    pass
+
+        release.set()
+        thread.join()
+
+        stats = pool.get_stats()
+        assert stats['readers_in_use'] == 0
+        assert stats['readers_peak'] == 2
+        assert stats['reader_acquires'] == 2
+        assert stats['reader_wait_time'] >= 0.0
+
+    def test_memory_database_rejected(self):
+        """An in-memory database cannot be shared through the pool"""
+        with pytest.raises(ValueError):
+            ConnectionPool(':memory:')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
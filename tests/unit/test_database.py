@@ -5,9 +5,14 @@ Tests SQLite operations and schema management
 
 import pytest
 import json
+import sqlite3
 from datetime import datetime
 
-from cognisys.models.database import Database
+from cognisys.core.reporter import Reporter
+from cognisys.models.database import Database, folder_id_for
+from cognisys.models.schema import (
+    SCAN_MIGRATIONS, Backfill, Migration, SchemaMigrator, register_functions
+)
 
 
 class TestDatabase:
@@ -72,6 +77,29 @@ class TestDatabase:
         assert files[0]['name'] == 'document.pdf'
         assert files[0]['size_bytes'] == 1024
 
+    def test_iter_files_by_session_streams_rows(self, temp_db):
+        """Streamed rows should be namedtuples, fetched in chunks and optionally ordered."""
+        session_id = temp_db.create_session(['/test'], {})
+        for i in range(5):
+            temp_db.insert_file({
+                'file_id': f'file-{i}',
+                'path': f'/test/file{4 - i}.txt',
+                'name': f'file{4 - i}.txt',
+                'size_bytes': i,
+                'scan_session_id': session_id
+            })
+
+        rows = list(temp_db.iter_files_by_session(
+            session_id, columns=('file_id', 'path', 'size_bytes'), order_by='path', chunk_size=2
+        ))
+
+        assert [row.path for row in rows] == [f'/test/file{i}.txt' for i in range(5)]
+        assert rows[0]._fields == ('file_id', 'path', 'size_bytes')
+        assert rows[0]._asdict() == {'file_id': 'file-4', 'path': '/test/file0.txt', 'size_bytes': 4}
+
+        with pytest.raises(ValueError):
+            temp_db.iter_files_by_session(session_id, columns=('path; DROP TABLE files',))
+
     def test_insert_folder(self, temp_db):
         """Should insert folder records."""
         session_id = temp_db.create_session(['/test'], {})
@@ -192,6 +220,45 @@ class TestDatabase:
         result = cursor.fetchone()
         assert result['is_duplicate'] == 1
 
+    def test_create_duplicate_groups_bulk(self, temp_db):
+        """Should write many groups in one call and return their IDs in order."""
+        session_id = temp_db.create_session(['/test'], {})
+        for i in range(6):
+            temp_db.insert_file({
+                'file_id': f'bulk-{i}',
+                'path': f'/test/bulk{i}.txt',
+                'name': f'bulk{i}.txt',
+                'extension': '.txt',
+                'size_bytes': 1000,
+                'scan_session_id': session_id
+            })
+
+        groups = [{
+            'canonical_file': f'bulk-{i}',
+            'member_count': 2,
+            'total_size': 1000,
+            'similarity_type': 'exact',
+            'detection_rule': 'exact',
+            'members': [
+                {'file_id': f'bulk-{i}', 'priority_score': 10, 'reason': 'Canonical copy'},
+                {'file_id': f'bulk-{i + 1}', 'priority_score': 5, 'reason': 'Duplicate'},
+            ]
+        } for i in range(0, 6, 2)]
+
+        group_ids = temp_db.create_duplicate_groups(groups)
+
+        assert len(set(group_ids)) == 3
+        cursor = temp_db.conn.cursor()
+        for i, group_id in enumerate(group_ids):
+            cursor.execute("SELECT canonical_file FROM duplicate_groups WHERE group_id = ?", (group_id,))
+            assert cursor.fetchone()['canonical_file'] == f'bulk-{i * 2}'
+            cursor.execute("SELECT COUNT(*) FROM duplicate_members WHERE group_id = ?", (group_id,))
+            assert cursor.fetchone()[0] == 2
+            cursor.execute("SELECT COUNT(*) FROM files WHERE duplicate_group = ?", (group_id,))
+            assert cursor.fetchone()[0] == 2
+
+        assert temp_db.create_duplicate_groups([]) == []
+
     def test_ml_classification_operations(self, temp_db):
         """Should handle ML classification records."""
         session_id = temp_db.create_session(['/test'], {})
@@ -274,5 +341,156 @@ class TestDatabase:
         assert stats['total_size'] == sum(100 * (i + 1) for i in range(10))
 
 
+
+class TestDatabaseTuning:
+    """Test pragma profiles and grouped transactions."""
+
+    def test_pragma_profile(self, temp_dir):
+        """The configured profile should be applied to the connection."""
+        db = Database(str(temp_dir / "tuned.db"), {'profile': 'balanced', 'pragmas': {'cache_size': -1000}})
+        try:
+            pragmas = db.get_pragmas()
+            assert pragmas['journal_mode'] == 'wal'
+            assert pragmas['synchronous'] == 1  # NORMAL
+            assert pragmas['cache_size'] == -1000
+        finally:
+            db.close()
+
+    def test_invalid_pragma_config(self, temp_dir):
+        """Unknown profiles, pragmas and values should be rejected."""
+        with pytest.raises(ValueError):
+            Database(str(temp_dir / "a.db"), {'profile': 'turbo'})
+        with pytest.raises(ValueError):
+            Database(str(temp_dir / "b.db"), {'pragmas': {'foreign_keys': 1}})
+        with pytest.raises(ValueError):
+            Database(str(temp_dir / "c.db"), {'pragmas': {'journal_mode': 'WAL; DROP TABLE files'}})
+
+    def _insert_file(self, db, file_id, session_id):
+        db.insert_file({
+            'file_id': file_id,
+            'path': f'/test/{file_id}.txt',
+            'name': f'{file_id}.txt',
+            'scan_session_id': session_id
+        })
+
+    def test_transaction_commits_once(self, temp_db):
+        """Helpers inside a transaction should be committed together."""
+        session_id = temp_db.create_session(['/test'], {})
+        with temp_db.transaction():
+            self._insert_file(temp_db, 'f1', session_id)
+            self._insert_file(temp_db, 'f2', session_id)
+            temp_db.update_file_hash('f1', 'full', 'abc')
+            assert temp_db.conn.in_transaction
+
+        assert not temp_db.conn.in_transaction
+        assert len(temp_db.get_files_by_session(session_id)) == 2
+
+    def test_transaction_rolls_back_on_error(self, temp_db):
+        """An exception inside a transaction should discard its writes."""
+        session_id = temp_db.create_session(['/test'], {})
+        with pytest.raises(RuntimeError):
+            with temp_db.transaction():
+                self._insert_file(temp_db, 'f1', session_id)
+                with temp_db.transaction():
+                    self._insert_file(temp_db, 'f2', session_id)
+                raise RuntimeError("abort")
+
+        assert temp_db.get_files_by_session(session_id) == []
+
+
+class TestSchemaMigrations:
+    """Test the user_version-driven migration runner."""
+
+    def test_new_database_at_latest_version(self, temp_db):
+        """A new database should be created at the latest scan schema version."""
+        version = temp_db.conn.execute("PRAGMA user_version").fetchone()[0]
+        assert version == SCAN_MIGRATIONS[-1].version
+        assert SchemaMigrator(temp_db.conn, SCAN_MIGRATIONS).pending() == []
+
+    def test_up_to_date_open_is_single_pragma(self, temp_dir):
+        """Opening an up-to-date database should only read user_version."""
+        db_path = temp_dir / "test.db"
+        Database(str(db_path)).close()
+
+        conn = sqlite3.connect(str(db_path))
+        statements = []
+        conn.set_trace_callback(statements.append)
+        assert SchemaMigrator(conn, SCAN_MIGRATIONS).migrate() == []
+        conn.close()
+
+        assert statements == ["PRAGMA user_version"]
+
+    def test_legacy_database_upgraded_with_backfill(self, temp_dir):
+        """A pre-versioning database should gain new columns and backfilled parent links."""
+        db_path = temp_dir / "legacy.db"
+        conn = sqlite3.connect(str(db_path))
+        # Baseline schema as created before schema versioning
+        SchemaMigrator(conn, SCAN_MIGRATIONS).migrate(target=1)
+        conn.execute("PRAGMA user_version = 0")
+        conn.execute("""
+            INSERT INTO folders (folder_id, path, name, scan_session_id)
+            VALUES ('random-id', '/data', 'data', 's1')
+        """)
+        conn.executemany(
+            "INSERT INTO files (file_id, path, name, scan_session_id) VALUES (?, ?, ?, 's1')",
+            [(f'f{i}', f'/data/file{i}.txt', f'file{i}.txt') for i in range(5)]
+        )
+        conn.commit()
+
+        register_functions(conn)
+        applied = SchemaMigrator(conn, SCAN_MIGRATIONS, batch_size=2).migrate()
+        assert applied == [m.version for m in SCAN_MIGRATIONS]
+
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(files)")]
+        assert 'inode' in columns and 'hash_quick_algo' in columns
+
+        folder_id = folder_id_for('/data')
+        assert conn.execute("SELECT folder_id FROM folders").fetchone()[0] == folder_id
+        parents = {row[0] for row in conn.execute("SELECT parent_id FROM files")}
+        assert parents == {folder_id}
+        conn.close()
+
+    def test_pre_v4_sessions_get_folder_rollups(self, temp_dir):
+        """Upgrading a pre-v4 database should backfill folder rollups for existing sessions."""
+        db_path = temp_dir / "pre_v4.db"
+        conn = sqlite3.connect(str(db_path))
+        SchemaMigrator(conn, SCAN_MIGRATIONS).migrate(target=3)
+        conn.executemany("""
+            INSERT INTO folders (folder_id, path, name, depth, total_size, file_count, scan_session_id)
+            VALUES (?, ?, ?, ?, 0, 0, 's1')
+        """, [('id-data', '/data', 'data', 1), ('id-sub', '/data/sub', 'sub', 2)])
+        conn.executemany("""
+            INSERT INTO files (file_id, path, name, size_bytes, scan_session_id)
+            VALUES (?, ?, ?, ?, 's1')
+        """, [('f1', '/data/a.bin', 'a.bin', 2_000_000_000),
+              ('f2', '/data/sub/b.bin', 'b.bin', 1_000_000_000),
+              ('f3', '/data/sub/c.bin', 'c.bin', 500_000_000)])
+        conn.commit()
+        conn.close()
+
+        db = Database(str(db_path))
+        largest = Reporter(db, {})._get_largest_folders('s1')
+        db.close()
+
+        assert largest == [
+            {'path': '/data', 'file_count': 3, 'size_gb': 3.5},
+            {'path': '/data/sub', 'file_count': 2, 'size_gb': 1.5},
+        ]
+
+    def test_failed_backfill_leaves_version_pending(self, temp_dir):
+        """The version should only be bumped once every backfill has finished."""
+        conn = sqlite3.connect(str(temp_dir / "test.db"))
+        migrations = [
+            Migration(1, "Create table", lambda c: c.execute("CREATE TABLE IF NOT EXISTS t (x INTEGER)"), [
+                Backfill("Broken backfill", "UPDATE missing_table SET x = 1 LIMIT ?"),
+            ]),
+        ]
+
+        with pytest.raises(sqlite3.OperationalError):
+            SchemaMigrator(conn, migrations).migrate()
+
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+        conn.close()
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,124 @@
+"""
+Unit Tests for the persistent hash cache
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from cognisys.commands.register import register_files_from_drop
+from cognisys.core.scanner import FileScanner
+from cognisys.models.schema import REGISTRY_MIGRATIONS, migrate_database
+from cognisys.utils.hash_cache import HashCache, cache_key, quick_hash_cache_algorithm
+
+
+@pytest.fixture
+def cache(temp_dir):
+    """Create a temporary hash cache."""
+    cache = HashCache(temp_dir / "cache" / "hash_cache.db")
+    yield cache
+    cache.close()
+
+
+class TestHashCache:
+    """Test hash cache lookups, invalidation and eviction"""
+
+    def test_hash_file_hits_on_second_call(self, cache, temp_dir):
+        """The second hash of an unchanged file should come from the cache"""
+        path = temp_dir / "data.bin"
+        path.write_bytes(b"cached content")
+
+        first = cache.hash_file(path)
+        second = cache.hash_file(path)
+
+        assert first == second == hashlib.sha256(b"cached content").hexdigest()
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_modified_file_is_rehashed(self, cache, temp_dir):
+        """A changed size or mtime should invalidate the cached digest"""
+        path = temp_dir / "data.bin"
+        path.write_bytes(b"version one")
+        cache.hash_file(path)
+
+        path.write_bytes(b"version two!")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.hash_file(path) == hashlib.sha256(b"version two!").hexdigest()
+        assert cache.get_stats()['hits'] == 0
+
+    def test_persists_across_instances(self, temp_dir):
+        """Entries should survive reopening the cache file"""
+        path = temp_dir / "data.bin"
+        path.write_bytes(b"persistent")
+        cache_path = temp_dir / "hash_cache.db"
+
+        first = HashCache(cache_path)
+        first.hash_file(path)
+        first.close()
+
+        second = HashCache(cache_path)
+        try:
+            assert second.get(cache_key(path.stat())) == hashlib.sha256(b"persistent").hexdigest()
+        finally:
+            second.close()
+
+    def test_algorithms_are_separate(self, cache, temp_dir):
+        """Quick hashes of large files must not be returned as full hashes"""
+        path = temp_dir / "data.bin"
+        path.write_bytes(b"x")
+        key = cache_key(path.stat())
+        cache.put(key, "quickdigest", quick_hash_cache_algorithm(2_000_000, 'sha256'))
+
+        assert cache.get(key) is None
+        assert quick_hash_cache_algorithm(1000, 'xxh64') == 'sha256'
+
+    def test_lru_eviction(self, temp_dir):
+        """Least recently used entries are evicted past max_entries"""
+        cache = HashCache(temp_dir / "hash_cache.db", max_entries=10)
+        try:
+            for inode in range(1, 12):
+                cache.put((1, inode, 100, 1), f"digest{inode}")
+            cache.get((1, 5, 100, 1))
+
+            assert cache.get_stats()['evictions'] > 0
+            assert cache.get((1, 1, 100, 1)) is None
+            assert cache.get((1, 11, 100, 1)) == "digest11"
+            assert cache.conn.execute("SELECT COUNT(*) FROM hash_cache").fetchone()[0] <= 10
+        finally:
+            cache.close()
+
+    def test_for_database_disabled(self, temp_dir):
+        """Disabling the cache in config should return None"""
+        assert HashCache.for_database(temp_dir / "test.db", {'enabled': False}) is None
+        assert HashCache.for_database(':memory:') is None
+
+    def test_register_hits_cache_populated_by_scan(self, temp_db, temp_dir, scanner_config):
+        """register should reuse hashes the scanner stored in the configured shared cache"""
+        cache_config = {'path': str(temp_dir / "shared" / "hash_cache.db")}
+        drop_dir = temp_dir / "drop"
+        drop_dir.mkdir()
+        for i in range(3):
+            (drop_dir / f"doc{i}.txt").write_text(f"document {i}")
+
+        scanner_config['scanning']['hashing']['cache'] = cache_config
+        scanner = FileScanner(temp_db, scanner_config)
+        scanner.scan_roots([str(drop_dir)])
+        scanner.hash_cache.close()
+
+        registry_path = temp_dir / "registry" / "file_registry.db"
+        registry_path.parent.mkdir()
+        migrate_database(registry_path, REGISTRY_MIGRATIONS)
+        stats = register_files_from_drop(drop_dir, registry_path, hash_cache_config=cache_config)
+
+        assert stats['registered'] == 3
+        assert stats['hash_cache']['hits'] == 3
+        assert stats['hash_cache']['misses'] == 0
+        assert not (registry_path.parent / "hash_cache.db").exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,72 @@
+"""
+Unit Tests for the per-device full hash scheduler
+"""
+
+import hashlib
+import os
+import threading
+
+from cognisys.utils.hashing import calculate_full_hash
+from cognisys.utils.hash_scheduler import FullHashScheduler, classify_device
+
+
+class TestFullHashScheduler:
+    """Test scheduling, ordering and error handling of full hashing"""
+
+    def test_hashes_files_by_key(self, temp_dir):
+        """Every readable file should be hashed and returned under its key"""
+        files = []
+        for i in range(10):
+            path = temp_dir / f"file{i}.bin"
+            path.write_bytes(b"content %d" % i)
+            files.append((f"id-{i}", str(path), path.stat().st_size))
+
+        scheduler = FullHashScheduler(calculate_full_hash, progress_interval=0)
+        digests = scheduler.hash_files(files)
+
+        assert digests == {f"id-{i}": hashlib.sha256(b"content %d" % i).hexdigest() for i in range(10)}
+        stats = scheduler.get_stats()
+        assert stats['files_hashed'] == 10
+        assert stats['bytes_hashed'] == sum(size for _, _, size in files)
+        assert stats['errors'] == 0
+
+    def test_missing_files_map_to_none(self, temp_dir):
+        """Files that vanished since the scan should not abort the batch"""
+        path = temp_dir / "present.bin"
+        path.write_bytes(b"here")
+        files = [('present', str(path), 4), ('missing', str(temp_dir / "gone.bin"), 4)]
+
+        scheduler = FullHashScheduler(calculate_full_hash)
+        digests = scheduler.hash_files(files)
+
+        assert digests['present'] == hashlib.sha256(b"here").hexdigest()
+        assert digests['missing'] is None
+        assert scheduler.get_stats()['errors'] == 1
+
+    def test_single_worker_reads_in_inode_order(self, temp_dir):
+        """A one-worker device should be read sequentially in inode order"""
+        paths = []
+        for i in range(8):
+            path = temp_dir / f"file{i}.bin"
+            path.write_bytes(b"x" * (i + 1))
+            paths.append(str(path))
+
+        order = []
+        threads = set()
+
+        def record(path):
+            order.append(path)
+            threads.add(threading.get_ident())
+            return 'digest'
+
+        kind = classify_device(os.stat(paths[0]).st_dev, paths[0])
+        scheduler = FullHashScheduler(record, device_workers={kind: 1})
+        scheduler.hash_files((path, path, 1) for path in reversed(paths))
+
+        assert order == sorted(paths, key=lambda p: (os.stat(p).st_ino, p))
+        assert len(threads) == 1
+
+    def test_classify_device(self, temp_dir):
+        """Local devices should classify as hdd or ssd"""
+        path = str(temp_dir)
+        assert classify_device(os.stat(path).st_dev, path) in ('hdd', 'ssd', 'network')
@@ -6,8 +6,25 @@ Tests progressive hashing strategy and hash calculations
 import pytest
 import tempfile
 import os
+import hashlib
+import zlib
 from pathlib import Path
-from cognisys.utils.hashing import calculate_quick_hash, calculate_full_hash, calculate_adaptive_hash
+from cognisys.utils.hashing import (
+    calculate_quick_hash,
+    calculate_full_hash,
+    calculate_adaptive_hash,
+    calculate_adaptive_hashes,
+    calculate_sampled_hash,
+    choose_buffer_size,
+    create_hashing_backend,
+    detect_storage_type,
+    hash_file,
+    progressive_full_hashes,
+    quick_hash_algorithm_for,
+    register_hash_algorithm,
+    resolve_hash_algorithm,
+    HASH_ALGORITHMS,
+)
 
 
 class TestHashing:
@@ -96,5 +113,221 @@ class TestHashing:
         assert result is None
 
 
+class TestHashingBackends:
+    """Test thread and process hashing backends"""
+
+    def test_adaptive_hashes_preserve_order(self, tmp_path):
+        """Chunked hashing should return results in input order"""
+        files = []
+        for i in range(3):
+            path = tmp_path / f"file{i}.txt"
+            path.write_text(f"content {i}")
+            files.append((str(path), path.stat().st_size))
+
+        results = calculate_adaptive_hashes(files)
+
+        assert results == [calculate_adaptive_hash(Path(p), size) for p, size in files]
+
+    def test_process_backend_matches_thread_backend(self, tmp_path):
+        """Process backend should compute the same hashes as the thread backend"""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"abc" * 1000)
+        files = [(str(path), path.stat().st_size)]
+
+        process_backend = create_hashing_backend('process', max_workers=1)
+        try:
+            assert process_backend.hash_many(files) == create_hashing_backend('thread').hash_many(files)
+        finally:
+            process_backend.close()
+
+    def test_unknown_backend(self):
+        """Unknown backend names should be rejected"""
+        with pytest.raises(ValueError):
+            create_hashing_backend('gpu')
+
+
+
+class TestHashAlgorithms:
+    """Test the quick hash algorithm registry"""
+
+    def test_stdlib_algorithms_registered(self):
+        """Stdlib algorithms should always be available"""
+        for name in ('sha256', 'blake2b', 'crc32'):
+            assert name in HASH_ALGORITHMS
+
+    def test_quick_hash_with_algorithm(self, tmp_path):
+        """Quick hash should use the requested algorithm"""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"quick hash content")
+
+        assert calculate_quick_hash(path, algorithm='crc32') == '%08x' % zlib.crc32(b"quick hash content")
+        assert calculate_quick_hash(path, algorithm='sha256') == calculate_full_hash(path)
+
+    def test_resolve_auto(self):
+        """'auto' should resolve to a registered algorithm"""
+        assert resolve_hash_algorithm('auto') in HASH_ALGORITHMS
+        with pytest.raises(ValueError):
+            resolve_hash_algorithm('md4-turbo')
+
+    def test_small_files_use_full_hash_algorithm(self):
+        """Small files are quick-hashed with the full hash algorithm"""
+        assert quick_hash_algorithm_for(1000, 'crc32') == 'sha256'
+        assert quick_hash_algorithm_for(2_000_000, 'crc32') == 'crc32'
+
+    def test_register_custom_algorithm(self, tmp_path):
+        """Custom algorithms can be registered"""
+        register_hash_algorithm('md5-test', hashlib.md5)
+        try:
+            path = tmp_path / "data.bin"
+            path.write_bytes(b"abc")
+            assert calculate_quick_hash(path, algorithm='md5-test') == hashlib.md5(b"abc").hexdigest()
+        finally:
+            HASH_ALGORITHMS.pop('md5-test')
+
+
+
+class TestSampledHash:
+    """Test sampled head/middle/tail quick hashing"""
+
+    def _write(self, path, middle_byte):
+        # Identical 1MB header, differing content further into the file
+        data = bytearray(b"H" * 1_048_576 + b"m" * 3_000_000)
+        data[2_500_000] = middle_byte
+        path.write_bytes(bytes(data))
+        return len(data)
+
+    def test_sampled_hash_separates_shared_headers(self, tmp_path):
+        """Files with identical headers but different middles should hash differently"""
+        a, b = tmp_path / "a.mp4", tmp_path / "b.mp4"
+        size = self._write(a, ord("A"))
+        self._write(b, ord("B"))
+
+        assert calculate_quick_hash(a) == calculate_quick_hash(b)
+        assert calculate_sampled_hash(a, size, window_size=65536, windows=64) != \
+            calculate_sampled_hash(b, size, window_size=65536, windows=64)
+
+    def test_sampled_hash_consistency(self, tmp_path):
+        """Identical files should have identical sampled hashes"""
+        a, b = tmp_path / "a.mp4", tmp_path / "b.mp4"
+        size = self._write(a, ord("A"))
+        self._write(b, ord("A"))
+
+        assert calculate_sampled_hash(a, size) == calculate_sampled_hash(b, size)
+
+    def test_sampled_hash_small_file_reads_everything(self, tmp_path):
+        """Files smaller than the sampled windows are hashed in full"""
+        a, b = tmp_path / "a.bin", tmp_path / "b.bin"
+        a.write_bytes(b"x" * 1000 + b"a")
+        b.write_bytes(b"x" * 1000 + b"b")
+
+        assert calculate_sampled_hash(a, 1001, window_size=100, windows=5) != \
+            calculate_sampled_hash(b, 1001, window_size=100, windows=5)
+
+    def test_sampled_algorithm_label(self):
+        """Sampled quick hashes are labelled with their window layout"""
+        assert quick_hash_algorithm_for(2_000_000, 'sha256', (1024, 4)) == 'sha256+sampled:4x1024'
+        assert quick_hash_algorithm_for(1000, 'sha256', (1024, 4)) == 'sha256'
+
+
+class TestFullHashEngine:
+    """Test the read/readinto/mmap full hash engine"""
+
+    def test_strategies_agree(self, tmp_path):
+        """Every strategy should produce the same SHA-256 digest"""
+        data = os.urandom(300_000)
+        path = tmp_path / "data.bin"
+        path.write_bytes(data)
+        expected = hashlib.sha256(data).hexdigest()
+
+        for strategy in ('read', 'readinto', 'mmap', 'auto'):
+            assert hash_file(path, strategy=strategy, buffer_size=65536) == expected
+
+    def test_empty_file(self, tmp_path):
+        """Empty files cannot be mmap'ed but should still hash"""
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+
+        assert hash_file(path, strategy='mmap') == hashlib.sha256(b"").hexdigest()
+
+    def test_unknown_strategy(self, tmp_path):
+        """Unknown strategies should be rejected"""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"abc")
+
+        with pytest.raises(ValueError):
+            hash_file(path, strategy='dma')
+
+    def test_missing_file_raises(self):
+        """hash_file raises where calculate_full_hash returns None"""
+        with pytest.raises(OSError):
+            hash_file("/nonexistent/file.txt")
+
+    def test_buffer_sizing(self):
+        """Network storage gets larger buffers; small files get smaller ones"""
+        assert choose_buffer_size(10_000_000, 'network') > choose_buffer_size(10_000_000, 'local')
+        assert choose_buffer_size(100) == 65536
+        assert detect_storage_type("\\\\server\\share\\file.txt") == 'network'
+
+
+
+class TestProgressiveComparison:
+    """Test lockstep block comparison of duplicate candidates"""
+
+    def test_identical_files_get_full_hashes(self, tmp_path):
+        """Files that never diverge should get their SHA-256 digest"""
+        data = os.urandom(100_000)
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"copy{i}.bin"
+            path.write_bytes(data)
+            paths.append(str(path))
+
+        digests, bytes_read = progressive_full_hashes(paths, block_size=4096, max_block_size=16384)
+
+        assert digests == [hashlib.sha256(data).hexdigest()] * 3
+        assert bytes_read == len(data) * 3
+
+    def test_divergent_file_stops_early(self, tmp_path):
+        """A file that differs in its first block should not be read further"""
+        data = os.urandom(1_000_000)
+        same_a = tmp_path / "a.bin"
+        same_b = tmp_path / "b.bin"
+        other = tmp_path / "c.bin"
+        same_a.write_bytes(data)
+        same_b.write_bytes(data)
+        other.write_bytes(bytes([data[0] ^ 0xFF]) + data[1:])
+
+        digests, bytes_read = progressive_full_hashes([str(same_a), str(other), str(same_b)],
+                                                      block_size=4096, max_block_size=65536)
+
+        expected = hashlib.sha256(data).hexdigest()
+        assert digests == [expected, None, expected]
+        assert bytes_read == len(data) * 2 + 4096
+
+    def test_group_splits_into_subgroups(self, tmp_path):
+        """Two pairs that share a prefix should split into two hashed pairs"""
+        prefix = os.urandom(50_000)
+        tails = [b"x" * 10_000, b"y" * 10_000]
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"f{i}.bin"
+            path.write_bytes(prefix + tails[i % 2])
+            paths.append(str(path))
+
+        digests, _ = progressive_full_hashes(paths, block_size=4096, max_block_size=8192)
+
+        assert digests[0] == digests[2] == hashlib.sha256(prefix + tails[0]).hexdigest()
+        assert digests[1] == digests[3] == hashlib.sha256(prefix + tails[1]).hexdigest()
+
+    def test_unreadable_files(self, tmp_path):
+        """Missing files and files left without a partner get no hash"""
+        path = tmp_path / "only.bin"
+        path.write_bytes(b"data")
+
+        digests, bytes_read = progressive_full_hashes([str(path), str(tmp_path / "missing.bin")])
+
+        assert digests == [None, None]
+        assert bytes_read == 0
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
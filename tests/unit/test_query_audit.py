@@ -0,0 +1,72 @@
+"""
+Unit Tests for the EXPLAIN QUERY PLAN audit
+"""
+
+import sqlite3
+
+import pytest
+
+from cognisys.models.query_audit import (
+    REGISTRY_QUERIES, SCAN_QUERIES, AuditQuery, analyze_plan, audit_queries, redundant_indexes
+)
+from cognisys.models.schema import REGISTRY_MIGRATIONS, SchemaMigrator
+
+
+class TestQueryAudit:
+    """Test plan classification and the indexes added for the hot queries"""
+
+    def test_scan_queries_avoid_full_scans(self, temp_db):
+        """Every scan database query in the catalogue should be answered from an index"""
+        results = audit_queries(temp_db.conn, SCAN_QUERIES)
+
+        assert [r.query.name for r in results if r.flagged] == []
+        by_name = {r.query.name: r for r in results}
+        assert 'idx_files_session_size' in by_name['duplicate_candidates'].indexes
+        assert 'idx_files_session_size' in by_name['exact_candidates'].indexes
+        assert 'idx_files_orphaned' in by_name['plan_archive'].indexes
+        # Streaming by folder reads the index in parent_id order, no sort
+        assert by_name['fuzzy_stream_by_folder'].temp_btrees == []
+        assert redundant_indexes(temp_db.conn) == []
+
+    def test_registry_queries_avoid_full_scans(self, temp_dir):
+        """Dashboard queries should use the registry indexes, including partial ones"""
+        conn = sqlite3.connect(str(temp_dir / "registry.db"))
+        SchemaMigrator(conn, REGISTRY_MIGRATIONS).migrate()
+
+        results = {r.query.name: r for r in audit_queries(conn, REGISTRY_QUERIES)}
+        conn.close()
+
+        assert [name for name, r in results.items() if r.flagged] == []
+        assert results['low_confidence'].indexes == ['idx_registry_low_confidence']
+        assert results['duplicate_count'].indexes == ['idx_registry_duplicates']
+
+    def test_full_scan_and_redundant_index_detected(self):
+        """Unindexed filters are flagged and prefix indexes reported as redundant"""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (a TEXT, b TEXT, c INTEGER)")
+        conn.execute("CREATE INDEX idx_a ON t(a)")
+        conn.execute("CREATE INDEX idx_a_b ON t(a, b)")
+        conn.execute("CREATE INDEX idx_c_partial ON t(c) WHERE c > 0")
+
+        scan, search = audit_queries(conn, [
+            AuditQuery('by_b', 'test', "SELECT * FROM t WHERE b = ?", ('x',)),
+            AuditQuery('by_a', 'test', "SELECT * FROM t WHERE a = ?", ('x',)),
+        ])
+        assert scan.flagged and scan.full_scans == ['t']
+        assert not search.flagged and search.indexes
+
+        expected = analyze_plan(AuditQuery('export', 'test', "SELECT * FROM t", allow_scan=True),
+                                ['SCAN t'])
+        assert expected.full_scans == ['t'] and not expected.flagged
+
+        # Scanning a materialized CTE is not a table scan
+        cte = analyze_plan(AuditQuery('cte', 'test', ''),
+                           ['MATERIALIZE sizes', 'SEARCH t USING INDEX idx_a (a=?)', 'SCAN sizes'])
+        assert cte.full_scans == [] and cte.indexes == ['idx_a']
+
+        assert redundant_indexes(conn) == [('idx_a', 'idx_a_b')]
+        conn.close()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -5,11 +5,13 @@ Tests file traversal, metadata extraction, and indexing functionality
 
 import pytest
 import os
+import hashlib
+import queue
 import tempfile
 from pathlib import Path
 from datetime import datetime
 
-from cognisys.core.scanner import FileScanner
+from cognisys.core.scanner import FileScanner, _STOP
 from cognisys.models.database import Database
 
 
@@ -86,6 +88,62 @@ class TestFileScanner:
         assert 'photo.jpg' in filenames
         assert 'script.py' in filenames
 
+    def test_scan_links_parent_folders(self, temp_db, scan_dir, scanner_config):
+        """Files and folders should be linked to the folder that contains them."""
+        (scan_dir / "docs" / "work").mkdir(parents=True)
+        (scan_dir / "docs" / "work" / "report.txt").write_text("Report")
+
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)])
+
+        file = temp_db.get_files_by_session(session_id)[0]
+        work = temp_db.conn.execute(
+            "SELECT * FROM folders WHERE path = ?", (str(scan_dir / "docs" / "work"),)
+        ).fetchone()
+        root = temp_db.conn.execute(
+            "SELECT * FROM folders WHERE path = ?", (str(scan_dir),)
+        ).fetchone()
+
+        assert file['parent_id'] == work['folder_id']
+        assert file['path'] == str(scan_dir / "docs" / "work" / "report.txt")
+        assert [f['name'] for f in temp_db.get_files_in_folder(work['folder_id'])] == ['report.txt']
+        assert root['parent_id'] is None
+        assert [f['name'] for f in temp_db.get_subfolders(root['folder_id'])] == ['docs']
+
+    def test_scan_rolls_up_folder_sizes(self, temp_db, scan_dir, scanner_config):
+        """Folders should store direct and recursive totals after a scan."""
+        (scan_dir / "docs" / "work").mkdir(parents=True)
+        (scan_dir / "top.txt").write_bytes(b"x" * 10)
+        (scan_dir / "docs" / "a.txt").write_bytes(b"x" * 100)
+        (scan_dir / "docs" / "work" / "b.txt").write_bytes(b"x" * 1000)
+        (scan_dir / "docs" / "work" / "c.txt").write_bytes(b"x" * 2000)
+
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)])
+
+        folders = {f['path']: f for f in temp_db.get_largest_folders(session_id)}
+        root = folders[str(scan_dir)]
+        docs = folders[str(scan_dir / "docs")]
+        work = folders[str(scan_dir / "docs" / "work")]
+
+        assert (root['total_size'], root['file_count'], root['direct_size']) == (3110, 4, 10)
+        assert (docs['total_size'], docs['file_count'], docs['direct_size']) == (3100, 3, 100)
+        assert (work['total_size'], work['file_count'], work['subfolder_count']) == (3000, 2, 0)
+        assert root['subfolder_count'] == docs['subfolder_count'] == 1
+        assert list(folders) == [str(scan_dir), str(scan_dir / "docs"), str(scan_dir / "docs" / "work")]
+
+    def test_folder_ids_stable_across_sessions(self, temp_db, scan_dir, scanner_config):
+        """Rescanning a folder should keep its folder ID so older links stay valid."""
+        (scan_dir / "file.txt").write_text("Content")
+
+        first = FileScanner(temp_db, scanner_config).scan_roots([str(scan_dir)])
+        second = FileScanner(temp_db, scanner_config).scan_roots([str(scan_dir)])
+
+        first_file = temp_db.get_files_by_session(first)[0]
+        second_file = temp_db.get_files_by_session(second)[0]
+        assert first_file['parent_id'] == second_file['parent_id']
+        assert temp_db.get_folder_path(first_file['parent_id']) == str(scan_dir)
+
     def test_scan_calculates_hashes(self, temp_db, scan_dir, scanner_config):
         """Scanner should calculate quick and/or full hashes."""
         test_file = scan_dir / "hashable.txt"
@@ -101,6 +159,34 @@ class TestFileScanner:
         assert files[0]['hash_quick'] is not None
         assert len(files[0]['hash_quick']) == 64  # SHA-256 hex
 
+    def test_scan_records_quick_hash_algorithm(self, temp_db, scan_dir, scanner_config):
+        """Scanner should record the algorithm used for each quick hash."""
+        (scan_dir / "small.txt").write_text("small file")
+        (scan_dir / "large.bin").write_bytes(b"x" * (1024 * 1024 + 10))
+
+        scanner_config['scanning']['hashing']['quick_hash_algorithm'] = 'blake2b'
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)])
+
+        files = {f['name']: f for f in temp_db.get_files_by_session(session_id)}
+        # Small files: quick hash is the SHA-256 full hash
+        assert files['small.txt']['hash_quick_algo'] == 'sha256'
+        assert files['large.bin']['hash_quick_algo'] == 'blake2b'
+        assert files['large.bin']['hash_full'] is None
+
+    def test_scan_samples_large_media(self, temp_db, scan_dir, scanner_config):
+        """Large files in sampled categories should get a sampled quick hash."""
+        (scan_dir / "movie.mp4").write_bytes(b"v" * (1024 * 1024 + 10))
+        (scan_dir / "data.bin").write_bytes(b"d" * (1024 * 1024 + 10))
+
+        scanner_config['scanning']['hashing']['quick_hash_algorithm'] = 'sha256'
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)])
+
+        files = {f['name']: f for f in temp_db.get_files_by_session(session_id)}
+        assert files['movie.mp4']['hash_quick_algo'].startswith('sha256+sampled:')
+        assert files['data.bin']['hash_quick_algo'] == 'sha256'
+
     def test_scan_extracts_metadata(self, temp_db, scan_dir, scanner_config):
         """Scanner should extract file metadata correctly."""
         test_file = scan_dir / "metadata_test.pdf"
@@ -301,6 +387,200 @@ class TestScannerBatching:
         assert len(files) == 5
 
 
+    def test_incremental_rehashes_on_algorithm_change(self, temp_db, scan_dir, scanner_config):
+        """Hashes recorded with a different quick hash algorithm should not be reused."""
+        (scan_dir / "large.bin").write_bytes(b"x" * (1024 * 1024 + 10))
+
+        scanner_config['scanning']['hashing']['quick_hash_algorithm'] = 'sha256'
+        FileScanner(temp_db, scanner_config).scan_roots([str(scan_dir)])
+
+        scanner_config['scanning']['hashing']['quick_hash_algorithm'] = 'crc32'
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)], incremental=True)
+
+        assert scanner.stats['files_reused'] == 0
+        assert scanner.stats['files_rehashed'] == 1
+        files = temp_db.get_files_by_session(session_id)
+        assert files[0]['hash_quick_algo'] == 'crc32'
+        assert len(files[0]['hash_quick']) == 8
+
+
+class TestScannerPipeline:
+    """Test the walker -> hashing workers -> writer pipeline."""
+
+    def test_pipeline_many_small_folders(self, temp_db, scan_dir, scanner_config):
+        """All files across many folders should be indexed by the shared worker pool."""
+        for d in range(20):
+            folder = scan_dir / f"folder_{d:02d}"
+            folder.mkdir()
+            for i in range(3):
+                (folder / f"file_{i}.txt").write_text(f"Content {d}-{i}")
+
+        scanner_config['scanning']['performance']['queue_size'] = 4
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)])
+
+        files = temp_db.get_files_by_session(session_id)
+        assert len(files) == 60
+        assert scanner.stats['folders_scanned'] == 21
+
+    def test_pipeline_reports_stage_throughput(self, temp_db, scan_dir, scanner_config):
+        """Scan stats should include per-stage throughput and workers should be stopped."""
+        for i in range(5):
+            (scan_dir / f"file_{i}.txt").write_text(f"Content {i}")
+
+        scanner = FileScanner(temp_db, scanner_config)
+        scanner.scan_roots([str(scan_dir)])
+
+        stats = scanner.get_stats()
+        assert set(stats['stage_throughput']) == {'walk', 'hash', 'write'}
+        assert scanner.stage_metrics['hash']['items'] == 5
+        assert scanner.stage_metrics['write']['items'] == 6  # 5 files + 1 folder
+        assert scanner.workers == []
+        assert scanner.record_queue is None
+
+    def test_writer_commits_by_row_count(self, temp_db, scan_dir, scanner_config):
+        """Without a commit interval the writer commits once per batch_size rows."""
+        for i in range(25):
+            (scan_dir / f"file_{i}.txt").write_text(f"Content {i}")
+        scanner_config['scanning']['performance'].update({'batch_size': 10, 'commit_interval': 0})
+
+        scanner = FileScanner(temp_db, scanner_config)
+        scanner.scan_roots([str(scan_dir)])
+
+        writer = scanner.get_stats()['writer']
+        assert writer['commits'] == 3  # 26 rows: two full batches plus the final flush
+        assert writer['max_commit_ms'] >= writer['avg_commit_ms'] > 0
+        assert writer['max_queue_depth'] >= 0
+
+    def test_writer_pragmas(self, temp_db, scan_dir, scanner_config):
+        """Configured journal mode and synchronous level are applied to the connection."""
+        scanner_config['scanning']['performance'].update({'journal_mode': 'wal', 'synchronous': 'normal'})
+        FileScanner(temp_db, scanner_config).scan_roots([str(scan_dir)])
+
+        assert temp_db.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert temp_db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+        scanner_config['scanning']['performance']['journal_mode'] = 'bogus'
+        with pytest.raises(ValueError):
+            FileScanner(temp_db, scanner_config).scan_roots([str(scan_dir)])
+
+    def test_process_hashing_backend(self, temp_db, scan_dir, scanner_config):
+        """The process-pool backend should produce the same hashes as the thread backend."""
+        scanner_config['scanning']['hashing']['cache'] = {'enabled': False}
+        for i in range(10):
+            (scan_dir / f"file_{i}.txt").write_text(f"Content {i}")
+
+        thread_scanner = FileScanner(temp_db, scanner_config)
+        thread_files = temp_db.get_files_by_session(thread_scanner.scan_roots([str(scan_dir)]))
+
+        scanner_config['scanning']['performance'].update({
+            'hashing_backend': 'process',
+            'hash_processes': 2,
+            'hash_chunk_size': 4
+        })
+        process_scanner = FileScanner(temp_db, scanner_config)
+        process_files = temp_db.get_files_by_session(process_scanner.scan_roots([str(scan_dir)]))
+
+        assert {f['path']: f['hash_full'] for f in process_files} == \
+            {f['path']: f['hash_full'] for f in thread_files}
+        assert process_scanner.hasher.name == 'thread'  # Pool shut down after scan
+
+
+    def test_chunk_error_skips_only_unwritten_files(self, temp_db, scan_dir, scanner_config):
+        """A chunk failing partway should count each of its files off the frontier exactly once."""
+        paths = []
+        for i in range(3):
+            path = scan_dir / f"chunk_{i}.txt"
+            path.write_text(f"Chunk {i}")
+            paths.append(path)
+
+        scanner = FileScanner(temp_db, scanner_config)
+        scanner.session_id = 'session'
+        scanner.hash_chunk_size = 3
+        scanner.hasher.name = 'process'  # Take the chunked path with the in-process hasher
+        scanner.path_queue = queue.Queue()
+        for path in paths:
+            scanner.path_queue.put((path, None))
+        scanner.path_queue.put(_STOP)
+
+        queued = []
+        scanner._queue_record = lambda kind, record: queued.append((kind, record))
+        counted = []
+
+        def count_file(size_bytes, change_stat):
+            counted.append(size_bytes)
+            if len(counted) == 2:
+                raise RuntimeError("disk full")
+
+        scanner._count_file = count_file
+        scanner._hash_worker()
+
+        kinds = [kind for kind, _ in queued]
+        assert kinds == ['file', 'file', 'skipped']
+        assert queued[2][1] == [str(scan_dir)]
+        assert scanner.stats['errors'] == 1
+
+        scanner._track_frontier('listing', (str(scan_dir), 3, []))
+        for kind, record in queued:
+            scanner._track_frontier(kind, record)
+        assert str(scan_dir) not in scanner.frontier_outstanding
+        assert scanner.checkpoint_done == [str(scan_dir)]
+
+
+class TestScandirWalker:
+    """Test the os.scandir-based traversal."""
+
+    def _build_tree(self, scan_dir):
+        for name in ("a", "b", "c"):
+            folder = scan_dir / name
+            (folder / "nested").mkdir(parents=True)
+            (folder / "one.txt").write_text(f"{name} one")
+            (folder / "nested" / "two.txt").write_text(f"{name} two")
+
+    def test_parallel_listing_matches_serial(self, temp_db, scan_dir, scanner_config):
+        """Listing sibling folders on several threads should index the same files."""
+        self._build_tree(scan_dir)
+
+        serial = FileScanner(temp_db, scanner_config)
+        serial_files = temp_db.get_files_by_session(serial.scan_roots([str(scan_dir)]))
+
+        scanner_config['scanning']['performance']['listing_threads'] = 4
+        parallel = FileScanner(temp_db, scanner_config)
+        parallel_files = temp_db.get_files_by_session(parallel.scan_roots([str(scan_dir)]))
+
+        assert {f['path'] for f in parallel_files} == {f['path'] for f in serial_files}
+        assert parallel.stats['folders_scanned'] == serial.stats['folders_scanned'] == 7
+
+    def test_scan_reports_syscall_counts(self, temp_db, scan_dir, scanner_config):
+        """Each folder should be listed once and each entry stat'ed at most once."""
+        self._build_tree(scan_dir)
+
+        scanner = FileScanner(temp_db, scanner_config)
+        scanner.scan_roots([str(scan_dir)])
+
+        stats = scanner.get_stats()
+        assert stats['dir_listings'] == 7
+        # Root folder + 6 subfolders + 6 files
+        assert stats['stat_calls'] <= 13
+
+    def test_symlinked_folders_not_followed(self, temp_db, scan_dir, scanner_config):
+        """Symlinked directories should not be descended into, matching os.walk."""
+        target = scan_dir / "real"
+        target.mkdir()
+        (target / "file.txt").write_text("real file")
+        try:
+            os.symlink(target, scan_dir / "link", target_is_directory=True)
+        except (OSError, NotImplementedError):
+            pytest.skip("Symlinks not supported")
+
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)])
+
+        files = temp_db.get_files_by_session(session_id)
+        assert [f['name'] for f in files] == ['file.txt']
+
+
 class TestScannerErrorHandling:
     """Test error handling scenarios."""
 
@@ -329,5 +609,167 @@ class TestScannerErrorHandling:
         assert len(files) >= 2
 
 
+
+class TestIncrementalScan:
+    """Test incremental rescans against a previous session."""
+
+    def test_incremental_reuses_unchanged_files(self, temp_db, scan_dir, scanner_config):
+        """Unchanged files should be reused and keep their hashes."""
+        (scan_dir / "stable.txt").write_text("unchanged content")
+
+        first = FileScanner(temp_db, scanner_config)
+        first_session = first.scan_roots([str(scan_dir)])
+
+        second = FileScanner(temp_db, scanner_config)
+        second_session = second.scan_roots([str(scan_dir)], incremental=True)
+
+        stats = second.get_stats()
+        assert stats['files_reused'] == 1
+        assert stats['files_rehashed'] == 0
+        assert stats['files_new'] == 0
+        assert stats['files_deleted'] == 0
+
+        old_files = temp_db.get_files_by_session(first_session)
+        new_files = temp_db.get_files_by_session(second_session)
+        assert len(new_files) == 1
+        assert new_files[0]['hash_quick'] == old_files[0]['hash_quick']
+        assert new_files[0]['file_category'] == old_files[0]['file_category']
+
+    def test_incremental_counts_changes(self, temp_db, scan_dir, scanner_config):
+        """Modified, new and deleted files should be reported separately."""
+        (scan_dir / "stable.txt").write_text("unchanged content")
+        (scan_dir / "changed.txt").write_text("before")
+        (scan_dir / "removed.txt").write_text("going away")
+
+        FileScanner(temp_db, scanner_config).scan_roots([str(scan_dir)])
+
+        (scan_dir / "changed.txt").write_text("after the edit")
+        (scan_dir / "removed.txt").unlink()
+        (scan_dir / "added.txt").write_text("brand new")
+
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)], incremental=True)
+
+        stats = scanner.get_stats()
+        assert stats['files_reused'] == 1
+        assert stats['files_rehashed'] == 1
+        assert stats['files_new'] == 1
+        assert stats['files_deleted'] == 1
+
+        files = {f['name']: f for f in temp_db.get_files_by_session(session_id)}
+        assert set(files) == {'stable.txt', 'changed.txt', 'added.txt'}
+        assert files['changed.txt']['hash_full'] == hashlib.sha256(b"after the edit").hexdigest()
+
+    def test_incremental_without_previous_session(self, temp_db, scan_dir, scanner_config):
+        """Incremental mode should fall back to a full scan when no base session exists."""
+        (scan_dir / "first.txt").write_text("first run")
+
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)], incremental=True)
+
+        assert scanner.base_session_id is None
+        assert scanner.get_stats()['files_new'] == 1
+        assert len(temp_db.get_files_by_session(session_id)) == 1
+
+
+class TestScannerHashCache:
+    """Test reuse of hashes from the persistent hash cache."""
+
+    def test_rescan_hits_hash_cache(self, temp_db, scan_dir, scanner_config):
+        """A full rescan of unchanged files should not hash them again."""
+        for i in range(5):
+            (scan_dir / f"file_{i}.txt").write_text(f"Content {i}")
+
+        first = FileScanner(temp_db, scanner_config)
+        first_files = temp_db.get_files_by_session(first.scan_roots([str(scan_dir)]))
+
+        second = FileScanner(temp_db, scanner_config)
+        second_files = temp_db.get_files_by_session(second.scan_roots([str(scan_dir)]))
+
+        assert second.stats['hash_cache']['hits'] == 5
+        assert {f['path']: f['hash_full'] for f in second_files} == \
+            {f['path']: f['hash_full'] for f in first_files}
+
+    def test_hash_cache_disabled(self, temp_db, scan_dir, scanner_config):
+        """Scanning still works with the cache turned off."""
+        (scan_dir / "file.txt").write_text("Content")
+        scanner_config['scanning']['hashing']['cache'] = {'enabled': False}
+
+        scanner = FileScanner(temp_db, scanner_config)
+        files = temp_db.get_files_by_session(scanner.scan_roots([str(scan_dir)]))
+
+        assert scanner.hash_cache is None
+        assert files[0]['hash_full'] is not None
+
+
+
+class TestResumableScan:
+    """Test checkpointing the walk frontier and resuming interrupted scans."""
+
+    def _build_tree(self, scan_dir):
+        for d in range(6):
+            folder = scan_dir / f"dir_{d}"
+            folder.mkdir()
+            for i in range(5):
+                (folder / f"file_{i}.txt").write_text(f"Content {d}-{i}")
+
+    def _interrupt_after(self, scanner, listings):
+        """Make the walker fail after a number of directory listings."""
+        original = scanner._list_directory
+        calls = []
+
+        def failing_list_directory(*args):
+            calls.append(args)
+            if len(calls) > listings:
+                raise RuntimeError("simulated crash")
+            return original(*args)
+
+        scanner._list_directory = failing_list_directory
+
+    def test_resume_completes_interrupted_scan(self, temp_db, scan_dir, scanner_config):
+        """Resuming should index every file exactly once."""
+        self._build_tree(scan_dir)
+        scanner = FileScanner(temp_db, scanner_config)
+        self._interrupt_after(scanner, 4)
+
+        with pytest.raises(RuntimeError):
+            scanner.scan_roots([str(scan_dir)])
+        session_id = scanner.session_id
+        assert temp_db.get_session(session_id)['status'] == 'failed'
+        assert temp_db.get_scan_checkpoint(session_id)['done']
+
+        resumed = FileScanner(temp_db, scanner_config)
+        assert resumed.resume_scan(session_id) == session_id
+
+        files = temp_db.get_files_by_session(session_id)
+        paths = [f['path'] for f in files]
+        assert len(paths) == len(set(paths)) == 30
+        session = temp_db.get_session(session_id)
+        assert session['status'] == 'completed'
+        assert session['files_scanned'] == 30
+        assert temp_db.get_scan_checkpoint(session_id) == {'pending': set(), 'done': set()}
+
+    def test_resume_skips_completed_directories(self, temp_db, scan_dir, scanner_config):
+        """Directories checkpointed as done should not be listed again."""
+        self._build_tree(scan_dir)
+        scanner = FileScanner(temp_db, scanner_config)
+        self._interrupt_after(scanner, 4)
+        with pytest.raises(RuntimeError):
+            scanner.scan_roots([str(scan_dir)])
+        done = temp_db.get_scan_checkpoint(scanner.session_id)['done']
+
+        resumed = FileScanner(temp_db, scanner_config)
+        resumed.resume_scan(scanner.session_id)
+
+        assert resumed.get_stats()['dir_listings'] == 7 - len(done)
+
+    def test_resume_rejects_completed_session(self, temp_db, scan_dir, scanner_config):
+        """Completed sessions cannot be resumed."""
+        scanner = FileScanner(temp_db, scanner_config)
+        session_id = scanner.scan_roots([str(scan_dir)])
+
+        with pytest.raises(ValueError):
+            FileScanner(temp_db, scanner_config).resume_scan(session_id)
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
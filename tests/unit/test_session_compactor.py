@@ -0,0 +1,118 @@
+"""
+Unit Tests for Session Compaction
+"""
+
+import json
+import uuid
+
+import pytest
+
+from cognisys.core.session_compactor import SessionCompactor
+
+
+def add_session(db, session_id, started_at, files, roots=('/data',)):
+    """Insert a completed session with {path: (size, modified_at)} files."""
+    db.conn.execute("""
+        INSERT INTO scan_sessions (session_id, started_at, root_paths, status)
+        VALUES (?, ?, ?, 'completed')
+    """, (session_id, started_at, json.dumps(list(roots))))
+    for path, (size, modified) in files.items():
+        db.insert_file({
+            'file_id': str(uuid.uuid4()),
+            'path': path,
+            'name': path.rsplit('/', 1)[-1],
+            'size_bytes': size,
+            'modified_at': modified,
+            'hash_quick': f"{size:x}",
+            'scan_session_id': session_id,
+        })
+    db.conn.commit()
+
+
+def snapshot(db, session_id):
+    """Rebuilt {path: size} of a session."""
+    return {row.path: row.size_bytes
+            for row in db.iter_session_snapshot(session_id, ('path', 'size_bytes'))}
+
+
+@pytest.fixture
+def three_scans(temp_db):
+    """Three scans of the same root: a file changes, one is deleted, one is added."""
+    first = {'/data/a.txt': (100, '2024-01-01'), '/data/b.txt': (200, '2024-01-01'),
+             '/data/c.txt': (300, '2024-01-01')}
+    second = {'/data/a.txt': (100, '2024-01-01'), '/data/b.txt': (250, '2024-02-01'),
+              '/data/d.txt': (400, '2024-02-01')}
+    third = dict(second, **{'/data/e.txt': (500, '2024-03-01')})
+    add_session(temp_db, 's1', '2024-01-01 10:00', first)
+    add_session(temp_db, 's2', '2024-02-01 10:00', second)
+    add_session(temp_db, 's3', '2024-03-01 10:00', third)
+    add_session(temp_db, 'other', '2024-01-15 10:00', first, roots=('/elsewhere',))
+    return {'s1': first, 's2': second, 's3': third}
+
+
+class TestSessionCompactor:
+    """Test delta compaction and snapshot reconstruction"""
+
+    def test_compaction_keeps_only_changes(self, temp_db, three_scans):
+        """Old sessions store only changed files but rebuild to their full contents"""
+        stats = SessionCompactor(temp_db).compact(keep=1)
+
+        assert stats['candidates'] == [('s1', 's2'), ('s2', 's3')]
+        stored = {
+            session: {row[0] for row in temp_db.conn.execute(
+                "SELECT path FROM files WHERE scan_session_id = ?", (session,))}
+            for session in ('s1', 's2', 'other')
+        }
+        # a.txt unchanged -> dropped; b.txt changed and c.txt deleted later -> kept
+        assert stored['s1'] == {'/data/b.txt', '/data/c.txt'}
+        assert stored['s2'] == set()
+        assert len(stored['other']) == 3  # only session of its roots
+
+        for session, files in three_scans.items():
+            assert snapshot(temp_db, session) == {p: size for p, (size, _) in files.items()}
+
+        # Signatures for incremental rescans come from the rebuilt snapshot
+        assert set(temp_db.get_file_signatures('s1')) == set(three_scans['s1'])
+
+    def test_referenced_files_kept_and_rerun_is_noop(self, temp_db, three_scans):
+        """Files in duplicate groups survive compaction; compacted sessions are skipped"""
+        file_id = temp_db.conn.execute("""
+            SELECT file_id FROM files WHERE scan_session_id = 's1' AND path = '/data/a.txt'
+        """).fetchone()[0]
+        temp_db.conn.execute("INSERT INTO duplicate_members (group_id, file_id) VALUES ('g', ?)",
+                             (file_id,))
+        temp_db.conn.commit()
+
+        compactor = SessionCompactor(temp_db)
+        compactor.compact(keep=2)
+        assert temp_db.conn.execute(
+            "SELECT COUNT(*) FROM files WHERE file_id = ?", (file_id,)).fetchone()[0] == 1
+        assert snapshot(temp_db, 's1') == {p: size for p, (size, _) in three_scans['s1'].items()}
+
+        assert compactor.find_candidates(keep=2) == []
+        assert temp_db.get_session('s1')['base_session_id'] == 's2'
+
+    def test_dry_run_and_keep_validation(self, temp_db, three_scans):
+        """Dry runs change nothing and at least one full session must remain"""
+        before = temp_db.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        stats = SessionCompactor(temp_db).compact(keep=1, dry_run=True)
+
+        assert len(stats['candidates']) == 2
+        assert temp_db.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == before
+        with pytest.raises(ValueError):
+            SessionCompactor(temp_db).find_candidates(keep=0)
+
+    def test_vacuum_reclaims_free_pages(self, temp_db, three_scans):
+        """VACUUM only runs when pages are free"""
+        add_session(temp_db, 'bulk', '2024-04-01 10:00',
+                    {f"/bulk/{i:05d}.dat": (i, '2024-04-01') for i in range(2000)})
+        temp_db.conn.execute("DELETE FROM files WHERE scan_session_id = 'bulk'")
+        temp_db.conn.commit()
+
+        assert temp_db.vacuum(min_free_ratio=1.0) is False
+        assert temp_db.vacuum() is True
+        assert temp_db.get_free_page_ratio() == 0.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,63 @@
+"""
+Unit Tests for indexed fuzzy name matching
+"""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from cognisys.utils.similarity import DisjointSet, iter_similar_pairs, lengths_compatible, name_bigrams
+
+
+def all_pairs(names, threshold):
+    """Reference all-pairs implementation."""
+    pairs = []
+    for i, name_a in enumerate(names):
+        for j in range(i + 1, len(names)):
+            name_b = names[j]
+            if not lengths_compatible(len(name_a), len(name_b), threshold):
+                continue
+            ratio = SequenceMatcher(None, name_a, name_b).ratio()
+            if ratio >= threshold:
+                pairs.append((i, j, ratio))
+    return pairs
+
+
+class TestSimilarPairs:
+    """Test that the bigram index finds exactly the all-pairs matches"""
+
+    @pytest.mark.parametrize('threshold', [0.6, 0.8, 0.85, 0.9, 1.0])
+    def test_matches_all_pairs(self, threshold):
+        """Random names over small alphabets should give identical results"""
+        rng = random.Random(7)
+        for alphabet in ('ab', 'abcdef'):
+            names = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+                     for _ in range(60)]
+            assert list(iter_similar_pairs(names, threshold)) == all_pairs(names, threshold)
+
+    def test_realistic_names(self):
+        """Copies and versions of the same name should pair up"""
+        names = ['quarterly report', 'quarterly reprot', 'holiday photos', 'quarterly report ',
+                 'invoice march', 'invoice match']
+        pairs = [(i, j) for i, j, _ in iter_similar_pairs(names, 0.85)]
+        assert pairs == [(0, 1), (0, 3), (1, 3), (4, 5)]
+
+    def test_bigrams_count_repeats(self):
+        """Repeated bigrams are numbered so they intersect as a multiset"""
+        assert name_bigrams('aaa') == [('\x02a', 1), ('aa', 1), ('aa', 2), ('a\x03', 1)]
+        assert len(name_bigrams('')) == 1
+
+
+class TestDisjointSet:
+    """Test union-find clustering of matching pairs"""
+
+    def test_components(self):
+        """Chained unions should merge into one component; singletons are dropped"""
+        clusters = DisjointSet(7)
+        for a, b in [(0, 3), (3, 5), (6, 1), (5, 0)]:
+            clusters.union(a, b)
+
+        assert clusters.components() == [[0, 3, 5], [1, 6]]
+        assert clusters.find(5) == clusters.find(0)
+        assert clusters.find(2) == 2